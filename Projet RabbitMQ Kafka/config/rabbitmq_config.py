@@ -18,14 +18,155 @@ TASK_QUEUES = {
 
 RESULT_QUEUE = 'result_queue'
 
-# Configuration des workers
+# Configuration des workers (temps de traitement simulé; 0 pour mesurer le calcul seul)
 WORKER_PROCESSING_TIME = {
-    'min': 5,  # secondes
-    'max': 15  # secondes
+    'min': float(os.getenv('WORKER_PROCESSING_TIME_MIN', 5)),  # secondes
+    'max': float(os.getenv('WORKER_PROCESSING_TIME_MAX', 15))  # secondes
 }
 
 # Configuration du client producteur
 CLIENT_SEND_INTERVAL = 5  # secondes entre chaque envoi automatique
 
 # Exchange pour les opérations "all"
-ALL_OPERATIONS_EXCHANGE = 'all_operations' 
\ No newline at end of file
+ALL_OPERATIONS_EXCHANGE = 'all_operations' 
+
+# Format des messages publiés: 'binary' (compact) ou 'json' (anciens clients)
+MESSAGE_FORMAT = os.getenv('MESSAGE_FORMAT', 'binary')
+
+# Nombre de tâches simultanées par processus en mode worker --async
+WORKER_ASYNC_CONCURRENCY = int(os.getenv('WORKER_ASYNC_CONCURRENCY', 10))
+
+# Taille du pool de threads partagé d'un worker multi-opérations (--ops)
+WORKER_THREADS = int(os.getenv('WORKER_THREADS', 4))
+
+# Superviseur prefork (--processes): délai (secondes) avant le redémarrage d'un processus arrêté, doublé à
+# chaque arrêt consécutif du même emplacement jusqu'au maximum; un processus resté en vie au moins le
+# délai maximum repart du délai initial
+WORKER_SUPERVISOR_RESTART_DELAY = 2
+WORKER_SUPERVISOR_MAX_RESTART_DELAY = 60
+
+# Mode --pipeline: taille max d'un groupe d'acquittements et délai max (secondes)
+WORKER_ACK_BATCH_SIZE = int(os.getenv('WORKER_ACK_BATCH_SIZE', 50))
+WORKER_ACK_MAX_DELAY = float(os.getenv('WORKER_ACK_MAX_DELAY', 0.2))
+
+# Prefetch adaptatif (--adaptive-prefetch): bornes et intervalle de réajustement (secondes)
+PREFETCH_MIN = int(os.getenv('PREFETCH_MIN', 1))
+PREFETCH_MAX = int(os.getenv('PREFETCH_MAX', 100))
+PREFETCH_ADJUST_INTERVAL = float(os.getenv('PREFETCH_ADJUST_INTERVAL', 5))
+
+# Cache local des résultats du worker (--cache-size, 0 = désactivé), TTL en secondes
+WORKER_CACHE_SIZE = int(os.getenv('WORKER_CACHE_SIZE', 0))
+WORKER_CACHE_TTL = float(os.getenv('WORKER_CACHE_TTL', 300))
+WORKER_CACHE_FILE = os.getenv('WORKER_CACHE_FILE')
+
+# Cache partagé entre les workers d'un même hôte (--shared-cache): fichier SQLite et taille max
+SHARED_CACHE_PATH = os.getenv('SHARED_CACHE_PATH', os.path.join(os.getenv('TMPDIR', '/tmp'), 'calc_shared_cache.sqlite'))
+SHARED_CACHE_SIZE = int(os.getenv('SHARED_CACHE_SIZE', 100000))
+
+# Détection des relivraisons: nombre de résultats récents gardés et fenêtre (secondes) du filtre de Bloom
+SEEN_SET_CAPACITY = int(os.getenv('SEEN_SET_CAPACITY', 10000))
+SEEN_SET_WINDOW = float(os.getenv('SEEN_SET_WINDOW', 3600))
+
+# Tâches en échec: paliers de retry (délais en secondes), nombre max de tentatives avant mise de côté
+TASK_RETRY_DELAYS = [1, 5, 30]
+MAX_TASK_ATTEMPTS = int(os.getenv('MAX_TASK_ATTEMPTS', 4))
+TASK_ATTEMPTS_HEADER = 'x-attempts'
+TASK_ERROR_HEADER = 'x-last-error'
+
+# Exchange de dead-letter des queues de tâches et queues des messages mis de côté
+DEAD_LETTER_EXCHANGE = 'tasks_dead_letter'
+PARKED_QUEUES = {operation: f'{queue}.parked' for operation, queue in TASK_QUEUES.items()}
+
+# File prioritaire: priorité max des queues de tâches (x-max-priority) et priorité par défaut de chaque source
+TASK_MAX_PRIORITY = 10
+TASK_PRIORITIES = {'web': 8, 'auto': 1}
+
+# Durée de validité par défaut des tâches publiées (secondes, 0 = sans échéance)
+TASK_TTL = float(os.getenv('TASK_TTL', 0))
+
+# Annulation des tâches: exchange de contrôle (fanout) et nombre d'identifiants annulés retenus par worker
+CONTROL_EXCHANGE = 'task_control'
+# Événements de tâches (fanout): démarrage d'une tâche sur un worker, observé par l'exécution spéculative
+TASK_EVENTS_EXCHANGE = 'task_events'
+CANCELLED_SET_SIZE = int(os.getenv('CANCELLED_SET_SIZE', 10000))
+
+# Exchanges observables: tâches (direct, clé = nom de la queue) et résultats (fanout vers result_queue)
+TASKS_EXCHANGE = 'tasks'
+RESULTS_EXCHANGE = 'results'
+
+# Exécution spéculative (hedging_coordinator.py): intervalle de vérification (s), mesures minimales
+# avant de dupliquer, nombre max de tâches suivies, part max des complétions dupliquées sur une
+# fenêtre glissante (s); résultats récents retenus pour la déduplication
+HEDGE_CHECK_INTERVAL = float(os.getenv('HEDGE_CHECK_INTERVAL', 1))
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', 20))
+HEDGE_MAX_PENDING = int(os.getenv('HEDGE_MAX_PENDING', 10000))
+HEDGE_MAX_RATE = float(os.getenv('HEDGE_MAX_RATE', 0.05))
+HEDGE_BUDGET_WINDOW = float(os.getenv('HEDGE_BUDGET_WINDOW', 60))
+RESULT_DEDUP_SIZE = int(os.getenv('RESULT_DEDUP_SIZE', 10000))
+
+# Files équitables par source: sous-queues task_queue_<op>.<source> (ex. "web=4,auto=1,tenant_a=2", même
+# syntaxe que worker.py --weights) et poids du tourniquet des workers; la voie partagée est la queue de
+# l'opération (tâches "all", retries, rejeux)
+def parse_source_weights(value: str, name: str = 'TASK_SOURCE_WEIGHTS') -> dict:
+    """Analyse une liste de poids 'source=N,...'; une entrée invalide est signalée avec son nom"""
+    weights = {}
+    for item in value.split(','):
+        source, _, weight = item.partition('=')
+        if not source.strip() or not weight.strip().isdigit() or int(weight) < 1:
+            raise ValueError(f"{name}: poids invalide '{item}' (format: source=N avec N >= 1, ex: web=4,auto=1)")
+        weights[source.strip()] = int(weight)
+    return weights
+
+
+TASK_SOURCE_WEIGHTS = parse_source_weights(os.getenv('TASK_SOURCE_WEIGHTS', 'web=4,auto=1'))
+SHARED_LANE = 'shared'
+SHARED_LANE_WEIGHT = int(os.getenv('SHARED_LANE_WEIGHT', 2))
+
+# Expressions (expression_client.py): délai max d'évaluation (secondes) et nombre max d'opérations par expression
+EXPRESSION_TIMEOUT = float(os.getenv('EXPRESSION_TIMEOUT', 120))
+EXPRESSION_MAX_NODES = int(os.getenv('EXPRESSION_MAX_NODES', 256))
+
+# Regroupement des résultats "all" (result_aggregator.py): exchange (headers, lié à l'exchange des résultats) et
+# en-tête des résultats membres d'un groupe, queue d'entrée, exchange et queue des résultats regroupés,
+# délai max d'attente d'un groupe (secondes), nombre max de groupes en attente, politique à l'expiration
+# ('partial': publier les résultats reçus, 'drop': abandonner le groupe)
+GROUP_MEMBERS_EXCHANGE = 'group_members'
+GROUP_MEMBER_HEADER = 'x-group-member'
+AGGREGATOR_QUEUE = 'result_aggregator.members'
+GROUPED_RESULTS_EXCHANGE = 'grouped_results'
+GROUPED_RESULT_QUEUE = 'grouped_result_queue'
+AGGREGATOR_TIMEOUT = float(os.getenv('AGGREGATOR_TIMEOUT', 60))
+AGGREGATOR_MAX_GROUPS = int(os.getenv('AGGREGATOR_MAX_GROUPS', 1000))
+AGGREGATOR_PARTIAL_POLICY = os.getenv('AGGREGATOR_PARTIAL_POLICY', 'partial')
+
+# Réductions distribuées (reduce_client.py): nombre de valeurs par partition et délai max d'un travail (secondes)
+REDUCE_CHUNK_SIZE = int(os.getenv('REDUCE_CHUNK_SIZE', 10000))
+REDUCE_TIMEOUT = float(os.getenv('REDUCE_TIMEOUT', 300))
+
+# Tableaux par référence (array_client.py): répertoire du magasin d'objets partagé par producteurs et workers
+# (même machine ou montage commun), durée de vie des objets orphelins (secondes), valeurs par tâche, délai max
+OBJECT_STORE_DIR = os.getenv('OBJECT_STORE_DIR', os.path.join(os.getenv('TMPDIR', '/tmp'), 'calc_objects'))
+OBJECT_STORE_TTL = float(os.getenv('OBJECT_STORE_TTL', 3600))
+ARRAY_CHUNK_SIZE = int(os.getenv('ARRAY_CHUNK_SIZE', 1000000))
+ARRAY_TIMEOUT = float(os.getenv('ARRAY_TIMEOUT', 300))
+
+# Produits matriciels par blocs (matmul_client.py): côté des tuiles (valeurs), délai max d'un travail (secondes)
+# et nombre max de produits de blocs envoyés sans résultat (mémoire du broker bornée)
+MATMUL_TILE_SIZE = int(os.getenv('MATMUL_TILE_SIZE', 128))
+MATMUL_TIMEOUT = float(os.getenv('MATMUL_TIMEOUT', 600))
+MATMUL_MAX_IN_FLIGHT = int(os.getenv('MATMUL_MAX_IN_FLIGHT', 64))
+
+# Interface web: délai max d'une publication par le thread éditeur (secondes) et délai de reconnexion
+# (doublé à chaque échec jusqu'au maximum)
+WEB_PUBLISH_TIMEOUT = float(os.getenv('WEB_PUBLISH_TIMEOUT', 5))
+WEB_RECONNECT_DELAY = float(os.getenv('WEB_RECONNECT_DELAY', 1))
+WEB_MAX_RECONNECT_DELAY = float(os.getenv('WEB_MAX_RECONNECT_DELAY', 30))
+
+# Résultats des tâches "all" dans l'interface web: 1 pour les afficher regroupés, un par tâche (queue
+# GROUPED_RESULT_QUEUE, result_aggregator.py doit tourner), 0 pour afficher les quatre résultats séparés
+WEB_GROUPED_RESULTS = os.getenv('WEB_GROUPED_RESULTS', '0') == '1'
+
+# Profondeur des queues affichée par l'interface web: intervalle d'échantillonnage (secondes)
+# et nombre d'échantillons gardés en mémoire
+QUEUE_SAMPLE_INTERVAL = float(os.getenv('QUEUE_SAMPLE_INTERVAL', 2))
+QUEUE_SAMPLE_HISTORY = int(os.getenv('QUEUE_SAMPLE_HISTORY', 300))
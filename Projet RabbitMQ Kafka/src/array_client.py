@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Client de tableaux par référence: opération élément par élément sur de grands tableaux stockés dans le magasin d'objets
+Usage: python array_client.py add|sub|mul|div (--size N | --a ID --b ID) [--chunk-size N] [--keep] [--verify] [--verbose]
+"""
+
+import sys
+import os
+import math
+import time
+import random
+import argparse
+from array import array
+import pika
+from colorama import init, Fore, Style
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: génération et vérification plus lentes
+    np = None
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key
+from utils.object_store import ObjectStore
+
+# Initialiser colorama
+init()
+
+
+class ArrayJobClient:
+    """
+    Calcule `a <op> b` sur de grands tableaux sans faire transiter les valeurs par RabbitMQ
+
+    Les opérandes et le résultat sont des objets du magasin (fichiers projetés en mémoire dans
+    un répertoire partagé). Chaque tâche ne désigne que les objets et une plage d'indices: le worker
+    projette les plages, calcule directement dans l'objet de sortie et renvoie la référence de la
+    plage calculée sur la queue exclusive du client. Le résultat est lu dans la projection de
+    l'objet de sortie, sans copie.
+    """
+
+    def __init__(self, operation: str, chunk_size: int = ARRAY_CHUNK_SIZE, timeout: float = ARRAY_TIMEOUT,
+                 priority: int = None, source: str = "auto", verbose: bool = False):
+        self.operation = operation
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.source = source
+        self.priority = task_priority(source, priority)
+        self.verbose = verbose
+        self.store = ObjectStore(OBJECT_STORE_DIR)
+        self.connection = None
+        self.channel = None
+        self.reply_queue = None
+        self.job = None
+        self.size = 0
+        # Plages envoyées sans réponse: request_id -> numéro de plage
+        self.in_flight = {}
+        self.computed = 0
+        self.reported = 0
+
+        removed = self.store.purge(OBJECT_STORE_TTL)
+        if removed:
+            print(f"{Fore.YELLOW}🧹 {removed} objets orphelins supprimés de {OBJECT_STORE_DIR}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}🚀 Client de tableaux démarré ({operation}, plages de {chunk_size} valeurs, "
+              f"magasin: {OBJECT_STORE_DIR}){Style.RESET_ALL}")
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion et crée la queue exclusive de réception des références calculées"""
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+
+            # Adressée directement par les workers (exchange par défaut, clé = nom de la queue)
+            self.reply_queue = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            self.channel.basic_consume(queue=self.reply_queue, on_message_callback=self.on_range_done, auto_ack=True)
+
+            print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def create_random(self, size: int) -> str:
+        """Crée un objet de `size` valeurs aléatoires (1 à 100), générées directement dans sa projection"""
+        object_id, values = self.store.create(size)
+        if np is not None:
+            np.frombuffer(values, dtype=np.float64)[:] = np.random.uniform(1, 100, size)
+        else:
+            for start in range(0, size, self.chunk_size):
+                end = min(size, start + self.chunk_size)
+                values[start:end] = array('d', (random.uniform(1, 100) for _ in range(end - start)))
+        return object_id
+
+    def dispatch_ranges(self, a: str, b: str, out: str, size: int, partitions: int):
+        """Envoie une tâche par plage d'indices vers la queue de l'opération"""
+        for partition in range(partitions):
+            start = partition * self.chunk_size
+            task_message = create_claim_task_message(self.operation, a, b, out, start,
+                                                     min(self.chunk_size, size - start), self.job, partition,
+                                                     partitions, self.reply_queue, source=self.source,
+                                                     ttl=self.timeout)
+            self.channel.basic_publish(
+                exchange=TASKS_EXCHANGE,
+                routing_key=task_routing_key(self.operation, self.source),
+                body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                priority=self.priority,
+                                                expiration=message_expiration(task_message))
+            )
+            self.in_flight[task_message["request_id"]] = partition
+
+    def on_range_done(self, channel, method, properties, body):
+        """Référence d'une plage calculée: progression affichée par paliers de 10%"""
+        try:
+            result_message = decode_message(body, properties.content_type)
+        except Exception:
+            return
+        # Réponses d'un travail précédent (abandonné) et doublons ignorés
+        if result_message.get("job") != self.job or self.in_flight.pop(result_message["request_id"], None) is None:
+            return
+
+        self.computed += result_message["count"]
+        if self.verbose:
+            print(f"{Fore.WHITE}   📥 Plage [{result_message['start']}, "
+                  f"{result_message['start'] + result_message['count']}) calculée "
+                  f"(Worker: {result_message['worker_id']}){Style.RESET_ALL}")
+        step = int(10 * self.computed / self.size)
+        if step > self.reported:
+            self.reported = step
+            print(f"{Fore.BLUE}⏳ {100 * self.computed / self.size:.0f}% "
+                  f"({self.computed}/{self.size} valeurs, {len(self.in_flight)} plages en cours){Style.RESET_ALL}")
+
+    def cancel_in_flight(self):
+        """Annule les plages encore en attente ou en cours après un abandon"""
+        for request_id in self.in_flight:
+            self.channel.basic_publish(
+                exchange=CONTROL_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_cancel_message(request_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+            )
+        self.in_flight.clear()
+
+    def run(self, a: str, b: str):
+        """Calcule a <op> b sur les workers; renvoie l'identifiant de l'objet résultat, ou None en cas d'échec"""
+        try:
+            self.size = self.store.size(a)
+            if self.store.size(b) != self.size:
+                print(f"{Fore.RED}❌ Tailles différentes: {a} ({self.size}), {b} ({self.store.size(b)}){Style.RESET_ALL}")
+                return None
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}❌ Objet introuvable: {e}{Style.RESET_ALL}")
+            return None
+        if not self.connect_to_rabbitmq():
+            return None
+
+        out, _ = self.store.create(self.size)
+        partitions = math.ceil(self.size / self.chunk_size)
+        self.job = new_request_id()
+        self.in_flight.clear()
+        self.computed = 0
+        self.reported = 0
+        print(f"{Fore.CYAN}🧮 {a} {self.operation} {b} -> {out}: {self.size} valeurs, {partitions} plages "
+              f"vers '{task_routing_key(self.operation, self.source)}'{Style.RESET_ALL}")
+
+        start = time.monotonic()
+        try:
+            self.dispatch_ranges(a, b, out, self.size, partitions)
+            while self.in_flight:
+                remaining = start + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    print(f"{Fore.RED}⏱️  Délai dépassé ({self.timeout:.0f}s): "
+                          f"{self.computed}/{self.size} valeurs calculées{Style.RESET_ALL}")
+                    self.cancel_in_flight()
+                    self.store.delete(out)
+                    return None
+                self.connection.process_data_events(time_limit=min(1.0, remaining))
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Calcul interrompu{Style.RESET_ALL}")
+            self.cancel_in_flight()
+            self.store.delete(out)
+            return None
+
+        elapsed = time.monotonic() - start
+        print(f"{Fore.GREEN}✅ {self.size} valeurs calculées dans l'objet {out} "
+              f"en {elapsed:.1f}s ({self.size / elapsed:.0f} valeurs/s){Style.RESET_ALL}")
+        return out
+
+    def display(self, out: str, count: int = 5):
+        """Affiche les premières valeurs du résultat, lues dans la projection de l'objet"""
+        values = self.store.open(out, 0, min(count, self.store.size(out)))
+        print(f"{Fore.CYAN}   Début du résultat: {', '.join(f'{value:.4f}' for value in values)}{Style.RESET_ALL}")
+
+    def verify(self, a: str, b: str, out: str) -> bool:
+        """Compare le résultat à un calcul local sur les mêmes plages"""
+        mismatches = 0
+        for start in range(0, self.size, self.chunk_size):
+            count = min(self.chunk_size, self.size - start)
+            expected = perform_operation_batch(self.operation, self.store.open(a, start, count),
+                                               self.store.open(b, start, count))
+            actual = self.store.open(out, start, count)
+            if np is not None:
+                mismatches += int(np.count_nonzero(np.frombuffer(actual, dtype=np.float64) != expected))
+            else:
+                mismatches += sum(1 for x, y in zip(actual, expected) if x != y)
+        if mismatches:
+            print(f"{Fore.RED}❌ Vérification: {mismatches} valeurs différentes du calcul local{Style.RESET_ALL}")
+            return False
+        print(f"{Fore.GREEN}✅ Vérification: résultat identique au calcul local{Style.RESET_ALL}")
+        return True
+
+    def close(self):
+        if self.connection and self.connection.is_open:
+            self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Opérations élément par élément sur de grands tableaux par référence')
+    parser.add_argument('operation', choices=OPERATIONS,
+                        help='Opération à effectuer')
+    parser.add_argument('--size', type=int,
+                        help='Taille des tableaux aléatoires à créer dans le magasin')
+    parser.add_argument('--a', metavar='ID',
+                        help='Objet existant du premier opérande (ex. résultat gardé par --keep)')
+    parser.add_argument('--b', metavar='ID',
+                        help='Objet existant du second opérande')
+    parser.add_argument('--chunk-size', type=int, default=ARRAY_CHUNK_SIZE,
+                        help=f'Nombre de valeurs par tâche (défaut: {ARRAY_CHUNK_SIZE})')
+    parser.add_argument('--timeout', type=float, default=ARRAY_TIMEOUT,
+                        help=f'Délai max du travail en secondes (défaut: {ARRAY_TIMEOUT})')
+    parser.add_argument('--priority', type=int, default=None,
+                        help=f'Priorité des tâches, 0 à {TASK_MAX_PRIORITY} (défaut: {TASK_PRIORITIES["auto"]})')
+    parser.add_argument('--source', default='auto',
+                        help='Source des tâches (voie équitable des workers, défaut: auto)')
+    parser.add_argument('--keep', action='store_true',
+                        help='Garder l\'objet résultat dans le magasin (son identifiant est affiché)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Comparer le résultat à un calcul local')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Afficher chaque plage calculée')
+
+    args = parser.parse_args()
+    if (args.size is None) == (args.a is None or args.b is None):
+        parser.error('indiquer soit --size, soit --a et --b')
+    if args.chunk_size < 1 or (args.size is not None and args.size < 1):
+        parser.error('--size et --chunk-size doivent être positifs')
+
+    client = ArrayJobClient(args.operation, args.chunk_size, args.timeout, args.priority, args.source, args.verbose)
+    created = []
+    out = None
+    try:
+        if args.size is not None:
+            created = [client.create_random(args.size), client.create_random(args.size)]
+            a, b = created
+        else:
+            a, b = args.a, args.b
+        out = client.run(a, b)
+        if out is None:
+            sys.exit(1)
+        client.display(out)
+        if args.verify and not client.verify(a, b, out):
+            sys.exit(1)
+    finally:
+        client.close()
+        for object_id in created:
+            client.store.delete(object_id)
+        if out is not None:
+            if args.keep:
+                print(f"{Fore.CYAN}📦 Résultat gardé: {out} ({OBJECT_STORE_DIR}){Style.RESET_ALL}")
+            else:
+                client.store.delete(out)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Client producteur qui envoie des requêtes de calcul automatiquement
-Usage: python client_producer.py [--interval SECONDS] [--count NUMBER]
+Usage: python client_producer.py [--interval SECONDS] [--count NUMBER] [--batch-size N] [--source NOM]
 """
 
 import sys
@@ -17,14 +17,23 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.rabbitmq_config import *
 from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key
 
 # Initialiser colorama
 init()
 
 
 class TaskProducer:
-    def __init__(self, interval: float = CLIENT_SEND_INTERVAL):
+    def __init__(self, interval: float = CLIENT_SEND_INTERVAL, batch_size: int = 0, priority: int = None,
+                 ttl: float = TASK_TTL, source: str = "auto"):
         self.interval = interval
+        self.batch_size = batch_size
+        # Source (ou locataire) des tâches: détermine leur sous-queue si elle a un poids configuré
+        self.source = source
+        # Priorité des tâches publiées: explicite (--priority), sinon celle de la source
+        self.priority = task_priority(source, priority)
+        # Durée de validité des tâches (secondes), None pour des tâches sans échéance
+        self.ttl = ttl or None
         self.sent_count = 0
         self.connection = None
         self.channel = None
@@ -45,12 +54,8 @@ class TaskProducer:
                 self.connection = pika.BlockingConnection(connection_params)
                 self.channel = self.connection.channel()
                 
-                # Déclarer toutes les queues
-                for operation, queue_name in TASK_QUEUES.items():
-                    self.channel.queue_declare(queue=queue_name, durable=True)
-                
-                # Déclarer l'exchange pour les opérations "all"
-                self.channel.exchange_declare(exchange=ALL_OPERATIONS_EXCHANGE, exchange_type='fanout')
+                # Déclarer toutes les queues, l'exchange "all", les paliers de retry et les queues de côté
+                declare_topology(self.channel, TASK_QUEUES)
                 
                 print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
                 return True
@@ -82,31 +87,34 @@ class TaskProducer:
         """Envoie une tâche de calcul"""
         try:
             if operation == 'all':
-                # Pour l'opération "all", envoyer à toutes les queues via l'exchange
-                for op in ['add', 'sub', 'mul', 'div']:
-                    task_message = create_task_message(n1, n2, op)
-                    
-                    # Publier via l'exchange fanout
-                    self.channel.basic_publish(
-                        exchange=ALL_OPERATIONS_EXCHANGE,
-                        routing_key='',
-                        body=serialize_message(task_message),
-                        properties=pika.BasicProperties(delivery_mode=2)
-                    )
+                # Pour l'opération "all", un seul message via l'exchange fanout:
+                # chaque queue le reçoit une fois et chaque worker calcule sa propre opération
+                task_message = create_task_message(n1, n2, ALL_OPERATION, source=self.source, ttl=self.ttl)
+                
+                self.channel.basic_publish(
+                    exchange=ALL_OPERATIONS_EXCHANGE,
+                    routing_key='',
+                    body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                    properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                    priority=self.priority,
+                                                    expiration=message_expiration(task_message))
+                )
                     
-                print(f"{Fore.BLUE}📤 Tâche 'all' envoyée: {n1} × 4_opérations × {n2}{Style.RESET_ALL}")
+                print(f"{Fore.BLUE}📤 Tâche 'all' envoyée: {n1} × 4_opérations × {n2} (ID: {task_message['request_id'][:8]}){Style.RESET_ALL}")
                 self.sent_count += 4  # Compter les 4 opérations
                 
             else:
                 # Opération normale
-                task_message = create_task_message(n1, n2, operation)
-                queue_name = TASK_QUEUES[operation]
+                task_message = create_task_message(n1, n2, operation, source=self.source, ttl=self.ttl)
+                queue_name = task_routing_key(operation, self.source)
                 
                 self.channel.basic_publish(
-                    exchange='',
+                    exchange=TASKS_EXCHANGE,
                     routing_key=queue_name,
-                    body=serialize_message(task_message),
-                    properties=pika.BasicProperties(delivery_mode=2)
+                    body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                    properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                    priority=self.priority,
+                                                    expiration=message_expiration(task_message))
                 )
                 
                 print(f"{Fore.BLUE}📤 Tâche envoyée: {n1} {operation} {n2} (ID: {task_message['request_id'][:8]}){Style.RESET_ALL}")
@@ -115,6 +123,35 @@ class TaskProducer:
         except Exception as e:
             print(f"{Fore.RED}❌ Erreur lors de l'envoi: {e}{Style.RESET_ALL}")
     
+    def generate_random_batch(self, size: int):
+        """Génère un lot aléatoire de paires d'opérandes pour une même opération"""
+        operation = random.choice(['add', 'sub', 'mul', 'div'])
+        n1_values = [round(random.uniform(1, 100), 2) for _ in range(size)]
+        n2_values = [round(random.uniform(1, 100), 2) for _ in range(size)]
+        return n1_values, n2_values, operation
+    
+    def send_batch_task(self, n1_values, n2_values, operation: str):
+        """Envoie un lot de calculs dans un seul message"""
+        try:
+            task_message = create_batch_task_message(n1_values, n2_values, operation, source=self.source, ttl=self.ttl)
+            queue_name = task_routing_key(operation, self.source)
+            
+            self.channel.basic_publish(
+                exchange=TASKS_EXCHANGE,
+                routing_key=queue_name,
+                body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                priority=self.priority,
+                                                expiration=message_expiration(task_message))
+            )
+            
+            count = len(task_message['n1'])
+            print(f"{Fore.BLUE}📤 Lot envoyé: {count} calculs '{operation}' (ID: {task_message['request_id'][:8]}){Style.RESET_ALL}")
+            self.sent_count += count
+            
+        except Exception as e:
+            print(f"{Fore.RED}❌ Erreur lors de l'envoi du lot: {e}{Style.RESET_ALL}")
+    
     def start_automatic_sending(self, max_count: int = None):
         """Démarre l'envoi automatique de tâches"""
         if not self.connect_to_rabbitmq():
@@ -128,9 +165,13 @@ class TaskProducer:
                     print(f"{Fore.GREEN}✅ Nombre maximum de tâches envoyées ({max_count}){Style.RESET_ALL}")
                     break
                 
-                # Générer et envoyer une tâche aléatoire
-                n1, n2, operation = self.generate_random_task()
-                self.send_task(n1, n2, operation)
+                # Générer et envoyer une tâche (ou un lot) aléatoire
+                if self.batch_size > 0:
+                    n1_values, n2_values, operation = self.generate_random_batch(self.batch_size)
+                    self.send_batch_task(n1_values, n2_values, operation)
+                else:
+                    n1, n2, operation = self.generate_random_task()
+                    self.send_task(n1, n2, operation)
                 
                 # Attendre avant le prochain envoi
                 time.sleep(self.interval)
@@ -160,10 +201,18 @@ def main():
                         help='Nombre maximum de tâches à envoyer (illimité par défaut)')
     parser.add_argument('--manual', nargs=3, metavar=('N1', 'N2', 'OP'),
                         help='Envoyer une tâche manuelle: N1 N2 OPERATION')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help='Envoyer des lots de N calculs par message (désactivé par défaut)')
+    parser.add_argument('--priority', type=int, default=None,
+                        help=f'Priorité des tâches, 0 à {TASK_MAX_PRIORITY} (défaut: {TASK_PRIORITIES["auto"]})')
+    parser.add_argument('--ttl', type=float, default=TASK_TTL,
+                        help='Durée de validité des tâches en secondes, 0 pour aucune échéance (défaut: TASK_TTL)')
+    parser.add_argument('--source', default='auto',
+                        help='Source (ou locataire) des tâches; sous-queue dédiée si présente dans TASK_SOURCE_WEIGHTS (défaut: auto)')
     
     args = parser.parse_args()
     
-    producer = TaskProducer(args.interval)
+    producer = TaskProducer(args.interval, args.batch_size, args.priority, args.ttl, args.source)
     
     if args.manual:
         try:
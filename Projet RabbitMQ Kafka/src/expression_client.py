@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Client d'expressions: découpe une expression en opérations binaires calculées en parallèle par les workers
+Usage: python expression_client.py ["(a+b)*(c-d)/e" --var a=1 --var b=2 ...] [--timeout SECONDES] [--verbose]
+"""
+
+import sys
+import os
+import time
+import argparse
+import pika
+from colorama import init, Fore, Style
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key
+from utils.expression_dag import ExpressionDag
+
+# Initialiser colorama
+init()
+
+
+class ExpressionClient:
+    """
+    Évalue une expression en envoyant chaque opération prête comme une tâche ordinaire
+
+    Les résultats sont adressés par les workers à la queue exclusive du client (champ reply_to),
+    sans passer par l'exchange des résultats: dès qu'un résultat arrive, les opérations qui en dépendaient et dont tous les opérandes sont connus
+    partent à leur tour. Les opérations les plus éloignées de la racine (chemin critique) sont
+    envoyées en premier, avec une priorité plus haute.
+    """
+
+    def __init__(self, priority: int = None, timeout: float = EXPRESSION_TIMEOUT, source: str = "web",
+                 verbose: bool = False):
+        self.source = source
+        self.priority = task_priority(source, priority)
+        self.timeout = timeout
+        self.verbose = verbose
+        self.connection = None
+        self.channel = None
+        self.reply_queue = None
+        self.dag = None
+        # Tâches envoyées pour l'expression en cours: request_id -> nœud du graphe
+        self.in_flight = {}
+
+        print(f"{Fore.GREEN}🚀 Client d'expressions démarré{Style.RESET_ALL}")
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion et crée la queue exclusive de réception des résultats"""
+        if self.connection and not self.connection.is_closed:
+            return True
+
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+
+            self.reply_queue = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            self.channel.basic_consume(queue=self.reply_queue, on_message_callback=self.on_result, auto_ack=True)
+
+            print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def dispatch_ready(self):
+        """Envoie toutes les opérations dont les opérandes sont connus, chemin critique le plus long d'abord"""
+        for index in self.dag.ready():
+            operation, n1, n2 = self.dag.operands(index)
+            task_message = create_task_message(n1, n2, operation, source=self.source, ttl=self.timeout,
+                                               reply_to=self.reply_queue)
+            self.channel.basic_publish(
+                exchange=TASKS_EXCHANGE,
+                routing_key=task_routing_key(operation, self.source),
+                body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                priority=task_priority(self.source, self.priority +
+                                                                       self.dag.critical_path[index] - 1),
+                                                expiration=message_expiration(task_message))
+            )
+            self.dag.mark_dispatched(index)
+            self.in_flight[task_message["request_id"]] = index
+            if self.verbose:
+                print(f"{Fore.BLUE}📤 Étape envoyée: {self.dag.describe(index)} "
+                      f"(chemin critique: {self.dag.critical_path[index]}){Style.RESET_ALL}")
+
+    def on_result(self, channel, method, properties, body):
+        """Résultat d'une opération de l'expression: alimente le graphe et envoie les opérations débloquées"""
+        try:
+            result_message = decode_message(body, properties.content_type)
+        except Exception:
+            return
+        # Résultats d'une expression abandonnée et doublons ignorés
+        index = self.in_flight.pop(result_message.get("request_id"), None)
+        if index is None or self.dag is None:
+            return
+
+        self.dag.complete(index, result_message["result"])
+        if self.verbose:
+            print(f"{Fore.GREEN}📥 {self.dag.describe(index)} = {result_message['result']} "
+                  f"(Worker: {result_message['worker_id']}){Style.RESET_ALL}")
+        self.dispatch_ready()
+
+    def cancel_in_flight(self):
+        """Annule les opérations encore en attente ou en cours après un abandon"""
+        for request_id in self.in_flight:
+            self.channel.basic_publish(
+                exchange=CONTROL_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_cancel_message(request_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+            )
+        self.in_flight.clear()
+
+    def evaluate(self, expression: str, variables=None):
+        """Évalue l'expression sur les workers; renvoie son résultat, ou None en cas d'erreur ou de délai dépassé"""
+        try:
+            self.dag = ExpressionDag(expression, variables, EXPRESSION_MAX_NODES)
+        except (ValueError, OverflowError, RecursionError) as e:
+            # Expression invalide, constante hors des flottants ou imbrication trop profonde
+            print(f"{Fore.RED}❌ Expression rejetée: {e}{Style.RESET_ALL}")
+            return None
+        if not self.connect_to_rabbitmq():
+            return None
+
+        operations = len(self.dag.nodes)
+        print(f"{Fore.CYAN}🧮 {expression}: {operations} opérations, profondeur {self.dag.depth}{Style.RESET_ALL}")
+        start = time.monotonic()
+        self.in_flight.clear()
+        try:
+            self.dispatch_ready()
+            while not self.dag.done:
+                remaining = start + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    print(f"{Fore.RED}⏱️  Délai dépassé ({self.timeout:.0f}s): "
+                          f"{len(self.dag.values)}/{operations} opérations calculées{Style.RESET_ALL}")
+                    self.cancel_in_flight()
+                    return None
+                self.connection.process_data_events(time_limit=min(1.0, remaining))
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Évaluation interrompue{Style.RESET_ALL}")
+            self.cancel_in_flight()
+            return None
+
+        elapsed = time.monotonic() - start
+        print(f"{Fore.GREEN}✅ {expression} = {self.dag.result} "
+              f"({elapsed:.1f}s pour {operations} opérations en {self.dag.depth} étapes){Style.RESET_ALL}")
+        return self.dag.result
+
+    def run_interactive(self, variables):
+        """Boucle de saisie: une expression par ligne, 'quit' pour sortir"""
+        print(f"{Fore.CYAN}   Saisissez une expression (ex: (a+b)*(c-d)/e), 'quit' pour sortir{Style.RESET_ALL}")
+        while True:
+            try:
+                expression = input(f"{Fore.WHITE}expr> {Style.RESET_ALL}").strip()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if expression in ('quit', 'exit'):
+                break
+            if expression:
+                self.evaluate(expression, variables)
+
+    def close(self):
+        if self.connection and self.connection.is_open:
+            self.connection.close()
+
+
+def parse_variable(value):
+    """Analyse --var: ex. 'a=1.5'"""
+    name, _, number = value.partition('=')
+    try:
+        return name.strip(), float(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Variable invalide: {value} (format: nom=nombre)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Évaluation distribuée d\'expressions arithmétiques')
+    parser.add_argument('expression', nargs='?',
+                        help='Expression à évaluer (mode interactif si absente)')
+    parser.add_argument('--var', type=parse_variable, action='append', default=[],
+                        help='Valeur d\'une variable de l\'expression (ex: --var a=1.5), répétable')
+    parser.add_argument('--timeout', type=float, default=EXPRESSION_TIMEOUT,
+                        help=f'Délai max d\'évaluation en secondes (défaut: {EXPRESSION_TIMEOUT})')
+    parser.add_argument('--priority', type=int, default=None,
+                        help=f'Priorité de base des opérations, 0 à {TASK_MAX_PRIORITY} (défaut: {TASK_PRIORITIES["web"]})')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Afficher chaque étape envoyée et reçue')
+
+    args = parser.parse_args()
+    variables = dict(args.var)
+
+    client = ExpressionClient(args.priority, args.timeout, verbose=args.verbose)
+    try:
+        if args.expression:
+            if client.evaluate(args.expression, variables) is None:
+                sys.exit(1)
+        else:
+            client.run_interactive(variables)
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
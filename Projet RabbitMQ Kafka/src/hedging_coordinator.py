@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Coordinateur d'exécution spéculative: duplique les tâches retardataires vers un autre worker
+Usage: python hedging_coordinator.py [--percentile 95] [--max-hedge-rate 0.05] [--no-cancel-losers] [--verbose]
+"""
+
+import sys
+import os
+import copy
+import time
+import argparse
+from collections import defaultdict, deque, OrderedDict
+import pika
+from colorama import init, Fore, Style
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology, task_lanes
+from utils.latency_stats import LatencyWindow
+from utils.seen_set import RecentIds
+
+# Initialiser colorama
+init()
+
+
+class HedgingCoordinator:
+    """
+    Observe les tâches publiées (exchange des tâches et exchange "all"), leur démarrage sur un worker
+    (exchange des événements) et les résultats (exchange des résultats) par des queues exclusives.
+    Une tâche démarrée, sans résultat, dont le temps d'exécution dépasse le percentile courant des
+    temps d'exécution est republiée une fois dans sa queue avec la priorité maximale, devant
+    l'arriéré: le premier résultat gagne, les consommateurs ignorent le second par son identité
+    (request_id, opération). L'attente en queue n'est jamais comptée, et les duplications sont
+    plafonnées à `max_hedge_rate` des complétions de la fenêtre glissante: une rafale n'en déclenche
+    pas davantage.
+    """
+
+    # Intervalle (secondes) entre deux affichages des statistiques
+    REPORT_INTERVAL = 30
+
+    def __init__(self, verbose: bool = False, percentile: float = 95, cancel_losers: bool = True,
+                 check_interval: float = HEDGE_CHECK_INTERVAL, min_samples: int = HEDGE_MIN_SAMPLES,
+                 max_pending: int = HEDGE_MAX_PENDING, max_hedge_rate: float = HEDGE_MAX_RATE,
+                 budget_window: float = HEDGE_BUDGET_WINDOW):
+        self.verbose = verbose
+        self.percentile = percentile
+        self.cancel_losers = cancel_losers
+        self.max_hedge_rate = max_hedge_rate
+        self.budget_window = budget_window
+        # Instants des complétions et des duplications de la fenêtre glissante (budget de duplication)
+        self.recent_completions = deque()
+        self.recent_hedges = deque()
+        self.check_interval = check_interval
+        self.min_samples = min_samples
+        self.max_pending = max_pending
+        self.connection = None
+        self.channel = None
+        # Tâches sans résultat, dans l'ordre d'observation: identité -> copie à republier
+        self.pending = OrderedDict()
+        # Calculs dupliqués et déjà terminés: un résultat supplémentaire est du travail gaspillé
+        self.hedged_done = RecentIds(max_pending)
+        # Temps d'exécution (démarrage sur un worker -> premier résultat)
+        self.completion_times = LatencyWindow()
+        self.stats = defaultdict(float)
+        self.last_report = time.monotonic()
+
+        print(f"{Fore.GREEN}🚀 Coordinateur d'exécution spéculative démarré (seuil: p{percentile:g}){Style.RESET_ALL}")
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion et crée les queues exclusives d'observation des tâches et des résultats"""
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+
+            task_tap = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            for operation in TASK_QUEUES:
+                for _, queue_name in task_lanes(operation):
+                    self.channel.queue_bind(queue=task_tap, exchange=TASKS_EXCHANGE, routing_key=queue_name)
+            self.channel.queue_bind(queue=task_tap, exchange=ALL_OPERATIONS_EXCHANGE)
+            event_tap = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            self.channel.queue_bind(queue=event_tap, exchange=TASK_EVENTS_EXCHANGE)
+            result_tap = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            self.channel.queue_bind(queue=result_tap, exchange=RESULTS_EXCHANGE)
+
+            self.channel.basic_consume(queue=task_tap, on_message_callback=self.on_task, auto_ack=True)
+            self.channel.basic_consume(queue=event_tap, on_message_callback=self.on_started, auto_ack=True)
+            self.channel.basic_consume(queue=result_tap, on_message_callback=self.on_result, auto_ack=True)
+
+            print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def on_task(self, channel, method, properties, body):
+        """Tâche publiée: suivie jusqu'à son premier résultat (une entrée par opération pour "all")"""
+        try:
+            task_message = decode_message(body, properties.content_type)
+            operation = task_message["operation"]
+            request_id = task_message["request_id"]
+        except Exception:
+            return
+        if "reply_to" in task_message:
+            # Partition de réduction ou plage par référence: le résultat va au demandeur, jamais sur l'exchange observé
+            return
+
+        operations = OPERATIONS if operation == ALL_OPERATION else [operation]
+        for op in operations:
+            self.pending[f"{request_id}:{op}"] = {
+                "queue": TASK_QUEUES[op],
+                "task": task_message,
+                "body": body,
+                "properties": properties,
+                "seen_at": time.monotonic(),
+                "started_at": None,
+                "hedged": False
+            }
+            self.stats['tasks'] += 1
+
+        # Mémoire bornée: les plus anciennes tâches cessent d'être suivies
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+            self.stats['untracked'] += 1
+
+    def on_started(self, channel, method, properties, body):
+        """Tâche démarrée par un worker: son temps d'exécution court à partir de là (premier démarrage)"""
+        try:
+            event = decode_message(body, properties.content_type)
+            entry = self.pending.get(message_identity(event))
+        except Exception:
+            return
+        if entry is not None and entry["started_at"] is None:
+            entry["started_at"] = time.monotonic()
+
+    def on_result(self, channel, method, properties, body):
+        """Résultat publié: le premier termine la tâche, un suivant d'une tâche dupliquée est du travail perdu"""
+        try:
+            result_message = decode_message(body, properties.content_type)
+            key = message_identity(result_message)
+        except Exception:
+            return
+
+        entry = self.pending.pop(key, None)
+        if entry is not None:
+            now = time.monotonic()
+            if entry["started_at"] is not None:
+                self.completion_times.record(now - entry["started_at"])
+            self.recent_completions.append(now)
+            self.stats['completed'] += 1
+            if entry["hedged"]:
+                self.hedged_done.add(key)
+                self.cancel_loser(entry)
+        elif key in self.hedged_done:
+            self.stats['wasted_results'] += 1
+            self.stats['wasted_seconds'] += result_message.get("processing_time", 0.0)
+            if self.verbose:
+                print(f"{Fore.WHITE}   ♻️  Résultat perdant de {key[:8]} "
+                      f"({result_message.get('processing_time', 0.0):.1f}s de calcul gaspillé){Style.RESET_ALL}")
+
+    def cancel_loser(self, entry):
+        """Annule la copie encore en attente ou en cours (sauf tâche "all": l'annulation viserait toutes ses opérations)"""
+        if not self.cancel_losers or entry["task"]["operation"] == ALL_OPERATION:
+            return
+        self.channel.basic_publish(
+            exchange=CONTROL_EXCHANGE,
+            routing_key='',
+            body=serialize_message(create_cancel_message(entry["task"]["request_id"])),
+            properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+        )
+
+    def threshold(self):
+        """Âge au-delà duquel une tâche est dupliquée, None tant que les mesures sont insuffisantes"""
+        if self.completion_times.count < self.min_samples:
+            return None
+        return self.completion_times.percentile(self.percentile)
+
+    def hedge_budget(self, now):
+        """Duplications encore permises: `max_hedge_rate` des complétions de la fenêtre, moins celles déjà faites"""
+        for stamps in (self.recent_completions, self.recent_hedges):
+            while stamps and now - stamps[0] > self.budget_window:
+                stamps.popleft()
+        return int(self.max_hedge_rate * len(self.recent_completions)) - len(self.recent_hedges)
+
+    def check_stragglers(self):
+        """Duplique une fois chaque tâche en exécution depuis plus longtemps que le seuil, dans la limite du budget"""
+        threshold = self.threshold()
+        if threshold is not None:
+            now = time.monotonic()
+            budget = self.hedge_budget(now)
+            for key, entry in self.pending.items():
+                if now - entry["seen_at"] <= threshold:
+                    break  # Tâches suivantes plus récentes: exécution forcément plus courte
+                started_at = entry["started_at"]
+                if entry["hedged"] or started_at is None or now - started_at <= threshold or is_expired(entry["task"]):
+                    continue  # Encore en queue: une copie attendrait derrière le même arriéré
+                if budget <= 0:
+                    self.stats['over_budget'] += 1
+                    break
+                if self.hedge(key, entry, now - started_at):
+                    budget -= 1
+
+        if time.monotonic() - self.last_report >= self.REPORT_INTERVAL:
+            self.last_report = time.monotonic()
+            self.display_stats()
+        self.connection.call_later(self.check_interval, self.check_stragglers)
+
+    def hedge(self, key, entry, running):
+        """
+        Republie une copie de la tâche directement dans sa queue (hors exchange observé), avec la
+        priorité maximale pour qu'un worker la prenne avant l'arriéré; renvoie True si elle est partie
+        """
+        properties = copy.copy(entry["properties"])
+        properties.headers = dict(properties.headers or {}, **{'x-hedge': 1})
+        properties.expiration = message_expiration(entry["task"])
+        properties.priority = TASK_MAX_PRIORITY
+        try:
+            self.channel.basic_publish(exchange='', routing_key=entry["queue"], body=entry["body"],
+                                       properties=properties)
+        except Exception as e:
+            print(f"{Fore.RED}❌ Erreur lors de la duplication: {e}{Style.RESET_ALL}")
+            return False
+
+        entry["hedged"] = True
+        self.recent_hedges.append(time.monotonic())
+        self.stats['hedges'] += 1
+        print(f"{Fore.MAGENTA}🔀 Tâche {key[:8]} dupliquée vers '{entry['queue']}' "
+              f"(en exécution depuis {running:.1f}s > p{self.percentile:g} {self.threshold():.1f}s){Style.RESET_ALL}")
+        return True
+
+    def display_stats(self):
+        """Affiche le taux de duplication et le travail gaspillé"""
+        tasks = self.stats['tasks']
+        hedge_rate = 100 * self.stats['hedges'] / tasks if tasks else 0
+        threshold = self.threshold()
+        print(f"\n{Fore.YELLOW}📊 === EXÉCUTION SPÉCULATIVE ==={Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}   Tâches suivies: {tasks:.0f} (en attente: {len(self.pending)}, "
+              f"plus suivies: {self.stats['untracked']:.0f}){Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}   Seuil: {f'{threshold:.1f}s' if threshold is not None else 'mesures insuffisantes'} "
+              f"(exécution: {self.completion_times.describe()}){Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}   Duplications: {self.stats['hedges']:.0f} ({hedge_rate:.1f}% des tâches, "
+              f"plafond {100 * self.max_hedge_rate:g}% des complétions sur {self.budget_window:.0f}s; "
+              f"budget épuisé {self.stats['over_budget']:.0f} fois){Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}   Travail gaspillé: {self.stats['wasted_results']:.0f} résultats perdants, "
+              f"{self.stats['wasted_seconds']:.1f}s de calcul{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}================================{Style.RESET_ALL}\n")
+
+    def start(self):
+        """Démarre l'observation et la vérification périodique des retardataires"""
+        if not self.connect_to_rabbitmq():
+            return
+
+        self.connection.call_later(self.check_interval, self.check_stragglers)
+        print(f"{Fore.CYAN}👂 Observation des tâches et des résultats...{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Pour arrêter, appuyez sur CTRL+C{Style.RESET_ALL}")
+
+        try:
+            self.channel.start_consuming()
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Arrêt du coordinateur...{Style.RESET_ALL}")
+            self.channel.stop_consuming()
+            self.connection.close()
+            self.display_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coordinateur d\'exécution spéculative des tâches retardataires')
+    parser.add_argument('--percentile', type=float, default=95,
+                        help='Percentile des temps de complétion au-delà duquel une tâche est dupliquée (défaut: 95)')
+    parser.add_argument('--max-hedge-rate', type=float, default=HEDGE_MAX_RATE,
+                        help=f'Part max des complétions récentes pouvant être dupliquées (défaut: {HEDGE_MAX_RATE})')
+    parser.add_argument('--no-cancel-losers', action='store_true',
+                        help='Ne pas annuler la copie perdante une fois le premier résultat reçu')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Afficher chaque résultat perdant')
+
+    args = parser.parse_args()
+
+    if not 0 <= args.max_hedge_rate <= 1:
+        parser.error('--max-hedge-rate doit être compris entre 0 et 1')
+
+    coordinator = HedgingCoordinator(args.verbose, args.percentile, not args.no_cancel_losers,
+                                     max_hedge_rate=args.max_hedge_rate)
+    coordinator.start()
+
+
+if __name__ == '__main__':
+    main()
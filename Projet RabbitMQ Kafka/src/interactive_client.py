@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """
 Client interactif pour envoyer des tâches de calcul manuellement
-Usage: python interactive_client.py
+Usage: python interactive_client.py [--priority N] [--ttl SECONDES] [--source NOM]
 """
 
 import sys
 import os
+import argparse
 import pika
 from colorama import init, Fore, Style
 
@@ -14,16 +15,23 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.rabbitmq_config import *
 from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key, task_lanes
 
 # Initialiser colorama
 init()
 
 
 class InteractiveClient:
-    def __init__(self):
+    def __init__(self, priority: int = None, ttl: float = TASK_TTL, source: str = "web"):
         self.connection = None
         self.channel = None
         self.sent_count = 0
+        # Tâches saisies par un utilisateur: source "web" comme l'interface web, sauf --source; la source
+        # donne à la fois le champ du message, la sous-queue (voie) et la priorité par défaut
+        self.source = source
+        self.priority = task_priority(source, priority)
+        # Durée de validité des tâches (secondes), None pour des tâches sans échéance
+        self.ttl = ttl or None
         
         print(f"{Fore.GREEN}🚀 Client interactif démarré{Style.RESET_ALL}")
         print(f"{Fore.CYAN}   Tapez 'help' pour voir les commandes disponibles{Style.RESET_ALL}")
@@ -43,12 +51,8 @@ class InteractiveClient:
             self.connection = pika.BlockingConnection(connection_params)
             self.channel = self.connection.channel()
             
-            # Déclarer toutes les queues
-            for operation, queue_name in TASK_QUEUES.items():
-                self.channel.queue_declare(queue=queue_name, durable=True)
-            
-            # Déclarer l'exchange pour les opérations "all"
-            self.channel.exchange_declare(exchange=ALL_OPERATIONS_EXCHANGE, exchange_type='fanout')
+            # Déclarer toutes les queues, l'exchange "all", les paliers de retry et les queues de côté
+            declare_topology(self.channel, TASK_QUEUES)
             
             print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
             return True
@@ -64,32 +68,33 @@ class InteractiveClient:
             
         try:
             if operation == 'all':
-                # Pour l'opération "all", envoyer à toutes les queues
-                sent_ops = []
-                for op in ['add', 'sub', 'mul', 'div']:
-                    task_message = create_task_message(n1, n2, op)
-                    
-                    self.channel.basic_publish(
-                        exchange=ALL_OPERATIONS_EXCHANGE,
-                        routing_key='',
-                        body=serialize_message(task_message),
-                        properties=pika.BasicProperties(delivery_mode=2)
-                    )
-                    sent_ops.append(op)
+                # Pour l'opération "all", un seul message reçu une fois par chaque queue
+                task_message = create_task_message(n1, n2, ALL_OPERATION, source=self.source, ttl=self.ttl)
+                
+                self.channel.basic_publish(
+                    exchange=ALL_OPERATIONS_EXCHANGE,
+                    routing_key='',
+                    body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                    properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                    priority=self.priority,
+                                                    expiration=message_expiration(task_message))
+                )
                     
-                print(f"{Fore.GREEN}✅ Tâche 'all' envoyée: {n1} × [{', '.join(sent_ops)}] × {n2}{Style.RESET_ALL}")
+                print(f"{Fore.GREEN}✅ Tâche 'all' envoyée: {n1} × [{', '.join(OPERATIONS)}] × {n2} (ID: {task_message['request_id'][:8]}){Style.RESET_ALL}")
                 self.sent_count += 4
                 
             else:
                 # Opération normale
-                task_message = create_task_message(n1, n2, operation)
-                queue_name = TASK_QUEUES[operation]
+                task_message = create_task_message(n1, n2, operation, source=self.source, ttl=self.ttl)
+                queue_name = task_routing_key(operation, self.source)
                 
                 self.channel.basic_publish(
-                    exchange='',
+                    exchange=TASKS_EXCHANGE,
                     routing_key=queue_name,
-                    body=serialize_message(task_message),
-                    properties=pika.BasicProperties(delivery_mode=2)
+                    body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                    properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                    priority=self.priority,
+                                                    expiration=message_expiration(task_message))
                 )
                 
                 print(f"{Fore.GREEN}✅ Tâche envoyée: {n1} {operation} {n2} (ID: {task_message['request_id'][:8]}){Style.RESET_ALL}")
@@ -101,6 +106,29 @@ class InteractiveClient:
             print(f"{Fore.RED}❌ Erreur lors de l'envoi: {e}{Style.RESET_ALL}")
             return False
     
+    def cancel_task(self, request_id: str):
+        """Diffuse l'annulation d'une requête à tous les workers (ID complet ou 8 premiers caractères)"""
+        if not is_cancel_id(request_id):
+            print(f"{Fore.RED}❌ ID invalide: {request_id} (ID complet de 16 caractères hexadécimaux "
+                  f"ou ses 8 premiers){Style.RESET_ALL}")
+            return False
+        if not self.connect_to_rabbitmq():
+            return False
+        
+        try:
+            self.channel.basic_publish(
+                exchange=CONTROL_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_cancel_message(request_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+            )
+            print(f"{Fore.GREEN}🛑 Annulation envoyée pour la requête {request_id}{Style.RESET_ALL}")
+            return True
+            
+        except Exception as e:
+            print(f"{Fore.RED}❌ Erreur lors de l'annulation: {e}{Style.RESET_ALL}")
+            return False
+    
     def show_help(self):
         """Affiche l'aide"""
         print(f"\n{Fore.YELLOW}📋 === COMMANDES DISPONIBLES ==={Style.RESET_ALL}")
@@ -108,6 +136,7 @@ class InteractiveClient:
         print(f"{Fore.CYAN}  all <n1> <n2>         - Envoie aux 4 opérations (ex: all 10 2){Style.RESET_ALL}")
         print(f"{Fore.CYAN}  random                - Génère et envoie un calcul aléatoire{Style.RESET_ALL}")
         print(f"{Fore.CYAN}  batch <count>         - Envoie plusieurs calculs aléatoires{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}  cancel <request_id>   - Annule une requête en attente ou en cours{Style.RESET_ALL}")
         print(f"{Fore.CYAN}  stats                 - Affiche les statistiques{Style.RESET_ALL}")
         print(f"{Fore.CYAN}  queue                 - Vérifie l'état des queues{Style.RESET_ALL}")
         print(f"{Fore.CYAN}  help                  - Affiche cette aide{Style.RESET_ALL}")
@@ -166,11 +195,14 @@ class InteractiveClient:
         print(f"\n{Fore.YELLOW}📊 === ÉTAT DES QUEUES ==={Style.RESET_ALL}")
         
         try:
-            # Vérifier les queues de tâches
-            for operation, queue_name in TASK_QUEUES.items():
-                method = self.channel.queue_declare(queue=queue_name, durable=True, passive=True)
-                count = method.method.message_count
-                print(f"{Fore.CYAN}   {operation.upper()}: {count} messages en attente{Style.RESET_ALL}")
+            # Vérifier les queues de tâches (queue partagée et sous-queues par source)
+            for operation in TASK_QUEUES:
+                counts = {}
+                for lane, queue_name in task_lanes(operation):
+                    method = self.channel.queue_declare(queue=queue_name, durable=True, passive=True)
+                    counts[lane] = method.method.message_count
+                detail = ', '.join(f"{lane}: {count}" for lane, count in counts.items())
+                print(f"{Fore.CYAN}   {operation.upper()}: {sum(counts.values())} messages en attente ({detail}){Style.RESET_ALL}")
             
             # Vérifier la queue des résultats
             method = self.channel.queue_declare(queue=RESULT_QUEUE, durable=True, passive=True)
@@ -247,6 +279,13 @@ class InteractiveClient:
             except ValueError:
                 print(f"{Fore.RED}❌ Le nombre doit être un entier{Style.RESET_ALL}")
                 
+        elif cmd == 'cancel':
+            if len(parts) != 2:
+                print(f"{Fore.RED}❌ Usage: cancel <request_id>{Style.RESET_ALL}")
+                return True
+                
+            self.cancel_task(parts[1].lower())
+                
         elif cmd == 'stats':
             self.show_stats()
             
@@ -283,7 +322,16 @@ class InteractiveClient:
 
 
 def main():
-    client = InteractiveClient()
+    parser = argparse.ArgumentParser(description='Client interactif de calcul distribué')
+    parser.add_argument('--priority', type=int, default=None,
+                        help=f'Priorité des tâches, 0 à {TASK_MAX_PRIORITY} (défaut: celle de la source)')
+    parser.add_argument('--ttl', type=float, default=TASK_TTL,
+                        help='Durée de validité des tâches en secondes, 0 pour aucune échéance (défaut: TASK_TTL)')
+    parser.add_argument('--source', default='web',
+                        help='Source des tâches, qui fixe leur sous-queue et leur priorité par défaut (défaut: web)')
+    args = parser.parse_args()
+    
+    client = InteractiveClient(args.priority, args.ttl, args.source)
     client.start_interactive_mode()
 
 
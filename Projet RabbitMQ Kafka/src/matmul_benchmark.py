@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai du produit matriciel par blocs: tailles de tuiles et nombres de workers comparés à NumPy en un processus
+Usage: python matmul_benchmark.py [--size 512] [--tiles 64,128,256] [--workers 1,2,4] [--repeat 3]
+"""
+
+import sys
+import os
+import time
+import signal
+import argparse
+import subprocess
+from array import array
+from colorama import init, Fore, Style
+
+try:
+    import numpy as np
+except ImportError:  # La référence du banc d'essai est le produit NumPy
+    np = None
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from matmul_client import MatmulJobClient
+
+# Initialiser colorama
+init()
+
+# Délai max (secondes) pour que les workers lancés s'abonnent à la queue de 'mul'
+WORKER_STARTUP_TIMEOUT = 30
+
+
+def consumer_count(channel):
+    """Nombre de consommateurs de la queue de 'mul' (un par processus worker)"""
+    return channel.queue_declare(queue=TASK_QUEUES['mul'], passive=True).method.consumer_count
+
+
+def start_workers(channel, count: int):
+    """Lance `count` processus workers 'mul' sans temps de traitement simulé et attend leur abonnement"""
+    already = consumer_count(channel)
+    env = dict(os.environ, WORKER_PROCESSING_TIME_MIN='0', WORKER_PROCESSING_TIME_MAX='0')
+    worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+    # Groupe de processus dédié: CTRL+C simulé atteint le superviseur et ses enfants
+    process = subprocess.Popen([sys.executable, worker_script, 'mul', '--processes', str(count)],
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=(os.name == 'posix'))
+    deadline = time.monotonic() + WORKER_STARTUP_TIMEOUT
+    while consumer_count(channel) < already + count:
+        if process.poll() is not None or time.monotonic() > deadline:
+            stop_workers(process)
+            raise RuntimeError(f"{count} workers 'mul' non démarrés")
+        time.sleep(0.2)
+    return process
+
+
+def stop_workers(process):
+    """Arrête les workers lancés comme un CTRL+C (le superviseur et ses processus enfants)"""
+    if process.poll() is None:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGINT)
+        else:
+            process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            if os.name == 'posix':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+
+
+def best_time(function, repeat: int):
+    """Meilleur temps d'exécution sur `repeat` essais, et le dernier résultat"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def parse_sizes(value):
+    """Analyse une liste d'entiers positifs: ex. '64,128,256'"""
+    try:
+        sizes = [int(size) for size in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Liste invalide: {value} (ex: 64,128,256)")
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError(f"Liste invalide: {value} (valeurs positives)")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Banc d\'essai du produit matriciel par blocs')
+    parser.add_argument('--size', type=int, default=512,
+                        help='Côté des matrices carrées aléatoires (défaut: 512)')
+    parser.add_argument('--tiles', type=parse_sizes, default=[64, 128, 256],
+                        help='Tailles de tuiles comparées (défaut: 64,128,256)')
+    parser.add_argument('--workers', type=parse_sizes, default=[1, 2, 4],
+                        help='Nombres de processus workers \'mul\' comparés (défaut: 1,2,4)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Essais par configuration, le meilleur temps est retenu (défaut: 3)')
+    parser.add_argument('--max-in-flight', type=int, default=MATMUL_MAX_IN_FLIGHT,
+                        help=f'Produits de blocs envoyés sans résultat au plus (défaut: {MATMUL_MAX_IN_FLIGHT})')
+
+    args = parser.parse_args()
+    if np is None:
+        print(f"{Fore.RED}❌ NumPy est requis pour la référence du banc d'essai{Style.RESET_ALL}")
+        sys.exit(1)
+
+    size = args.size
+    rng = np.random.default_rng()
+    a = rng.uniform(-1, 1, (size, size))
+    b = rng.uniform(-1, 1, (size, size))
+    flops = 2 * size ** 3
+
+    reference_time, expected = best_time(lambda: a @ b, args.repeat)
+    print(f"{Fore.CYAN}📏 NumPy en un processus ({size}x{size}): {1000 * reference_time:.1f}ms "
+          f"({flops / reference_time / 1e9:.2f} GFLOP/s){Style.RESET_ALL}")
+
+    client = MatmulJobClient(max_in_flight=args.max_in_flight)
+    if not client.connect_to_rabbitmq():
+        sys.exit(1)
+    if consumer_count(client.channel):
+        print(f"{Fore.YELLOW}⚠️  Des workers 'mul' sont déjà actifs: ils participent aux mesures{Style.RESET_ALL}")
+
+    results = []
+    a_values, b_values = array('d', a.ravel()), array('d', b.ravel())
+    try:
+        for workers in args.workers:
+            process = start_workers(client.channel, workers)
+            try:
+                for tile in args.tiles:
+                    client.tile = tile
+                    elapsed, c = best_time(lambda: client.multiply(a_values, b_values, size, size, size), args.repeat)
+                    if c is None:
+                        raise RuntimeError(f"Produit échoué (tuiles de {tile}, {workers} workers)")
+                    error = float(np.max(np.abs(np.frombuffer(c).reshape(size, size) - expected)))
+                    results.append((workers, tile, client.job.total, elapsed, error))
+            finally:
+                stop_workers(process)
+    except (RuntimeError, KeyboardInterrupt) as e:
+        print(f"{Fore.RED}❌ Banc d'essai interrompu: {e}{Style.RESET_ALL}")
+    finally:
+        client.close()
+
+    print(f"\n{Fore.YELLOW}📊 === PRODUIT {size}x{size} (NumPy: {1000 * reference_time:.1f}ms) ==={Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}   {'Workers':>7} {'Tuile':>6} {'Produits':>9} {'Temps':>10} {'GFLOP/s':>8} "
+          f"{'vs NumPy':>9} {'Écart max':>10}{Style.RESET_ALL}")
+    for workers, tile, tasks, elapsed, error in results:
+        print(f"{Fore.YELLOW}   {workers:>7} {tile:>6} {tasks:>9} {1000 * elapsed:>8.1f}ms "
+              f"{flops / elapsed / 1e9:>8.2f} {reference_time / elapsed:>8.2f}x {error:>10.2g}{Style.RESET_ALL}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Client de produit matriciel: C = A @ B découpé en produits de blocs calculés par les workers 'mul'
+Usage: python matmul_client.py (--size N | --shape M,K,N) [--tile T] [--max-in-flight N] [--verify] [--verbose]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from array import array
+import pika
+from colorama import init, Fore, Style
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key
+from utils.matmul_job import BlockedMatmul
+
+# Initialiser colorama
+init()
+
+
+class MatmulJobClient:
+    """
+    Calcule un produit matriciel sur la flotte de workers 'mul'
+
+    Chaque produit de blocs A[i, k] @ B[k, j] part comme une tâche vers la queue de 'mul' avec
+    ses deux blocs; le worker renvoie la tuile sur la queue exclusive du client (reply_to), qui
+    l'ajoute à C[i, j]. Au plus `max_in_flight` produits sont envoyés sans résultat: les suivants
+    partent au fil des réponses, si bien que le broker ne garde jamais toute la matrice.
+    """
+
+    def __init__(self, tile: int = MATMUL_TILE_SIZE, timeout: float = MATMUL_TIMEOUT,
+                 max_in_flight: int = MATMUL_MAX_IN_FLIGHT, priority: int = None, source: str = "auto",
+                 verbose: bool = False):
+        self.tile = tile
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.source = source
+        self.priority = task_priority(source, priority)
+        self.verbose = verbose
+        self.connection = None
+        self.channel = None
+        self.reply_queue = None
+        self.job_id = None
+        self.job = None
+        self.blocks = None
+        # Produits envoyés sans résultat: request_id -> position (i, j, k)
+        self.in_flight = {}
+        self.reported = 0
+
+        print(f"{Fore.GREEN}🚀 Client de produit matriciel démarré (tuiles de {tile}){Style.RESET_ALL}")
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion et crée la queue exclusive de réception des tuiles"""
+        if self.connection and not self.connection.is_closed:
+            return True
+
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+
+            # Adressée directement par les workers (exchange par défaut, clé = nom de la queue)
+            self.reply_queue = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            self.channel.basic_consume(queue=self.reply_queue, on_message_callback=self.on_tile, auto_ack=True)
+
+            print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def dispatch_blocks(self):
+        """Envoie les produits de blocs suivants tant que la fenêtre `max_in_flight` n'est pas pleine"""
+        while len(self.in_flight) < self.max_in_flight:
+            try:
+                tile, a_block, b_block, rows, inner, cols = next(self.blocks)
+            except StopIteration:
+                return
+            task_message = create_matmul_task_message(a_block, b_block, rows, inner, cols, tile, self.job_id,
+                                                      self.reply_queue, source=self.source, ttl=self.timeout)
+            # Les blocs sont des tableaux: toujours au format binaire
+            self.channel.basic_publish(
+                exchange=TASKS_EXCHANGE,
+                routing_key=task_routing_key('mul', self.source),
+                body=encode_task_message(task_message, CONTENT_TYPE_BINARY),
+                properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPE_BINARY,
+                                                priority=self.priority,
+                                                expiration=message_expiration(task_message))
+            )
+            self.in_flight[task_message["request_id"]] = tile
+
+    def on_tile(self, channel, method, properties, body):
+        """Tuile reçue: ajoutée à C, produits suivants envoyés, progression affichée par paliers de 10%"""
+        try:
+            result_message = decode_message(body, properties.content_type)
+        except Exception:
+            return
+        # Tuiles d'un travail précédent (abandonné) et doublons ignorés
+        if result_message.get("job") != self.job_id or self.in_flight.pop(result_message["request_id"], None) is None:
+            return
+
+        self.job.accumulate(result_message["tile"], result_message["c"])
+        if self.verbose:
+            print(f"{Fore.WHITE}   📥 Tuile {tuple(result_message['tile'])} "
+                  f"(Worker: {result_message['worker_id']}){Style.RESET_ALL}")
+        step = int(self.job.progress * 10)
+        if step > self.reported:
+            self.reported = step
+            print(f"{Fore.BLUE}⏳ {100 * self.job.progress:.0f}% "
+                  f"({len(self.job.received)}/{self.job.total} produits de blocs){Style.RESET_ALL}")
+        self.dispatch_blocks()
+
+    def cancel_in_flight(self):
+        """Annule les produits encore en attente ou en cours après un abandon"""
+        for request_id in self.in_flight:
+            self.channel.basic_publish(
+                exchange=CONTROL_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_cancel_message(request_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+            )
+        self.in_flight.clear()
+
+    def multiply(self, a, b, rows: int, inner: int, cols: int):
+        """Calcule A @ B sur les workers; renvoie C (ligne par ligne), ou None en cas d'erreur ou de délai dépassé"""
+        try:
+            self.job = BlockedMatmul(a, b, rows, inner, cols, self.tile)
+        except ValueError as e:
+            print(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return None
+        if not self.connect_to_rabbitmq():
+            return None
+
+        self.job_id = new_request_id()
+        self.blocks = self.job.blocks()
+        self.in_flight.clear()
+        self.reported = 0
+        row_tiles, col_tiles, inner_tiles = self.job.grid
+        print(f"{Fore.CYAN}🧮 ({rows}x{inner}) @ ({inner}x{cols}): grille {row_tiles}x{col_tiles}x{inner_tiles}, "
+              f"{self.job.total} produits de blocs vers '{task_routing_key('mul', self.source)}'{Style.RESET_ALL}")
+
+        start = time.monotonic()
+        try:
+            self.dispatch_blocks()
+            while not self.job.done:
+                remaining = start + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    print(f"{Fore.RED}⏱️  Délai dépassé ({self.timeout:.0f}s): "
+                          f"{len(self.job.received)}/{self.job.total} produits reçus{Style.RESET_ALL}")
+                    self.cancel_in_flight()
+                    return None
+                self.connection.process_data_events(time_limit=min(1.0, remaining))
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Produit interrompu{Style.RESET_ALL}")
+            self.cancel_in_flight()
+            return None
+
+        elapsed = time.monotonic() - start
+        print(f"{Fore.GREEN}✅ C ({rows}x{cols}) calculée en {elapsed:.2f}s "
+              f"({2 * rows * inner * cols / elapsed / 1e9:.2f} GFLOP/s){Style.RESET_ALL}")
+        return self.job.c
+
+    def close(self):
+        if self.connection and self.connection.is_open:
+            self.connection.close()
+
+
+def random_matrix(rows: int, cols: int):
+    """Matrice aléatoire (valeurs entre -1 et 1), ligne par ligne"""
+    return array('d', (random.uniform(-1, 1) for _ in range(rows * cols)))
+
+
+def parse_shape(value):
+    """Analyse --shape: ex. '512,256,384' pour A 512x256 et B 256x384"""
+    try:
+        rows, inner, cols = (int(size) for size in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Dimensions invalides: {value} (format: M,K,N)")
+    if min(rows, inner, cols) < 1:
+        raise argparse.ArgumentTypeError(f"Dimensions invalides: {value} (valeurs positives)")
+    return rows, inner, cols
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Produit matriciel par blocs sur les workers \'mul\'')
+    shape_group = parser.add_mutually_exclusive_group(required=True)
+    shape_group.add_argument('--size', type=int, metavar='N',
+                             help='Matrices carrées aléatoires N x N')
+    shape_group.add_argument('--shape', type=parse_shape, metavar='M,K,N',
+                             help='A aléatoire M x K et B aléatoire K x N')
+    parser.add_argument('--tile', type=int, default=MATMUL_TILE_SIZE,
+                        help=f'Côté des tuiles (défaut: {MATMUL_TILE_SIZE})')
+    parser.add_argument('--max-in-flight', type=int, default=MATMUL_MAX_IN_FLIGHT,
+                        help=f'Produits de blocs envoyés sans résultat au plus (défaut: {MATMUL_MAX_IN_FLIGHT})')
+    parser.add_argument('--timeout', type=float, default=MATMUL_TIMEOUT,
+                        help=f'Délai max du travail en secondes (défaut: {MATMUL_TIMEOUT})')
+    parser.add_argument('--priority', type=int, default=None,
+                        help=f'Priorité des tâches, 0 à {TASK_MAX_PRIORITY} (défaut: {TASK_PRIORITIES["auto"]})')
+    parser.add_argument('--source', default='auto',
+                        help='Source des tâches (voie équitable des workers, défaut: auto)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Comparer C à un produit local')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Afficher chaque tuile reçue')
+
+    args = parser.parse_args()
+    if args.tile < 1 or args.max_in_flight < 1 or (args.size is not None and args.size < 1):
+        parser.error('--size, --tile et --max-in-flight doivent être positifs')
+    rows, inner, cols = args.shape or (args.size, args.size, args.size)
+
+    a = random_matrix(rows, inner)
+    b = random_matrix(inner, cols)
+    client = MatmulJobClient(args.tile, args.timeout, args.max_in_flight, args.priority, args.source, args.verbose)
+    try:
+        c = client.multiply(a, b, rows, inner, cols)
+        if c is None:
+            sys.exit(1)
+        if args.verify:
+            expected = perform_matmul(a, b, rows, inner, cols)
+            error = max(abs(x - y) for x, y in zip(c, expected))
+            color = Fore.GREEN if error < 1e-9 * inner else Fore.RED
+            print(f"{color}🔎 Écart max avec le produit local: {error:.3g}{Style.RESET_ALL}")
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
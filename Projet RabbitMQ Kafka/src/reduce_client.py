@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Client de réduction: somme ou produit d'un grand tableau de valeurs, découpé en partitions réduites par les workers
+Usage: python reduce_client.py sum|product (--range N | --random N | --values-file FICHIER) [--chunk-size N] [--timeout SECONDES] [--verbose]
+"""
+
+import sys
+import os
+import math
+import time
+import random
+import argparse
+from array import array
+import pika
+from colorama import init, Fore, Style
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key
+from utils.reduce_job import TreeCombiner
+
+# Initialiser colorama
+init()
+
+# Réductions proposées et opération des workers correspondante
+REDUCTIONS = {'sum': 'add', 'product': 'mul'}
+
+
+class ReduceJobClient:
+    """
+    Découpe les valeurs en partitions de `chunk_size` valeurs envoyées comme tâches aux workers de l'opération
+
+    Chaque worker réduit sa partition en une passe vectorisée et renvoie le résultat partiel
+    directement sur la queue exclusive du client (champ reply_to), sans passer par l'exchange des
+    résultats: les consommateurs de résultats ne voient pas les partiels. Le client les combine en
+    arbre au fil de leur arrivée et affiche la progression.
+    """
+
+    def __init__(self, reduction: str, chunk_size: int = REDUCE_CHUNK_SIZE, timeout: float = REDUCE_TIMEOUT,
+                 priority: int = None, source: str = "auto", verbose: bool = False):
+        self.reduction = reduction
+        self.operation = REDUCTIONS[reduction]
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.source = source
+        self.priority = task_priority(source, priority)
+        self.verbose = verbose
+        self.connection = None
+        self.channel = None
+        self.reply_queue = None
+        self.job = None
+        self.combiner = None
+        # Partitions envoyées sans résultat: request_id -> numéro de partition
+        self.in_flight = {}
+        self.reported = 0
+
+        print(f"{Fore.GREEN}🚀 Client de réduction démarré ({reduction}, partitions de {chunk_size} valeurs){Style.RESET_ALL}")
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion et crée la queue exclusive de réception des résultats partiels"""
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+
+            # Adressée directement par les workers (exchange par défaut, clé = nom de la queue)
+            self.reply_queue = self.channel.queue_declare(queue='', exclusive=True).method.queue
+            self.channel.basic_consume(queue=self.reply_queue, on_message_callback=self.on_partial, auto_ack=True)
+
+            print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def dispatch_partitions(self, values, partitions):
+        """Envoie une tâche par partition vers la queue de l'opération"""
+        for partition in range(partitions):
+            chunk = values[partition * self.chunk_size:(partition + 1) * self.chunk_size]
+            task_message = create_reduce_task_message(chunk, self.operation, self.job, partition, partitions,
+                                                      self.reply_queue, source=self.source, ttl=self.timeout)
+            # Les partitions transportent un tableau: toujours au format binaire
+            self.channel.basic_publish(
+                exchange=TASKS_EXCHANGE,
+                routing_key=task_routing_key(self.operation, self.source),
+                body=encode_task_message(task_message, CONTENT_TYPE_BINARY),
+                properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPE_BINARY,
+                                                priority=self.priority,
+                                                expiration=message_expiration(task_message))
+            )
+            self.in_flight[task_message["request_id"]] = partition
+
+    def on_partial(self, channel, method, properties, body):
+        """Résultat partiel d'une partition: combiné en arbre, progression affichée par paliers de 10%"""
+        try:
+            result_message = decode_message(body, properties.content_type)
+        except Exception:
+            return
+        # Partiels d'un travail précédent (abandonné) et doublons ignorés
+        if result_message.get("job") != self.job or self.in_flight.pop(result_message["request_id"], None) is None:
+            return
+
+        self.combiner.add(result_message["partition"], result_message["result"], result_message["count"])
+        if self.verbose:
+            print(f"{Fore.WHITE}   📥 Partition {result_message['partition'] + 1}/{self.combiner.partitions}: "
+                  f"{result_message['result']} (Worker: {result_message['worker_id']}){Style.RESET_ALL}")
+        step = int(self.combiner.progress * 10)
+        if step > self.reported:
+            self.reported = step
+            print(f"{Fore.BLUE}⏳ {100 * self.combiner.progress:.0f}% "
+                  f"({len(self.combiner.received)}/{self.combiner.partitions} partitions, "
+                  f"{self.combiner.count} valeurs, {self.combiner.held} partiels en attente){Style.RESET_ALL}")
+
+    def cancel_in_flight(self):
+        """Annule les partitions encore en attente ou en cours après un abandon"""
+        for request_id in self.in_flight:
+            self.channel.basic_publish(
+                exchange=CONTROL_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_cancel_message(request_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+            )
+        self.in_flight.clear()
+
+    def run(self, values):
+        """Calcule la réduction des valeurs sur les workers; renvoie le résultat, ou None en cas d'erreur ou de délai dépassé"""
+        if not values:
+            print(f"{Fore.RED}❌ Aucune valeur à réduire{Style.RESET_ALL}")
+            return None
+        if not self.connect_to_rabbitmq():
+            return None
+
+        partitions = math.ceil(len(values) / self.chunk_size)
+        self.job = new_request_id()
+        self.combiner = TreeCombiner(self.operation, partitions)
+        self.in_flight.clear()
+        self.reported = 0
+        print(f"{Fore.CYAN}🧮 {self.reduction} de {len(values)} valeurs: {partitions} partitions "
+              f"vers '{task_routing_key(self.operation, self.source)}'{Style.RESET_ALL}")
+
+        start = time.monotonic()
+        try:
+            self.dispatch_partitions(values, partitions)
+            while not self.combiner.done:
+                remaining = start + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    missing = self.combiner.missing()
+                    print(f"{Fore.RED}⏱️  Délai dépassé ({self.timeout:.0f}s): "
+                          f"{len(self.combiner.received)}/{partitions} partitions reçues, "
+                          f"manquantes: {', '.join(map(str, missing[:10]))}{'...' if len(missing) > 10 else ''}"
+                          f"{Style.RESET_ALL}")
+                    self.cancel_in_flight()
+                    return None
+                self.connection.process_data_events(time_limit=min(1.0, remaining))
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Réduction interrompue{Style.RESET_ALL}")
+            self.cancel_in_flight()
+            return None
+
+        elapsed = time.monotonic() - start
+        print(f"{Fore.GREEN}✅ {self.reduction} = {self.combiner.result} "
+              f"({len(values)} valeurs en {elapsed:.1f}s, {len(values) / elapsed:.0f} valeurs/s){Style.RESET_ALL}")
+        return self.combiner.result
+
+    def close(self):
+        if self.connection and self.connection.is_open:
+            self.connection.close()
+
+
+def read_values(path):
+    """Lit les valeurs d'un fichier texte (nombres séparés par des espaces ou des retours à la ligne)"""
+    values = array('d')
+    with open(path) as values_file:
+        for line in values_file:
+            values.extend(float(value) for value in line.split())
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Réduction distribuée (somme ou produit) d\'un grand tableau de valeurs')
+    parser.add_argument('reduction', choices=sorted(REDUCTIONS),
+                        help='Réduction à calculer')
+    values_group = parser.add_mutually_exclusive_group(required=True)
+    values_group.add_argument('--range', type=int, metavar='N',
+                              help='Valeurs 1, 2, ..., N')
+    values_group.add_argument('--random', type=int, metavar='N',
+                              help='N valeurs aléatoires entre 0 et 1')
+    values_group.add_argument('--values-file', metavar='FICHIER',
+                              help='Fichier de valeurs (séparées par des espaces ou des retours à la ligne)')
+    parser.add_argument('--chunk-size', type=int, default=REDUCE_CHUNK_SIZE,
+                        help=f'Nombre de valeurs par partition (défaut: {REDUCE_CHUNK_SIZE})')
+    parser.add_argument('--timeout', type=float, default=REDUCE_TIMEOUT,
+                        help=f'Délai max du travail en secondes (défaut: {REDUCE_TIMEOUT})')
+    parser.add_argument('--priority', type=int, default=None,
+                        help=f'Priorité des partitions, 0 à {TASK_MAX_PRIORITY} (défaut: {TASK_PRIORITIES["auto"]})')
+    parser.add_argument('--source', default='auto',
+                        help='Source des partitions (voie équitable des workers, défaut: auto)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Afficher chaque résultat partiel reçu')
+
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error('--chunk-size doit être positif')
+
+    if args.range is not None:
+        values = array('d', range(1, args.range + 1))
+    elif args.random is not None:
+        values = array('d', (random.random() for _ in range(args.random)))
+    else:
+        values = read_values(args.values_file)
+
+    client = ReduceJobClient(args.reduction, args.chunk_size, args.timeout, args.priority, args.source, args.verbose)
+    try:
+        if client.run(values) is None:
+            sys.exit(1)
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Remet en traitement les tâches mises de côté (queues task_queue_*.parked) une fois le problème corrigé
+Usage: python replay_parked.py [add|sub|mul|div|all] [--limit N] [--info | --drop-expired]
+"""
+
+import sys
+import os
+import argparse
+import pika
+from colorama import init, Fore, Style
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology, dead_letter_reason
+
+# Initialiser colorama
+init()
+
+
+class ParkedTaskReplayer:
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.expired_count = 0
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion à RabbitMQ, avec confirmations d'éditeur"""
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+            # Un message n'est retiré de la queue de côté qu'une fois sa republication confirmée
+            self.channel.confirm_delivery()
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def parked_counts(self, operations):
+        """Nombre de messages en attente dans chaque queue de côté"""
+        counts = {}
+        for operation in operations:
+            method = self.channel.queue_declare(queue=PARKED_QUEUES[operation], durable=True, passive=True)
+            counts[operation] = method.method.message_count
+        return counts
+
+    @staticmethod
+    def is_expired_task(properties, task_message):
+        """Tâche expirée: échéance dépassée, ou expirée dans sa queue de tâches (x-death) plutôt qu'en échec"""
+        if dead_letter_reason(properties.headers) == 'expired':
+            return True
+        return task_message is not None and is_expired(task_message)
+
+    def drop_expired(self, operation):
+        """
+        Supprime les tâches expirées de la queue de côté d'une opération sans toucher aux échecs
+
+        Les messages présents sont lus sans acquittement; les expirés sont acquittés (supprimés),
+        les autres remis en queue ensemble à la fin, dans leur ordre.
+        """
+        parked_queue = PARKED_QUEUES[operation]
+        dropped = 0
+        for _ in range(self.parked_counts([operation])[operation]):
+            method, properties, body = self.channel.basic_get(queue=parked_queue, auto_ack=False)
+            if method is None:
+                break
+            try:
+                task_message = decode_message(body, properties.content_type)
+            except Exception:
+                task_message = None
+            if self.is_expired_task(properties, task_message):
+                self.channel.basic_ack(delivery_tag=method.delivery_tag)
+                dropped += 1
+        # Échecs réels: remis en queue
+        self.channel.basic_nack(delivery_tag=0, multiple=True, requeue=True)
+        self.expired_count += dropped
+        return dropped
+
+    def replay(self, operation, limit=None):
+        """
+        Republie les messages mis de côté d'une opération dans sa queue de tâches, compteur de tentatives
+        remis à zéro; les tâches dont l'échéance est dépassée (dont celles expirées dans la queue) sont supprimées
+        """
+        parked_queue = PARKED_QUEUES[operation]
+        replayed = 0
+
+        while limit is None or replayed < limit:
+            method, properties, body = self.channel.basic_get(queue=parked_queue, auto_ack=False)
+            if method is None:
+                break
+
+            try:
+                task_message = decode_message(body, properties.content_type)
+            except Exception:
+                task_message = None  # Message illisible: rejoué tel quel
+            if self.is_expired_task(properties, task_message):
+                self.channel.basic_ack(delivery_tag=method.delivery_tag)
+                self.expired_count += 1
+                continue
+
+            headers = dict(properties.headers or {})
+            headers.pop(TASK_ATTEMPTS_HEADER, None)
+            headers.pop(TASK_ERROR_HEADER, None)
+            headers.pop('x-death', None)
+            properties.headers = headers
+            if task_message is not None:
+                properties.expiration = message_expiration(task_message)
+
+            try:
+                self.channel.basic_publish(exchange='', routing_key=TASK_QUEUES[operation],
+                                           body=body, properties=properties, mandatory=True)
+            except (pika.exceptions.UnroutableError, pika.exceptions.NackError):
+                self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                print(f"{Fore.RED}❌ Republication refusée, arrêt du rejeu de '{parked_queue}'{Style.RESET_ALL}")
+                break
+
+            self.channel.basic_ack(delivery_tag=method.delivery_tag)
+            replayed += 1
+
+        return replayed
+
+    def close(self):
+        if self.connection and self.connection.is_open:
+            self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rejeu des tâches mises de côté après trop de tentatives')
+    parser.add_argument('operation', nargs='?', default=ALL_OPERATION, choices=list(OPERATIONS) + [ALL_OPERATION],
+                        help='Opération à rejouer (défaut: all)')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='Nombre max de messages rejoués par opération')
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument('--info', action='store_true',
+                            help='Afficher le nombre de messages mis de côté et quitter')
+    mode_group.add_argument('--drop-expired', action='store_true',
+                            help='Supprimer les tâches expirées des queues de côté, sans rejouer les échecs')
+
+    args = parser.parse_args()
+    operations = OPERATIONS if args.operation == ALL_OPERATION else [args.operation]
+
+    replayer = ParkedTaskReplayer()
+    if not replayer.connect_to_rabbitmq():
+        sys.exit(1)
+
+    try:
+        if args.info:
+            for operation, count in replayer.parked_counts(operations).items():
+                print(f"{Fore.CYAN}📊 {PARKED_QUEUES[operation]}: {count} messages{Style.RESET_ALL}")
+            return
+
+        if args.drop_expired:
+            for operation in operations:
+                dropped = replayer.drop_expired(operation)
+                print(f"{Fore.YELLOW}⌛ {dropped} tâches expirées supprimées de '{PARKED_QUEUES[operation]}'{Style.RESET_ALL}")
+            return
+
+        total = 0
+        for operation in operations:
+            replayed = replayer.replay(operation, args.limit)
+            total += replayed
+            print(f"{Fore.GREEN}♻️  {replayed} tâches rejouées de '{PARKED_QUEUES[operation]}' "
+                  f"vers '{TASK_QUEUES[operation]}'{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}✅ Total rejoué: {total} (tâches expirées supprimées: {replayer.expired_count}){Style.RESET_ALL}")
+    finally:
+        replayer.close()
+
+
+if __name__ == '__main__':
+    main()
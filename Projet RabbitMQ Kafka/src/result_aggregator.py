@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Agrégateur scatter-gather: regroupe les quatre résultats d'une tâche "all" en un seul message
+Usage: python result_aggregator.py [--timeout SECONDES] [--max-groups N] [--policy partial|drop] [--verbose]
+"""
+
+import sys
+import os
+import time
+import argparse
+from collections import defaultdict, OrderedDict
+import pika
+from colorama import init, Fore, Style
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rabbitmq_config import *
+from utils.message_utils import *
+from utils.topology import declare_topology
+from utils.seen_set import RecentIds
+
+# Initialiser colorama
+init()
+
+
+class ResultAggregator:
+    """
+    Collecte les résultats portant un identifiant de groupe et publie un résultat regroupé
+    sur l'exchange des résultats regroupés dès que le groupe est complet
+
+    Un groupe incomplet après `timeout` secondes est publié partiellement (politique 'partial')
+    ou abandonné ('drop'). Au plus `max_groups` groupes sont en attente: au-delà, le plus ancien
+    subit la même politique. Les résultats d'un groupe ne sont acquittés qu'une fois le groupe
+    publié ou abandonné: un arrêt de l'agrégateur ne perd aucun résultat.
+    """
+
+    # Intervalle (secondes) entre deux vérifications des groupes expirés
+    CHECK_INTERVAL = 1
+
+    def __init__(self, timeout: float = AGGREGATOR_TIMEOUT, max_groups: int = AGGREGATOR_MAX_GROUPS,
+                 policy: str = AGGREGATOR_PARTIAL_POLICY, verbose: bool = False):
+        if max_groups < 1:
+            raise ValueError(f"max_groups doit être au moins 1 (reçu: {max_groups})")
+        self.timeout = timeout
+        self.max_groups = max_groups
+        self.policy = policy
+        self.verbose = verbose
+        self.connection = None
+        self.channel = None
+        # Groupes en attente, du plus ancien au plus récent
+        self.groups = OrderedDict()
+        # Groupes déjà publiés ou abandonnés: un résultat tardif est ignoré
+        self.closed_groups = RecentIds(RESULT_DEDUP_SIZE)
+        self.stats = defaultdict(int)
+
+        print(f"{Fore.GREEN}🚀 Agrégateur de résultats démarré (délai: {timeout:.0f}s, politique: {policy}){Style.RESET_ALL}")
+
+    def connect_to_rabbitmq(self):
+        """Établit la connexion et s'abonne à la queue d'entrée des résultats membres d'un groupe"""
+        connection_params = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        )
+
+        try:
+            self.connection = pika.BlockingConnection(connection_params)
+            self.channel = self.connection.channel()
+            declare_topology(self.channel, TASK_QUEUES)
+
+            # Queue d'entrée durable et sans limite de longueur: elle ne reçoit que les résultats membres
+            # d'un groupe, qu'aucun débordement ne doit supprimer; la mémoire reste bornée par max_groups
+            buffered = self.max_groups * len(OPERATIONS)
+            self.channel.queue_declare(queue=AGGREGATOR_QUEUE, durable=True)
+            self.channel.queue_bind(queue=AGGREGATOR_QUEUE, exchange=GROUP_MEMBERS_EXCHANGE,
+                                    arguments={"x-match": "all", GROUP_MEMBER_HEADER: '1'})
+
+            # Les résultats des groupes en attente restent non acquittés
+            self.channel.basic_qos(prefetch_count=min(65535, buffered + 1))
+            self.channel.basic_consume(queue=AGGREGATOR_QUEUE, on_message_callback=self.on_result)
+
+            print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ: {e}{Style.RESET_ALL}")
+            return False
+
+    def on_result(self, channel, method, properties, body):
+        """Ajoute un résultat à son groupe; les résultats hors groupe sont acquittés immédiatement"""
+        try:
+            result_message = decode_message(body, properties.content_type)
+            group = result_message.get("group")
+        except Exception:
+            group = None
+        if group is None:
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
+        if group in self.closed_groups:
+            self.stats['late'] += 1
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
+        entry = self.groups.get(group)
+        if entry is None:
+            entry = self.groups[group] = {
+                "members": {},
+                "size": result_message.get("group_size", len(OPERATIONS)),
+                "delivery_tags": [],
+                "started_at": time.monotonic()
+            }
+            while len(self.groups) > self.max_groups:
+                self.stats['evicted'] += 1
+                self.expire(next(iter(self.groups)))
+
+        if result_message["op"] in entry["members"]:
+            # Doublon (exécution spéculative, relivraison)
+            self.stats['duplicates'] += 1
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
+        entry["members"][result_message["op"]] = result_message
+        entry["delivery_tags"].append(method.delivery_tag)
+        if self.verbose:
+            print(f"{Fore.WHITE}   📥 [{group[:8]}] {result_message['op']} = {result_message['result']} "
+                  f"({len(entry['members'])}/{entry['size']}){Style.RESET_ALL}")
+        if len(entry["members"]) >= entry["size"]:
+            self.publish_group(group)
+
+    def publish_group(self, group):
+        """Publie le résultat regroupé puis acquitte les résultats du groupe"""
+        entry = self.groups.pop(group)
+        group_message = create_group_result_message(group, entry["members"], entry["size"])
+        self.channel.basic_publish(
+            exchange=GROUPED_RESULTS_EXCHANGE,
+            routing_key=GROUPED_RESULT_QUEUE,
+            body=serialize_message(group_message),
+            properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPE_JSON)
+        )
+        self.close_group(group, entry)
+
+        self.stats['complete' if group_message["complete"] else 'partial'] += 1
+        self.display_group(group_message, time.monotonic() - entry["started_at"])
+        if (self.stats['complete'] + self.stats['partial']) % 10 == 0:
+            self.display_stats()
+
+    def expire(self, group):
+        """Groupe incomplet après le délai (ou évincé): publication partielle ou abandon selon la politique"""
+        if self.policy == 'partial':
+            self.publish_group(group)
+            return
+        entry = self.groups.pop(group)
+        self.close_group(group, entry)
+        self.stats['dropped'] += 1
+        print(f"{Fore.RED}🗑️  Groupe {group[:8]} abandonné ({len(entry['members'])}/{entry['size']} résultats){Style.RESET_ALL}")
+
+    def close_group(self, group, entry):
+        """Acquitte les résultats d'un groupe terminé et s'en souvient pour ignorer les retardataires"""
+        for delivery_tag in entry["delivery_tags"]:
+            self.channel.basic_ack(delivery_tag=delivery_tag)
+        self.closed_groups.add(group)
+
+    def check_timeouts(self):
+        """Expire les groupes en attente depuis plus de `timeout` secondes, puis se reprogramme"""
+        now = time.monotonic()
+        while self.groups:
+            group, entry = next(iter(self.groups.items()))
+            if now - entry["started_at"] < self.timeout:
+                break  # Groupes suivants plus récents
+            self.expire(group)
+        self.connection.call_later(self.CHECK_INTERVAL, self.check_timeouts)
+
+    def display_group(self, group_message, elapsed):
+        """Affiche un résultat regroupé"""
+        results = ', '.join(f"{op} = {value}" for op, value in group_message["results"].items())
+        if group_message["complete"]:
+            status = f"{Fore.GREEN}complet"
+        else:
+            status = f"{Fore.YELLOW}partiel, manque: {', '.join(group_message['missing'])}"
+        print(f"{Fore.CYAN}🧩 [{group_message['request_id'][:8]}] all({group_message['n1']}, {group_message['n2']}): "
+              f"{results} ({status}{Fore.CYAN}, {elapsed:.1f}s){Style.RESET_ALL}")
+
+    def display_stats(self):
+        """Affiche les compteurs de groupes"""
+        print(f"\n{Fore.YELLOW}📊 === GROUPES ==={Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}   Complets: {self.stats['complete']}, partiels: {self.stats['partial']}, "
+              f"abandonnés: {self.stats['dropped']}, en attente: {len(self.groups)}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}   Évincés (limite de {self.max_groups}): {self.stats['evicted']}, "
+              f"résultats tardifs: {self.stats['late']}, doublons: {self.stats['duplicates']}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}=================={Style.RESET_ALL}\n")
+
+    def start(self):
+        """Démarre la collecte des résultats"""
+        if not self.connect_to_rabbitmq():
+            return
+
+        self.connection.call_later(self.CHECK_INTERVAL, self.check_timeouts)
+        print(f"{Fore.CYAN}👂 Regroupement des résultats \"all\" vers '{GROUPED_RESULT_QUEUE}'...{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Pour arrêter, appuyez sur CTRL+C{Style.RESET_ALL}")
+
+        try:
+            self.channel.start_consuming()
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Arrêt de l'agrégateur (groupes en attente redistribués)...{Style.RESET_ALL}")
+            self.channel.stop_consuming()
+            self.connection.close()
+            self.display_stats()
+
+
+def positive_int(value):
+    """Analyse un entier strictement positif (ex. --max-groups)"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Entier invalide: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Doit être au moins 1: {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regroupement des résultats des tâches "all"')
+    parser.add_argument('--timeout', type=float, default=AGGREGATOR_TIMEOUT,
+                        help=f'Délai max d\'attente d\'un groupe en secondes (défaut: {AGGREGATOR_TIMEOUT})')
+    parser.add_argument('--max-groups', type=positive_int, default=AGGREGATOR_MAX_GROUPS,
+                        help=f'Nombre max de groupes en attente (défaut: {AGGREGATOR_MAX_GROUPS})')
+    parser.add_argument('--policy', choices=['partial', 'drop'], default=AGGREGATOR_PARTIAL_POLICY,
+                        help='Groupe incomplet à l\'expiration: publier les résultats reçus ou l\'abandonner')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Mode verbose')
+
+    args = parser.parse_args()
+
+    aggregator = ResultAggregator(args.timeout, args.max_groups, args.policy, args.verbose)
+    aggregator.start()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Client consommateur qui lit et affiche les résultats des calculs
-Usage: python result_consumer.py [--verbose]
+Usage: python result_consumer.py [--verbose] [--adaptive-prefetch] [--grouped]
 """
 
 import sys
@@ -17,19 +17,34 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.rabbitmq_config import *
 from utils.message_utils import *
+from utils.prefetch_controller import PrefetchController
+from utils.seen_set import RecentIds
 
 # Initialiser colorama
 init()
 
 
 class ResultConsumer:
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, adaptive_prefetch: bool = False, grouped: bool = False):
         self.verbose = verbose
+        # Mode --grouped: un message par tâche "all" (résultats regroupés par result_aggregator.py)
+        self.grouped = grouped
+        self.queue_name = GROUPED_RESULT_QUEUE if grouped else RESULT_QUEUE
         self.processed_count = 0
         self.connection = None
         self.channel = None
         self.stats = defaultdict(int)
         self.start_time = time.time()
+        # Résultats déjà reçus: un doublon (exécution spéculative, relivraison) est ignoré
+        self.seen_results = RecentIds(RESULT_DEDUP_SIZE)
+        # Contrôleur de prefetch adaptatif (--adaptive-prefetch), le cas échéant
+        self.prefetch_controller = None
+        if adaptive_prefetch:
+            self.prefetch_controller = PrefetchController(
+                minimum=PREFETCH_MIN,
+                maximum=PREFETCH_MAX,
+                interval=PREFETCH_ADJUST_INTERVAL
+            )
         
         print(f"{Fore.GREEN}🚀 Client consommateur de résultats démarré{Style.RESET_ALL}")
         
@@ -47,8 +62,8 @@ class ResultConsumer:
                 self.connection = pika.BlockingConnection(connection_params)
                 self.channel = self.connection.channel()
                 
-                # Déclarer la queue des résultats
-                self.channel.queue_declare(queue=RESULT_QUEUE, durable=True)
+                # Déclarer la queue des résultats (ou des résultats regroupés)
+                self.channel.queue_declare(queue=self.queue_name, durable=True)
                 
                 print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
                 return True
@@ -63,18 +78,30 @@ class ResultConsumer:
     
     def process_result(self, channel, method, properties, body):
         """Traite un message de résultat"""
+        service_start = time.monotonic()
         try:
-            # Désérialiser le message de résultat
-            message_str = body.decode('utf-8')
-            result_message = deserialize_message(message_str)
+            # Décoder le message de résultat directement depuis le buffer
+            result_message = decode_message(body, properties.content_type)
             
             # Valider le message de résultat
-            required_fields = ["n1", "n2", "op", "result", "request_id", "worker_id", "processing_time", "timestamp"]
+            batch = is_batch_message(result_message)
+            if batch:
+                required_fields = ["op", "results", "count", "request_id", "worker_id", "processing_time", "timestamp"]
+            else:
+                required_fields = ["n1", "n2", "op", "result", "request_id", "worker_id", "processing_time", "timestamp"]
             if not all(field in result_message for field in required_fields):
                 print(f"{Fore.RED}❌ Message de résultat invalide reçu{Style.RESET_ALL}")
                 channel.basic_ack(delivery_tag=method.delivery_tag)
                 return
             
+            if not self.seen_results.add(message_identity(result_message)):
+                self.stats['duplicates'] += 1
+                if self.verbose:
+                    print(f"{Fore.WHITE}   ♻️  Résultat en double ignoré: {result_message['request_id'][:8]} "
+                          f"{result_message['op']}{Style.RESET_ALL}")
+                channel.basic_ack(delivery_tag=method.delivery_tag)
+                return
+            
             # Afficher le résultat formaté
             display_text = format_result_display(result_message)
             
@@ -93,22 +120,55 @@ class ResultConsumer:
             if self.verbose:
                 print(f"{Fore.WHITE}   📊 Détails: {serialize_message(result_message)}{Style.RESET_ALL}")
             
-            # Mettre à jour les statistiques
-            self.processed_count += 1
-            self.stats[result_message['op']] += 1
+            # Mettre à jour les statistiques (un lot compte pour chacun de ses résultats)
+            count = result_message['count'] if batch else 1
+            previous_count = self.processed_count
+            self.processed_count += count
+            self.stats[result_message['op']] += count
             self.stats['total_processing_time'] += result_message['processing_time']
             
             # Afficher les statistiques périodiquement
-            if self.processed_count % 10 == 0:
+            if self.processed_count // 10 != previous_count // 10:
                 self.display_stats()
             
             # Acquitter le message
             channel.basic_ack(delivery_tag=method.delivery_tag)
             
+            if self.prefetch_controller:
+                self.prefetch_controller.record_service_time(time.monotonic() - service_start)
+                if self.prefetch_controller.maybe_adjust(channel) and self.verbose:
+                    print(f"{Fore.WHITE}   🔧 Prefetch ajusté: {self.prefetch_controller.describe()}{Style.RESET_ALL}")
+            
         except Exception as e:
             print(f"{Fore.RED}❌ Erreur lors du traitement du résultat: {e}{Style.RESET_ALL}")
             channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
     
+    def process_group_result(self, channel, method, properties, body):
+        """Traite un résultat regroupé: les quatre opérations d'une tâche "all" en un seul message"""
+        try:
+            group_message = decode_message(body, properties.content_type)
+            results = ', '.join(f"{op} = {value}" for op, value in group_message["results"].items())
+            status = "complet" if group_message["complete"] else f"partiel, manque: {', '.join(group_message['missing'])}"
+            color = Fore.GREEN if group_message["complete"] else Fore.YELLOW
+            print(f"{color}[{format_timestamp(group_message['timestamp'])}] "
+                  f"all({group_message['n1']}, {group_message['n2']}): {results} ({status}) "
+                  f"(ID: {group_message['request_id'][:8]}){Style.RESET_ALL}")
+            
+            previous_count = self.processed_count
+            self.processed_count += len(group_message["results"])
+            for op in group_message["results"]:
+                self.stats[op] += 1
+            self.stats['total_processing_time'] += group_message['processing_time']
+            self.stats['partial_groups' if not group_message["complete"] else 'groups'] += 1
+            if self.processed_count // 10 != previous_count // 10:
+                self.display_stats()
+            
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            
+        except Exception as e:
+            print(f"{Fore.RED}❌ Erreur lors du traitement du résultat regroupé: {e}{Style.RESET_ALL}")
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+    
     def display_stats(self):
         """Affiche les statistiques en temps réel"""
         elapsed_time = time.time() - self.start_time
@@ -126,6 +186,15 @@ class ResultConsumer:
             if count > 0:
                 print(f"{Fore.YELLOW}   {op.upper()}: {count} résultats{Style.RESET_ALL}")
         
+        if self.grouped:
+            print(f"{Fore.YELLOW}   Groupes: {self.stats['groups']} complets, {self.stats['partial_groups']} partiels{Style.RESET_ALL}")
+        
+        if self.stats['duplicates']:
+            print(f"{Fore.YELLOW}   Doublons ignorés: {self.stats['duplicates']}{Style.RESET_ALL}")
+        
+        if self.prefetch_controller:
+            print(f"{Fore.YELLOW}   Prefetch adaptatif: {self.prefetch_controller.describe()}{Style.RESET_ALL}")
+        
         print(f"{Fore.YELLOW}========================{Style.RESET_ALL}\n")
     
     def start_consuming(self):
@@ -134,13 +203,16 @@ class ResultConsumer:
             return
         
         # Configuration du consumer
-        self.channel.basic_qos(prefetch_count=1)
+        if self.prefetch_controller:
+            self.prefetch_controller.apply(self.channel)
+        else:
+            self.channel.basic_qos(prefetch_count=1)
         self.channel.basic_consume(
-            queue=RESULT_QUEUE,
-            on_message_callback=self.process_result
+            queue=self.queue_name,
+            on_message_callback=self.process_group_result if self.grouped else self.process_result
         )
         
-        print(f"{Fore.CYAN}👂 En écoute des résultats sur la queue '{RESULT_QUEUE}'...{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}👂 En écoute des résultats sur la queue '{self.queue_name}'...{Style.RESET_ALL}")
         print(f"{Fore.CYAN}   Pour arrêter, appuyez sur CTRL+C{Style.RESET_ALL}")
         print(f"{Fore.CYAN}   Statistiques affichées toutes les 10 réceptions{Style.RESET_ALL}\n")
         
@@ -161,7 +233,7 @@ class ResultConsumer:
             return None
         
         try:
-            method = self.channel.queue_declare(queue=RESULT_QUEUE, durable=True, passive=True)
+            method = self.channel.queue_declare(queue=self.queue_name, durable=True, passive=True)
             message_count = method.method.message_count
             self.connection.close()
             return message_count
@@ -176,15 +248,19 @@ def main():
                         help='Mode verbose avec détails complets des messages')
     parser.add_argument('--info', action='store_true',
                         help='Afficher les informations sur la queue et quitter')
+    parser.add_argument('--adaptive-prefetch', action='store_true',
+                        help='Ajuster le prefetch selon le temps de traitement et la latence du broker')
+    parser.add_argument('--grouped', action='store_true',
+                        help=f'Lire les résultats regroupés des tâches "all" (queue {GROUPED_RESULT_QUEUE})')
     
     args = parser.parse_args()
     
-    consumer = ResultConsumer(args.verbose)
+    consumer = ResultConsumer(args.verbose, args.adaptive_prefetch, args.grouped)
     
     if args.info:
         count = consumer.get_queue_info()
         if count is not None:
-            print(f"{Fore.CYAN}📊 Messages en attente dans la queue '{RESULT_QUEUE}': {count}{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}📊 Messages en attente dans la queue '{consumer.queue_name}': {count}{Style.RESET_ALL}")
         return
     
     consumer.start_consuming()
@@ -7,18 +7,23 @@ Usage: python web_interface.py
 import sys
 import os
 import json
+import queue
 import threading
 import time
+from collections import deque
 from datetime import datetime
 from flask import Flask, render_template_string, request, jsonify, Response
 from flask_cors import CORS
 import pika
+from pika.exceptions import AMQPConnectionError, AMQPChannelError
 
 # Ajouter le répertoire parent au path pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.rabbitmq_config import *
 from utils.message_utils import *
+from utils.topology import declare_topology, task_priority, task_routing_key, task_lanes
+from utils.seen_set import RecentIds
 
 app = Flask(__name__)
 CORS(app)
@@ -32,9 +37,13 @@ stats = {
     'web_results': [],  # Résultats des tâches web uniquement
     'auto_results': [], # Résultats des tâches automatiques uniquement
     'queue_status': {},
+    'duplicate_results': 0,  # Doublons ignorés (exécution spéculative, relivraisons)
     'last_update': datetime.now().isoformat()
 }
 
+# Résultats déjà reçus, pour ignorer les doublons
+seen_results = RecentIds(RESULT_DEDUP_SIZE)
+
 # Template HTML principal
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -201,6 +210,7 @@ HTML_TEMPLATE = '''
         .result-sub { border-color: #74b9ff; }
         .result-mul { border-color: #a29bfe; }
         .result-div { border-color: #fd79a8; }
+        .result-all { border-color: #fdcb6e; }
         
         .queue-status {
             display: flex;
@@ -622,7 +632,7 @@ HTML_TEMPLATE = '''
                 const status = await response.json();
                 
                 let html = '';
-                for (const [queue, count] of Object.entries(status)) {
+                for (const [queue, count] of Object.entries(status.queues)) {
                     const statusClass = count > 0 ? 'status-busy' : 'status-online';
                     html += `
                         <div class="queue-status ${statusClass}">
@@ -632,6 +642,12 @@ HTML_TEMPLATE = '''
                     `;
                 }
                 
+                if (status.sampled_at) {
+                    // Mesure faite en arrière-plan: âge affiché, signalée si elle n'est plus à jour
+                    html += `<p style="color: ${status.stale ? 'red' : '#666'}; font-size: 0.9em;">
+                        Mesuré il y a ${status.age.toFixed(1)}s${status.stale ? ' (données périmées)' : ''}</p>`;
+                }
+                
                 container.innerHTML = html || '<p>Aucune queue trouvée</p>';
                 console.log('Queues refreshed successfully');
             } catch (error) {
@@ -693,7 +709,27 @@ HTML_TEMPLATE = '''
             
             let html = '';
             results.slice().reverse().forEach(result => {
-                const timestamp = new Date(result.timestamp).toLocaleString();
+                // Horodatage en nanosecondes (format actuel) ou chaîne ISO (anciens messages)
+                const timestamp = new Date(typeof result.timestamp === 'number' ? result.timestamp / 1e6 : result.timestamp).toLocaleString();
+                
+                // Résultat regroupé d'une tâche "all" (WEB_GROUPED_RESULTS=1)
+                if (result.type === 'group') {
+                    const values = Object.entries(result.results).map(([op, value]) => `${op} = ${value}`).join(', ');
+                    const status = result.complete ? '' : ` | ⚠️ Partiel, manque: ${result.missing.join(', ')}`;
+                    html += `
+                        <div class="result-item result-all">
+                            <div>
+                                <strong>all(${result.n1}, ${result.n2}): ${values}</strong>
+                                <span style="float: right; font-size: 0.8em; color: #666;">${result.source === 'web' ? '👤 Vous' : '🤖 Auto'}</span>
+                            </div>
+                            <div style="font-size: 0.9em; color: #666; margin-top: 5px;">
+                                ${timestamp} | Temps: ${result.processing_time?.toFixed(1) || 'N/A'}s${status}
+                            </div>
+                        </div>
+                    `;
+                    return;
+                }
+                
                 const opSymbol = result.op === 'add' ? '+' : result.op === 'sub' ? '-' : result.op === 'mul' ? '×' : '÷';
                 const sourceIcon = result.source === 'web' ? '👤' : '🤖';
                 const sourceLabel = result.source === 'web' ? 'Vous' : 'Auto';
@@ -705,7 +741,7 @@ HTML_TEMPLATE = '''
                             <span style="float: right; font-size: 0.8em; color: #666;">${sourceIcon} ${sourceLabel}</span>
                         </div>
                         <div style="font-size: 0.9em; color: #666; margin-top: 5px;">
-                            ${timestamp} | Worker: ${result.worker_id} | Temps: ${result.processing_time?.toFixed(1) || 'N/A'}s
+                            ${timestamp} | Worker: ${result.worker_id} | Temps: ${result.processing_time?.toFixed(1) || 'N/A'}s${result.cached ? ' | ⚡ Cache' : ''}
                         </div>
                     </div>
                 `;
@@ -762,72 +798,370 @@ HTML_TEMPLATE = '''
 '''
 
 
-class RabbitMQWebInterface:
-    def __init__(self):
+def connection_parameters():
+    """Paramètres de connexion RabbitMQ de l'interface web"""
+    return pika.ConnectionParameters(
+        host=RABBITMQ_HOST,
+        port=RABBITMQ_PORT,
+        credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+    )
+
+
+def read_queue_depths(channel):
+    """Nombre de messages des queues de tâches (partagée et sous-queues par source) et de résultats"""
+    status = {}
+    
+    # Vérifier les queues de tâches
+    for operation in TASK_QUEUES:
+        # Total de la queue partagée et des sous-queues par source
+        status[f"task_{operation}"] = sum(
+            channel.queue_declare(queue=queue_name, durable=True, passive=True).method.message_count
+            for _, queue_name in task_lanes(operation)
+        )
+    
+    # Vérifier la queue des résultats
+    method = channel.queue_declare(queue=RESULT_QUEUE, durable=True, passive=True)
+    status["results"] = method.method.message_count
+    return status
+
+
+class QueueDepthSampler:
+    """
+    Thread d'arrière-plan qui mesure la profondeur des queues à intervalle fixe sur un canal persistant
+
+    Les mesures sont gardées dans un tampon circulaire: /api/queue_status répond depuis la mémoire,
+    sans toucher au broker, quel que soit le nombre de tableaux de bord qui l'interrogent. Chaque
+    réponse indique l'heure de la mesure; elle est signalée périmée si aucune mesure n'a réussi
+    depuis trois intervalles (broker injoignable).
+    """
+
+    def __init__(self, parameters, interval: float = QUEUE_SAMPLE_INTERVAL, history: int = QUEUE_SAMPLE_HISTORY):
+        self.parameters = parameters
+        self.interval = interval
+        # (heure de la mesure, profondeurs), de la plus ancienne à la plus récente
+        self.samples = deque(maxlen=history)
+        self.last_error = None
         self.connection = None
         self.channel = None
-        self.result_consumer_thread = None
-        self.consuming = False
-        
-    def connect_to_rabbitmq(self):
-        """Établit la connexion à RabbitMQ"""
+        self.stopping = threading.Event()
+        self.start_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name='queue-sampler', daemon=True)
+
+    def start(self):
+        """Démarre le thread (une seule fois, y compris depuis plusieurs threads de requêtes)"""
+        with self.start_lock:
+            if self.thread.ident is None:
+                self.thread.start()
+        return self
+
+    def connect(self):
+        """Ouvre la connexion et le canal de mesure; la topologie est déclarée pour que les queues existent"""
+        self.connection = pika.BlockingConnection(self.parameters)
+        self.channel = self.connection.channel()
+        declare_topology(self.channel, TASK_QUEUES)
+
+    def disconnect(self):
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+        self.channel = None
+
+    def sample(self):
+        """Une mesure; une erreur ferme la connexion, rouverte à la mesure suivante"""
         try:
-            connection_params = pika.ConnectionParameters(
-                host=RABBITMQ_HOST,
-                port=RABBITMQ_PORT,
-                credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
-            )
-            
-            self.connection = pika.BlockingConnection(connection_params)
-            self.channel = self.connection.channel()
-            
-            # Déclarer toutes les queues
-            for operation, queue_name in TASK_QUEUES.items():
-                self.channel.queue_declare(queue=queue_name, durable=True)
-            
-            self.channel.queue_declare(queue=RESULT_QUEUE, durable=True)
-            self.channel.exchange_declare(exchange=ALL_OPERATIONS_EXCHANGE, exchange_type='fanout')
-            
+            if self.channel is None or not self.channel.is_open:
+                self.disconnect()
+                self.connect()
+            self.samples.append((time.time(), read_queue_depths(self.channel)))
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            self.disconnect()
+
+    def run(self):
+        """Boucle du thread: une mesure par intervalle; l'attente sert les heartbeats de la connexion"""
+        while not self.stopping.is_set():
+            started = time.monotonic()
+            self.sample()
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining <= 0:
+                continue
+            try:
+                if self.connection is not None:
+                    self.connection.sleep(remaining)
+                else:
+                    self.stopping.wait(remaining)
+            except Exception:
+                self.disconnect()
+        self.disconnect()
+
+    def snapshot(self):
+        """Dernière mesure: profondeurs, heure de la mesure, âge (s) et indicateur de données périmées"""
+        self.start()
+        if not self.samples:
+            return {'queues': {}, 'sampled_at': None, 'age': None, 'stale': True, 'error': self.last_error}
+        sampled_at, queues = self.samples[-1]
+        age = time.time() - sampled_at
+        return {
+            'queues': queues,
+            'sampled_at': datetime.fromtimestamp(sampled_at).isoformat(),
+            'age': age,
+            'stale': age > 3 * self.interval,
+            'error': self.last_error
+        }
+
+    def history(self):
+        """Mesures du tampon circulaire, de la plus ancienne à la plus récente"""
+        self.start()
+        return [{'sampled_at': datetime.fromtimestamp(sampled_at).isoformat(), 'queues': queues}
+                for sampled_at, queues in list(self.samples)]
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join(timeout=self.interval + 5)
+
+
+class PublishOutcomeUnknown(TimeoutError):
+    """Délai dépassé alors que la publication était en cours: le message a pu partir"""
+
+
+class PublisherThread:
+    """
+    Thread propriétaire d'une connexion RabbitMQ longue durée, alimenté par une file de demandes
+
+    Une BlockingConnection pika ne doit être utilisée que par un seul thread: les threads de
+    requêtes Flask déposent leurs publications dans la file et attendent leur exécution au lieu
+    d'ouvrir chacun une connexion. La topologie est déclarée à chaque (re)connexion, pas à chaque
+    requête. Une connexion perdue est rétablie automatiquement (délai doublé à chaque échec) et
+    la demande en cours est rejouée une fois; les consommateurs ignorent un éventuel doublon.
+    Tant que le broker est injoignable, les demandes échouent aussitôt au lieu d'attendre leur délai.
+    Les publications sont confirmées par le broker avant de rendre la main.
+    """
+
+    # Intervalle (secondes) de service de la connexion (heartbeats) quand aucune demande n'arrive
+    IDLE_INTERVAL = 1.0
+
+    def __init__(self, parameters, on_connect=None, reconnect_delay: float = WEB_RECONNECT_DELAY,
+                 max_reconnect_delay: float = WEB_MAX_RECONNECT_DELAY):
+        self.parameters = parameters
+        self.on_connect = on_connect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.requests = queue.Queue()
+        self.connection = None
+        self.channel = None
+        self.stopping = threading.Event()
+        # Positionné tant que la dernière tentative de connexion a échoué
+        self.disconnected = threading.Event()
+        self.start_lock = threading.Lock()
+        # Protège l'état de chaque demande (abandonnée par l'appelant / commencée par le thread)
+        self.outcome_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name='amqp-publisher', daemon=True)
+        self.stats = {'published': 0, 'connections': 0, 'failures': 0}
+        self.stats_lock = threading.Lock()
+
+    def start(self):
+        """Démarre le thread (une seule fois, y compris depuis plusieurs threads de requêtes)"""
+        with self.start_lock:
+            if self.thread.ident is None:
+                self.thread.start()
+        return self
+
+    def call(self, function, timeout: float = WEB_PUBLISH_TIMEOUT):
+        """
+        Exécute function(channel) sur le thread de la connexion et renvoie son résultat (exception propagée)
+
+        Lève ConnectionError tout de suite si le broker est injoignable, TimeoutError si la demande
+        n'a pas commencé dans le délai (elle ne le sera plus), PublishOutcomeUnknown si elle était
+        en cours: son effet (message publié ou non) est alors inconnu.
+        """
+        self.start()
+        if not self.thread.is_alive():
+            raise RuntimeError("Thread éditeur arrêté")
+        done = threading.Event()
+        outcome = {}
+        self.requests.put((function, done, outcome))
+        # Vérifié après le dépôt: une demande déposée avant l'échec de connexion est traitée par fail_pending
+        if self.disconnected.is_set() and self.abandon(outcome):
+            raise ConnectionError("RabbitMQ indisponible")
+        if not done.wait(timeout):
+            if self.abandon(outcome):
+                raise TimeoutError(f"Demande non traitée en {timeout:g}s")
+            if 'started' in outcome and not done.is_set():
+                raise PublishOutcomeUnknown(f"Demande en cours après {timeout:g}s: issue inconnue")
+            done.wait()  # Échec déjà positionné par fail_pending, signalé à l'instant
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('result')
+
+    def abandon(self, outcome):
+        """Abandonne une demande pas encore commencée; renvoie False si le thread l'a déjà prise en charge"""
+        with self.outcome_lock:
+            if 'started' in outcome or 'error' in outcome:
+                return False
+            outcome['abandoned'] = True
             return True
-            
+
+    def publish(self, exchange, routing_key, body, properties=None, timeout: float = WEB_PUBLISH_TIMEOUT):
+        """Publie un message depuis n'importe quel thread; revient une fois le message confirmé par le broker"""
+        self.call(lambda channel: channel.basic_publish(exchange=exchange, routing_key=routing_key,
+                                                        body=body, properties=properties), timeout)
+        with self.stats_lock:
+            self.stats['published'] += 1
+
+    def connect(self):
+        """Ouvre la connexion et le canal (confirmations activées) puis déclare la topologie"""
+        if self.channel is not None and self.channel.is_open:
+            return True
+        self.disconnect()
+        try:
+            self.connection = pika.BlockingConnection(self.parameters)
+            self.channel = self.connection.channel()
+            self.channel.confirm_delivery()
+            if self.on_connect is not None:
+                self.on_connect(self.channel)
         except Exception as e:
-            print(f"Erreur de connexion RabbitMQ: {e}")
+            print(f"❌ [PUBLISHER] Connexion RabbitMQ impossible: {e}")
+            self.disconnect()
             return False
+        self.stats['connections'] += 1
+        print(f"🔌 [PUBLISHER] Connexion RabbitMQ établie (n°{self.stats['connections']})")
+        return True
+
+    def disconnect(self):
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+        self.channel = None
+
+    def fail_pending(self, error):
+        """Sans connexion: les demandes en attente échouent tout de suite plutôt qu'à leur délai"""
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            if request is None:
+                self.stopping.set()
+                return
+            _, done, outcome = request
+            with self.outcome_lock:
+                outcome['error'] = error
+            done.set()
+
+    def execute(self, request):
+        """Exécute une demande; une erreur de connexion provoque une reconnexion et une seconde tentative"""
+        function, done, outcome = request
+        with self.outcome_lock:
+            if outcome.get('abandoned'):
+                return
+            outcome['started'] = True
+        try:
+            for attempt in range(2):
+                try:
+                    outcome['result'] = function(self.channel)
+                    return
+                except (AMQPConnectionError, AMQPChannelError, ConnectionError) as e:
+                    self.disconnect()
+                    if attempt or not self.connect():
+                        self.stats['failures'] += 1
+                        outcome['error'] = e
+                        return
+                except Exception as e:
+                    self.stats['failures'] += 1
+                    outcome['error'] = e
+                    return
+        finally:
+            done.set()
+
+    def run(self):
+        """Boucle du thread: (re)connexion, exécution des demandes, service des heartbeats au repos"""
+        delay = self.reconnect_delay
+        while not self.stopping.is_set():
+            if not self.connect():
+                # Les demandes suivantes échouent dans call() jusqu'à la prochaine connexion réussie
+                self.disconnected.set()
+                self.fail_pending(ConnectionError("RabbitMQ indisponible"))
+                self.stopping.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            self.disconnected.clear()
+            delay = self.reconnect_delay
+
+            try:
+                request = self.requests.get(timeout=self.IDLE_INTERVAL)
+            except queue.Empty:
+                try:
+                    self.connection.process_data_events(time_limit=0)
+                except Exception:
+                    self.disconnect()
+                continue
+            if request is None:
+                break
+            self.execute(request)
+        self.disconnect()
+
+    def stop(self):
+        self.stopping.set()
+        self.requests.put(None)
+        self.thread.join(timeout=5)
+
+
+class RabbitMQWebInterface:
+    def __init__(self):
+        # Toutes les publications passent par le thread éditeur; topologie déclarée à sa connexion
+        self.publisher = PublisherThread(connection_parameters(),
+                                         on_connect=lambda channel: declare_topology(channel, TASK_QUEUES))
+        # Profondeur des queues mesurée en arrière-plan sur sa propre connexion
+        self.sampler = QueueDepthSampler(connection_parameters())
+        self.result_consumer_thread = None
+        self.consuming = False
     
-    def send_task(self, n1, n2, operation):
-        """Envoie une tâche de calcul"""
+    def start_publisher(self):
+        """Démarre le thread éditeur dès le lancement: connexion et topologie prêtes avant la première requête"""
+        self.publisher.start()
+    
+    def send_task(self, n1, n2, operation, priority=None, ttl=None):
+        """Envoie une tâche de calcul (priorité explicite, sinon celle de la source "web"; ttl en secondes)"""
         print(f"🔧 [SEND_TASK] Début envoi tâche: n1={n1}, n2={n2}, operation={operation}")
+        priority = task_priority("web", priority)
+        ttl = float(ttl) if ttl else (TASK_TTL or None)
         
-        if not self.connect_to_rabbitmq():
-            print(f"❌ [SEND_TASK] Échec connexion RabbitMQ")
-            return False
-            
         try:
             if operation == 'all':
                 print(f"📤 [SEND_TASK] Envoi vers toutes les opérations via exchange")
-                for op in ['add', 'sub', 'mul', 'div']:
-                    task_message = create_task_message(n1, n2, op, source="web")
-                    print(f"📨 [SEND_TASK] Message créé pour {op}: {task_message}")
-                    self.channel.basic_publish(
-                        exchange=ALL_OPERATIONS_EXCHANGE,
-                        routing_key='',
-                        body=serialize_message(task_message),
-                        properties=pika.BasicProperties(delivery_mode=2)
-                    )
-                    print(f"✅ [SEND_TASK] Message {op} publié vers exchange {ALL_OPERATIONS_EXCHANGE}")
+                task_message = create_task_message(n1, n2, ALL_OPERATION, source="web", ttl=ttl)
+                print(f"📨 [SEND_TASK] Message 'all' créé: {task_message}")
+                self.publisher.publish(
+                    exchange=ALL_OPERATIONS_EXCHANGE,
+                    routing_key='',
+                    body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                    properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                    priority=priority,
+                                                    expiration=message_expiration(task_message))
+                )
+                print(f"✅ [SEND_TASK] Message 'all' publié vers exchange {ALL_OPERATIONS_EXCHANGE}")
                 stats['sent_tasks'] += 4
                 print(f"📊 [SEND_TASK] Stats mises à jour: {stats['sent_tasks']} tâches envoyées")
             else:
-                task_message = create_task_message(n1, n2, operation, source="web")
-                queue_name = TASK_QUEUES[operation]
+                task_message = create_task_message(n1, n2, operation, source="web", ttl=ttl)
+                queue_name = task_routing_key(operation, task_message["source"])
                 print(f"📨 [SEND_TASK] Message créé pour {operation}: {task_message}")
                 print(f"📤 [SEND_TASK] Envoi vers queue: {queue_name}")
                 
-                self.channel.basic_publish(
-                    exchange='',
+                self.publisher.publish(
+                    exchange=TASKS_EXCHANGE,
                     routing_key=queue_name,
-                    body=serialize_message(task_message),
-                    properties=pika.BasicProperties(delivery_mode=2)
+                    body=encode_task_message(task_message, CONTENT_TYPES[MESSAGE_FORMAT]),
+                    properties=pika.BasicProperties(delivery_mode=2, content_type=CONTENT_TYPES[MESSAGE_FORMAT],
+                                                    priority=priority,
+                                                    expiration=message_expiration(task_message))
                 )
                 print(f"✅ [SEND_TASK] Message publié vers queue {queue_name}")
                 stats['sent_tasks'] += 1
@@ -837,75 +1171,88 @@ class RabbitMQWebInterface:
             print(f"🎉 [SEND_TASK] Tâche envoyée avec succès!")
             return True
             
+        except PublishOutcomeUnknown:
+            raise  # Ni succès ni échec: signalé tel quel à l'appelant
         except Exception as e:
             print(f"❌ [SEND_TASK] Erreur envoi tâche: {e}")
             import traceback
             traceback.print_exc()
             return False
-        finally:
-            if self.connection and not self.connection.is_closed:
-                self.connection.close()
-                print(f"🔌 [SEND_TASK] Connexion fermée")
     
-    def get_queue_status(self):
-        """Récupère l'état des queues"""
-        if not self.connect_to_rabbitmq():
-            return {}
-            
+    def cancel_task(self, request_id):
+        """Diffuse l'annulation d'une requête à tous les workers via l'exchange de contrôle"""
         try:
-            status = {}
-            
-            # Vérifier les queues de tâches
-            for operation, queue_name in TASK_QUEUES.items():
-                method = self.channel.queue_declare(queue=queue_name, durable=True, passive=True)
-                status[f"task_{operation}"] = method.method.message_count
-            
-            # Vérifier la queue des résultats
-            method = self.channel.queue_declare(queue=RESULT_QUEUE, durable=True, passive=True)
-            status["results"] = method.method.message_count
-            
-            stats['queue_status'] = status
-            return status
+            self.publisher.publish(
+                exchange=CONTROL_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_cancel_message(request_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
+            )
+            print(f"🛑 [CANCEL] Annulation diffusée pour {request_id}")
+            return True
             
+        except PublishOutcomeUnknown:
+            raise
         except Exception as e:
-            print(f"Erreur récupération statut queues: {e}")
-            return {}
-        finally:
-            if self.connection and not self.connection.is_closed:
-                self.connection.close()
+            print(f"❌ [CANCEL] Erreur annulation: {e}")
+            return False
+    
+    def get_queue_status(self):
+        """Dernière mesure de l'état des queues (en mémoire, sans appel au broker)"""
+        status = self.sampler.snapshot()
+        stats['queue_status'] = status['queues']
+        return status
     
     def start_result_consumer(self):
         """Démarre le consommateur de résultats en arrière-plan"""
         def consume_results():
-            if not self.connect_to_rabbitmq():
-                return
+            
+            def display_result(result_message):
+                """Ajoute un résultat (ou un groupe) aux listes affichées, 50 derniers par liste"""
+                stats['recent_results'].append(result_message)
+                if len(stats['recent_results']) > 50:
+                    stats['recent_results'].pop(0)
                 
+                # Séparer par source (en supposant que les tâches sans source sont automatiques)
+                source = result_message.get('source', 'auto')  # Fallback pour compatibilité
+                if source == 'web':
+                    stats['web_results'].append(result_message)
+                    if len(stats['web_results']) > 50:
+                        stats['web_results'].pop(0)
+                else:
+                    stats['auto_results'].append(result_message)
+                    if len(stats['auto_results']) > 50:
+                        stats['auto_results'].pop(0)
+                
+                stats['last_update'] = datetime.now().isoformat()
+            
             def process_result(channel, method, properties, body):
                 try:
-                    message_str = body.decode('utf-8')
-                    result_message = deserialize_message(message_str)
+                    result_message = decode_message(body, properties.content_type)
+                    
+                    # Un même calcul peut produire plusieurs résultats: seul le premier compte
+                    if not seen_results.add(message_identity(result_message)):
+                        stats['duplicate_results'] += 1
+                        channel.basic_ack(delivery_tag=method.delivery_tag)
+                        return
                     
                     # Mettre à jour les statistiques
+                    if is_batch_message(result_message):
+                        # Un lot n'est compté que dans les statistiques, pas dans les listes affichées
+                        stats['received_results'] += result_message['count']
+                        stats['operations'][result_message['op']] += result_message['count']
+                        stats['last_update'] = datetime.now().isoformat()
+                        channel.basic_ack(delivery_tag=method.delivery_tag)
+                        return
+                    
                     stats['received_results'] += 1
                     stats['operations'][result_message['op']] += 1
                     
-                    # Ajouter aux résultats récents (garder seulement les 50 derniers)
-                    stats['recent_results'].append(result_message)
-                    if len(stats['recent_results']) > 50:
-                        stats['recent_results'].pop(0)
-                    
-                    # Séparer par source (en supposant que les tâches sans source sont automatiques)
-                    source = result_message.get('source', 'auto')  # Fallback pour compatibilité
-                    if source == 'web':
-                        stats['web_results'].append(result_message)
-                        if len(stats['web_results']) > 50:
-                            stats['web_results'].pop(0)
+                    # Résultat d'une tâche "all" en mode regroupé: affiché avec son groupe
+                    if WEB_GROUPED_RESULTS and 'group' in result_message:
+                        stats['last_update'] = datetime.now().isoformat()
                     else:
-                        stats['auto_results'].append(result_message)
-                        if len(stats['auto_results']) > 50:
-                            stats['auto_results'].pop(0)
-                    
-                    stats['last_update'] = datetime.now().isoformat()
+                        display_result(result_message)
                     
                     channel.basic_ack(delivery_tag=method.delivery_tag)
                     
@@ -913,19 +1260,40 @@ class RabbitMQWebInterface:
                     print(f"Erreur traitement résultat: {e}")
                     channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
             
-            self.channel.basic_qos(prefetch_count=1)
-            self.channel.basic_consume(
-                queue=RESULT_QUEUE,
-                on_message_callback=process_result
-            )
+            def process_group_result(channel, method, properties, body):
+                """Résultat regroupé d'une tâche "all" (déjà compté par opération avec ses membres)"""
+                try:
+                    group_message = decode_message(body, properties.content_type)
+                    if seen_results.add(f"group:{group_message['request_id']}"):
+                        display_result(group_message)
+                    else:
+                        stats['duplicate_results'] += 1
+                    channel.basic_ack(delivery_tag=method.delivery_tag)
+                except Exception as e:
+                    print(f"Erreur traitement résultat regroupé: {e}")
+                    channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
             
+            # Connexion propre au thread consommateur, rétablie si elle est perdue
             self.consuming = True
-            try:
-                self.channel.start_consuming()
-            except Exception as e:
-                print(f"Erreur consommation: {e}")
-            finally:
-                self.consuming = False
+            delay = WEB_RECONNECT_DELAY
+            while self.consuming:
+                try:
+                    connection = pika.BlockingConnection(connection_parameters())
+                    channel = connection.channel()
+                    declare_topology(channel, TASK_QUEUES)
+                    channel.basic_qos(prefetch_count=1)
+                    channel.basic_consume(
+                        queue=RESULT_QUEUE,
+                        on_message_callback=process_result
+                    )
+                    if WEB_GROUPED_RESULTS:
+                        channel.basic_consume(queue=GROUPED_RESULT_QUEUE, on_message_callback=process_group_result)
+                    delay = WEB_RECONNECT_DELAY
+                    channel.start_consuming()
+                except Exception as e:
+                    print(f"Erreur consommation: {e} (reconnexion dans {delay:.0f}s)")
+                    time.sleep(delay)
+                    delay = min(delay * 2, WEB_MAX_RECONNECT_DELAY)
         
         if not self.consuming:
             self.result_consumer_thread = threading.Thread(target=consume_results, daemon=True)
@@ -957,15 +1325,17 @@ def api_send_task():
         n1 = float(data['n1'])
         n2 = float(data['n2'])
         operation = data['operation']
+        priority = data.get('priority')
+        ttl = data.get('ttl')
         
-        print(f"Parsed values: n1={n1}, n2={n2}, operation={operation}")
+        print(f"Parsed values: n1={n1}, n2={n2}, operation={operation}, priority={priority}, ttl={ttl}")
         
         if operation not in ['add', 'sub', 'mul', 'div', 'all']:
             print(f"Invalid operation: {operation}")
             return jsonify({'success': False, 'error': 'Opération non supportée'})
         
         print(f"Calling rabbitmq_interface.send_task...")
-        success = rabbitmq_interface.send_task(n1, n2, operation)
+        success = rabbitmq_interface.send_task(n1, n2, operation, priority, ttl)
         print(f"send_task returned: {success}")
         
         if success:
@@ -975,6 +1345,10 @@ def api_send_task():
             print(f"Task sending failed")
             return jsonify({'success': False, 'error': 'Erreur lors de l\'envoi'})
             
+    except PublishOutcomeUnknown as e:
+        print(f"Task sending outcome unknown: {e}")
+        return jsonify({'success': False, 'outcome': 'unknown',
+                        'error': f'Envoi incertain ({e}): la tâche a pu être publiée'})
     except Exception as e:
         print(f"Exception in api_send_task: {e}")
         import traceback
@@ -982,6 +1356,29 @@ def api_send_task():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/cancel', methods=['POST'])
+def api_cancel():
+    """API pour annuler une requête (ID complet ou 8 premiers caractères tels qu'affichés)"""
+    try:
+        data = request.get_json()
+        request_id = str(data['request_id']).strip().lower()
+        if not request_id:
+            return jsonify({'success': False, 'error': 'request_id manquant'})
+        if not is_cancel_id(request_id):
+            return jsonify({'success': False,
+                            'error': 'request_id invalide: ID complet (16 caractères hexadécimaux) ou ses 8 premiers'})
+        
+        if rabbitmq_interface.cancel_task(request_id):
+            return jsonify({'success': True})
+        return jsonify({'success': False, 'error': 'Erreur lors de l\'annulation'})
+        
+    except PublishOutcomeUnknown as e:
+        return jsonify({'success': False, 'outcome': 'unknown',
+                        'error': f'Annulation incertaine ({e}): elle a pu être diffusée'})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
 @app.route('/api/stats')
 def api_stats():
     """API pour récupérer les statistiques"""
@@ -990,11 +1387,17 @@ def api_stats():
 
 @app.route('/api/queue_status')
 def api_queue_status():
-    """API pour récupérer l'état des queues"""
+    """API pour récupérer l'état des queues (dernière mesure de l'échantillonneur et son âge)"""
     status = rabbitmq_interface.get_queue_status()
     return jsonify(status)
 
 
+@app.route('/api/queue_history')
+def api_queue_history():
+    """API pour récupérer l'historique des mesures de l'état des queues"""
+    return jsonify(rabbitmq_interface.sampler.history())
+
+
 @app.route('/api/recent_results')
 def api_recent_results():
     """API pour récupérer les résultats récents"""
@@ -1025,6 +1428,7 @@ def api_clear_stats():
         'web_results': [],
         'auto_results': [],
         'queue_status': {},
+        'duplicate_results': 0,
         'last_update': datetime.now().isoformat()
     }
     return jsonify({'success': True})
@@ -1033,7 +1437,9 @@ def api_clear_stats():
 def main():
     print("🚀 Démarrage de l'interface web...")
     
-    # Démarrer le consommateur de résultats
+    # Démarrer le thread éditeur (connexion partagée), l'échantillonneur des queues et le consommateur de résultats
+    rabbitmq_interface.start_publisher()
+    rabbitmq_interface.sampler.start()
     rabbitmq_interface.start_result_consumer()
     
     print("✅ Interface web disponible sur http://localhost:5000")
@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
 """
 Worker pour effectuer les calculs distribués
-Usage: python worker.py <operation> [--verbose]
+Usage: python worker.py <operation> [--verbose] [--async [--concurrency N]] [--pipeline]
+       python worker.py --ops add,sub,mul,div|all [--threads N] [--op-limits add=2,mul=8]
+       python worker.py <operation> --processes N|auto
+       python worker.py <operation> --weights web=4,auto=1,shared=2
 """
 
 import sys
 import os
 import time
 import random
+import signal
 import argparse
+import asyncio
+import copy
+import functools
+import json
+import multiprocessing
+import threading
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.spec import Basic
 from colorama import init, Fore, Style
 
 # Ajouter le répertoire parent au path pour les imports
@@ -17,29 +31,169 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.rabbitmq_config import *
 from utils.message_utils import *
+from utils.prefetch_controller import PrefetchController
+from utils.shared_cache import SharedResultCache
+from utils.seen_set import SeenSet
+from utils.topology import (declare_topology, topology_declarations, retry_delay, retry_queue_name, priority_class,
+                            task_lanes, lane_weights)
+from utils.fair_queue import DeficitRoundRobin
+from utils.latency_stats import LatencyWindow
+from utils.object_store import ObjectStore
 
 # Initialiser colorama pour les couleurs dans le terminal
 init()
 
 
+class ResultCache:
+    """
+    Mémoïsation locale des résultats: LRU bornée avec durée de vie (TTL)
+
+    Clé: (opération, n1, n2). Les entrées expirées ou les plus anciennement utilisées
+    sont évincées. Le cache peut être sauvegardé dans un fichier à l'arrêt et rechargé
+    au démarrage pour que le worker redémarre « chaud ». Il n'est accédé que depuis le
+    thread I/O (ou la boucle asyncio): aucun verrou n'est nécessaire.
+    """
+    
+    def __init__(self, max_size: int = WORKER_CACHE_SIZE, ttl: float = WORKER_CACHE_TTL, path: str = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self.entries = OrderedDict()  # clé -> (résultat, expiration en secondes epoch)
+        self.stats = defaultdict(int)
+    
+    @staticmethod
+    def key(operation: str, n1, n2):
+        return (operation, float(n1), float(n2))
+    
+    def get(self, key):
+        """Renvoie le résultat mémorisé, ou None (absent ou expiré)"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            result, expires_at = entry
+            if expires_at > time.time():
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return result
+            del self.entries[key]
+            self.stats['expired'] += 1
+        self.stats['misses'] += 1
+        return None
+    
+    def put(self, key, result: float):
+        """Mémorise un résultat et évince les entrées les plus anciennes au-delà de la taille max"""
+        self.entries[key] = (result, time.time() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    def load(self):
+        """Recharge les entrées encore valides depuis le fichier (redémarrage à chaud)"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{Fore.YELLOW}⚠️  Cache illisible, ignoré: {e}{Style.RESET_ALL}")
+            return 0
+        
+        now = time.time()
+        for operation, n1, n2, result, expires_at in saved[-self.max_size:]:
+            if expires_at > now:
+                self.entries[(operation, n1, n2)] = (result, expires_at)
+        return len(self.entries)
+    
+    def save(self):
+        """Sauvegarde les entrées valides (du plus ancien au plus récent) par remplacement atomique"""
+        if not self.path:
+            return
+        now = time.time()
+        saved = [[key[0], key[1], key[2], result, expires_at]
+                 for key, (result, expires_at) in self.entries.items() if expires_at > now]
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+        os.replace(temp_path, self.path)
+    
+    def describe(self) -> str:
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = 100 * self.stats['hits'] / lookups if lookups else 0
+        return (f"{len(self.entries)}/{self.max_size} entrées, {self.stats['hits']} hits, "
+                f"{self.stats['misses']} misses ({hit_rate:.1f}% hits), "
+                f"{self.stats['evictions']} évictions, {self.stats['expired']} expirées")
+
+
+def task_cost(task_message):
+    """Coût d'une tâche pour l'ordonnanceur: le nombre de calculs qu'elle contient"""
+    if is_reduce_message(task_message):
+        return len(task_message["values"])
+    if is_claim_message(task_message):
+        return task_message["count"]
+    if is_matmul_message(task_message):
+        return task_message["rows"] * task_message["cols"]
+    return len(task_message["n1"]) if is_batch_message(task_message) else 1
+
+
 class CalculationWorker:
-    def __init__(self, operation: str, verbose: bool = False):
+    def __init__(self, operation: str, verbose: bool = False, worker_id: str = None):
         self.operation = operation
+        self.operations = [operation]
         self.verbose = verbose
-        self.worker_id = f"worker_{operation}_{random.randint(1000, 9999)}"
+        self.worker_id = worker_id or f"worker_{operation}_{random.randint(1000, 9999)}"
         self.processed_count = 0
+        # Compteur partagé avec le superviseur prefork (multiprocessing.Value), le cas échéant
+        self.shared_counter = None
+        self.operation_counts = defaultdict(int)
+        self.in_flight_counts = defaultdict(int)
         self.connection = None
         self.channel = None
+        # Contrôleur de prefetch adaptatif (--adaptive-prefetch), le cas échéant
+        self.prefetch_controller = None
+        # Cache local des résultats (--cache-size), le cas échéant
+        self.result_cache = None
+        # Cache partagé entre les workers de l'hôte (--shared-cache), le cas échéant
+        self.shared_cache = None
+        # Calculs déjà terminés, pour ne pas refaire une tâche relivrée par le broker
+        self.seen_tasks = SeenSet(SEEN_SET_CAPACITY, SEEN_SET_WINDOW)
+        self.duplicate_count = 0
+        # Tâches abandonnées car leur échéance était dépassée
+        self.expired_count = 0
+        # Annulations reçues par l'exchange de contrôle (ensemble borné) et tâches en cours interruptibles
+        self.cancelled = OrderedDict()
+        self.cancelled_count = 0
+        self.running = {}
+        # Temps d'attente en queue par classe de priorité (web, auto...)
+        self.queue_waits = defaultdict(LatencyWindow)
+        # Tourniquet pondéré entre les voies (queue partagée, sous-queues par source) et tâches en exécution
+        self.scheduler = DeficitRoundRobin(lane_weights())
+        self.executing = defaultdict(int)
+        # Magasin d'objets des tâches sur tableaux par référence, créé au premier message qui en a besoin
+        self.object_store = None
+        # Thread d'exécution des tâches, séparé du thread I/O de pika
+        self.executor = self.create_executor()
         
         print(f"{Fore.GREEN}🚀 Worker {self.worker_id} démarré pour l'opération '{operation}'{Style.RESET_ALL}")
         
-    def connect_to_rabbitmq(self):
-        """Établit la connexion à RabbitMQ"""
-        connection_params = pika.ConnectionParameters(
+    def pool_size(self):
+        """Nombre de tâches exécutées simultanément"""
+        return 1
+    
+    def create_executor(self):
+        """Crée le pool d'exécution des tâches"""
+        return ThreadPoolExecutor(max_workers=self.pool_size(), thread_name_prefix=self.worker_id)
+    
+    def connection_parameters(self):
+        """Paramètres de connexion à RabbitMQ"""
+        return pika.ConnectionParameters(
             host=RABBITMQ_HOST,
             port=RABBITMQ_PORT,
             credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
         )
+    
+    def connect_to_rabbitmq(self):
+        """Établit la connexion à RabbitMQ"""
+        connection_params = self.connection_parameters()
         
         max_retries = 5
         for attempt in range(max_retries):
@@ -47,16 +201,9 @@ class CalculationWorker:
                 self.connection = pika.BlockingConnection(connection_params)
                 self.channel = self.connection.channel()
                 
-                # Déclarer les queues
-                task_queue = TASK_QUEUES[self.operation]
-                self.channel.queue_declare(queue=task_queue, durable=True)
-                self.channel.queue_declare(queue=RESULT_QUEUE, durable=True)
-                
-                # Déclarer l'exchange pour les opérations "all"
-                self.channel.exchange_declare(exchange=ALL_OPERATIONS_EXCHANGE, exchange_type='fanout')
-                
-                # Lier la queue à l'exchange pour les opérations "all"
-                self.channel.queue_bind(exchange=ALL_OPERATIONS_EXCHANGE, queue=task_queue)
+                # Déclarer les queues, l'exchange "all" et les liaisons, les paliers de retry
+                # et les queues des messages mis de côté
+                declare_topology(self.channel, self.operations)
                 
                 print(f"{Fore.CYAN}✅ Connexion à RabbitMQ établie{Style.RESET_ALL}")
                 return True
@@ -69,109 +216,1312 @@ class CalculationWorker:
         print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ après {max_retries} tentatives{Style.RESET_ALL}")
         return False
     
-    def process_message(self, channel, method, properties, body):
-        """Traite un message de calcul"""
-        try:
-            # Désérialiser le message
-            message_str = body.decode('utf-8')
-            task_message = deserialize_message(message_str)
-            
+    def decode_task(self, properties, body, operation=None):
+        """Décode et valide une tâche; renvoie None si le message doit seulement être acquitté"""
+        operation = operation or self.operation
+        
+        # Décoder le message directement depuis le buffer (binaire ou JSON selon content_type)
+        task_message = decode_message(body, properties.content_type)
+        
+        if self.verbose:
+            print(f"{Fore.BLUE}📨 Message reçu: {serialize_message(task_message)}{Style.RESET_ALL}")
+        
+        # Valider le message
+        if not validate_task_message(task_message):
+            print(f"{Fore.RED}❌ Message invalide reçu{Style.RESET_ALL}")
+            return None
+        
+        # Vérifier que l'opération correspond; une tâche "all" est reçue une seule fois
+        # par chaque queue via l'exchange fanout et chaque worker y calcule sa propre opération
+        if task_message["operation"] == ALL_OPERATION:
+            task_message["operation"] = operation
+        elif task_message["operation"] != operation:
             if self.verbose:
-                print(f"{Fore.BLUE}📨 Message reçu: {serialize_message(task_message)}{Style.RESET_ALL}")
-            
-            # Valider le message
-            if not validate_task_message(task_message):
-                print(f"{Fore.RED}❌ Message invalide reçu{Style.RESET_ALL}")
-                channel.basic_ack(delivery_tag=method.delivery_tag)
-                return
-            
-            # Vérifier que l'opération correspond
-            if task_message["operation"] != self.operation:
-                if self.verbose:
-                    print(f"{Fore.YELLOW}⚠️  Message pour une autre opération ignoré: {task_message['operation']}{Style.RESET_ALL}")
-                channel.basic_ack(delivery_tag=method.delivery_tag)
+                print(f"{Fore.YELLOW}⚠️  Message pour une autre opération ignoré: {task_message['operation']}{Style.RESET_ALL}")
+            return None
+        
+        self.record_queue_wait(properties, task_message)
+        
+        # Échéance dépassée: l'appelant a abandonné, inutile de calculer
+        if is_expired(task_message):
+            self.count_expired(task_message)
+            return None
+        
+        if self.is_cancelled(task_message["request_id"]):
+            self.count_cancelled(task_message)
+            return None
+        
+        return task_message
+    
+    def is_cancelled(self, request_id):
+        """Indique si la requête a été annulée (identifiant complet ou 8 premiers caractères)"""
+        return request_id in self.cancelled or request_id[:8] in self.cancelled
+    
+    def count_cancelled(self, task_message):
+        """Compte et signale une tâche abandonnée car annulée"""
+        self.cancelled_count += 1
+        print(f"{Fore.YELLOW}🛑 Tâche {task_message['request_id'][:8]} annulée, ignorée "
+              f"(annulées: {self.cancelled_count}){Style.RESET_ALL}")
+    
+    def on_control_message(self, channel, method, properties, body):
+        """Message de l'exchange de contrôle (thread I/O): mémorise l'annulation et interrompt les tâches en cours"""
+        try:
+            message = deserialize_message(body)
+            if message.get("type") != "cancel":
                 return
-            
-            # Simuler le temps de traitement (5-15 secondes)
-            processing_time = random.uniform(
-                WORKER_PROCESSING_TIME['min'], 
-                WORKER_PROCESSING_TIME['max']
+            request_id = str(message["request_id"])
+        except Exception as e:
+            print(f"{Fore.RED}❌ Message de contrôle invalide: {e}{Style.RESET_ALL}")
+            return
+        
+        self.cancelled[request_id] = True
+        self.cancelled.move_to_end(request_id)
+        while len(self.cancelled) > CANCELLED_SET_SIZE:
+            self.cancelled.popitem(last=False)
+        
+        interrupted = 0
+        for running_id, cancel_event in self.running.values():
+            if self.is_cancelled(running_id):
+                cancel_event.set()
+                interrupted += 1
+        print(f"{Fore.YELLOW}🛑 Annulation reçue pour {request_id[:8]} "
+              f"({interrupted} tâche(s) en cours interrompue(s)){Style.RESET_ALL}")
+    
+    def subscribe_control(self):
+        """S'abonne, par une queue exclusive, aux messages de contrôle diffusés à tous les workers"""
+        result = self.channel.queue_declare(queue='', exclusive=True)
+        control_queue = result.method.queue
+        self.channel.queue_bind(queue=control_queue, exchange=CONTROL_EXCHANGE)
+        self.channel.basic_consume(queue=control_queue, on_message_callback=self.on_control_message, auto_ack=True)
+    
+    def announce_start(self, channel, task_message):
+        """
+        Diffuse le démarrage d'une tâche (exchange des événements, sans queue liée le broker l'écarte)
+        pour que l'exécution spéculative mesure le temps d'exécution sans l'attente en queue;
+        renvoie True si l'événement a été publié
+        """
+        if "reply_to" in task_message or not channel.is_open:
+            return False  # Résultat adressé au demandeur: jamais dupliqué
+        try:
+            channel.basic_publish(
+                exchange=TASK_EVENTS_EXCHANGE,
+                routing_key='',
+                body=serialize_message(create_task_started_message(task_message, self.worker_id)),
+                properties=pika.BasicProperties(content_type=CONTENT_TYPE_JSON)
             )
-            
-            print(f"{Fore.MAGENTA}⏳ Traitement de {task_message['n1']} {self.operation} {task_message['n2']} "
+            return True
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible d'annoncer le démarrage de la tâche: {e}{Style.RESET_ALL}")
+            return False
+    
+    def count_expired(self, task_message):
+        """Compte et signale une tâche abandonnée car expirée"""
+        self.expired_count += 1
+        print(f"{Fore.YELLOW}⌛ Tâche {task_message['request_id'][:8]} expirée, ignorée "
+              f"(expirées: {self.expired_count}){Style.RESET_ALL}")
+    
+    def record_queue_wait(self, properties, task_message):
+        """Mesure le temps passé en queue par la tâche, par classe de priorité de la livraison"""
+        try:
+            wait = message_age(task_message)
+        except (TypeError, ValueError):
+            return
+        lane = priority_class(properties.priority)
+        self.queue_waits[lane].record(wait)
+        if self.verbose:
+            print(f"{Fore.BLUE}⏱️  Attente en queue [{lane}]: {wait * 1000:.0f}ms{Style.RESET_ALL}")
+    
+    def start_task(self, task_message):
+        """Tire le temps de traitement simulé (5-15 secondes, une seule fois par lot ou partition) et l'annonce"""
+        processing_time = random.uniform(
+            WORKER_PROCESSING_TIME['min'], 
+            WORKER_PROCESSING_TIME['max']
+        )
+        
+        if is_batch_message(task_message):
+            print(f"{Fore.MAGENTA}⏳ Traitement d'un lot de {len(task_message['n1'])} calculs '{task_message['operation']}' "
                   f"(temps estimé: {processing_time:.1f}s){Style.RESET_ALL}")
-            
-            start_time = time.time()
-            time.sleep(processing_time)
-            actual_processing_time = time.time() - start_time
-            
-            # Effectuer le calcul
-            result = perform_operation(
-                task_message["operation"], 
-                task_message["n1"], 
-                task_message["n2"]
-            )
-            
-            # Créer le message de résultat
-            result_message = create_result_message(
+        elif is_reduce_message(task_message):
+            print(f"{Fore.MAGENTA}⏳ Réduction '{task_message['operation']}' de la partition "
+                  f"{task_message['partition'] + 1}/{task_message['partitions']} ({len(task_message['values'])} valeurs, "
+                  f"temps estimé: {processing_time:.1f}s){Style.RESET_ALL}")
+        elif is_claim_message(task_message):
+            print(f"{Fore.MAGENTA}⏳ Calcul '{task_message['operation']}' de {task_message['count']} valeurs "
+                  f"[{task_message['start']}, {task_message['start'] + task_message['count']}) "
+                  f"par référence (temps estimé: {processing_time:.1f}s){Style.RESET_ALL}")
+        elif is_matmul_message(task_message):
+            print(f"{Fore.MAGENTA}⏳ Produit de blocs {task_message['rows']}x{task_message['inner']} "
+                  f"@ {task_message['inner']}x{task_message['cols']} (tuile {tuple(task_message['tile'])}, "
+                  f"temps estimé: {processing_time:.1f}s){Style.RESET_ALL}")
+        else:
+            print(f"{Fore.MAGENTA}⏳ Traitement de {task_message['n1']} {task_message['operation']} {task_message['n2']} "
+                  f"(temps estimé: {processing_time:.1f}s){Style.RESET_ALL}")
+        
+        return processing_time
+    
+    def compute_result(self, task_message, actual_processing_time):
+        """Effectue le calcul (vectorisé sur toute la colonne pour un lot ou une partition) et crée le message de résultat"""
+        if is_reduce_message(task_message):
+            result = perform_reduce(task_message["operation"], task_message["values"])
+            return create_reduce_result_message(
                 task_message, result, self.worker_id, actual_processing_time
             )
-            
-            # Envoyer le résultat dans la queue des résultats
-            self.channel.basic_publish(
-                exchange='',
-                routing_key=RESULT_QUEUE,
-                body=serialize_message(result_message),
-                properties=pika.BasicProperties(delivery_mode=2)
+        
+        if is_claim_message(task_message):
+            # Opérandes lus et résultat écrit directement dans les fichiers projetés du magasin
+            start, count = task_message["start"], task_message["count"]
+            store = self.objects()
+            with store.mapped(task_message["a"], start, count) as a, \
+                    store.mapped(task_message["b"], start, count) as b, \
+                    store.mapped(task_message["out"], start, count, writable=True) as out:
+                perform_operation_into(task_message["operation"], a, b, out)
+            return create_claim_result_message(task_message, self.worker_id, actual_processing_time)
+        
+        if is_matmul_message(task_message):
+            c_block = perform_matmul(task_message["a"], task_message["b"], task_message["rows"],
+                                     task_message["inner"], task_message["cols"])
+            return create_matmul_result_message(task_message, c_block, self.worker_id, actual_processing_time)
+        
+        if is_batch_message(task_message):
+            results = perform_operation_batch(
+                task_message["operation"],
+                task_message["n1"],
+                task_message["n2"]
             )
-            
+            return create_batch_result_message(
+                task_message, results, self.worker_id, actual_processing_time
+            )
+        
+        result = perform_operation(
+            task_message["operation"], 
+            task_message["n1"], 
+            task_message["n2"]
+        )
+        return create_result_message(
+            task_message, result, self.worker_id, actual_processing_time
+        )
+    
+    def publish_result(self, channel, result_message, content_type):
+        """
+        Envoie le résultat (exchange des résultats, vers result_queue) dans le format de la tâche reçue;
+        un résultat adressé (partiel de réduction, référence d'une plage, tuile) va directement à la queue reply_to;
+        un résultat membre d'un groupe porte l'en-tête qui le copie aussi vers l'agrégateur
+        """
+        result_content_type = content_type or CONTENT_TYPE_JSON
+        if "reply_to" in result_message:
+            exchange, routing_key = '', result_message["reply_to"]
+        else:
+            exchange, routing_key = RESULTS_EXCHANGE, RESULT_QUEUE
+        headers = {GROUP_MEMBER_HEADER: '1'} if "group" in result_message else None
+        channel.basic_publish(
+            exchange=exchange,
+            routing_key=routing_key,
+            body=encode_result_message(result_message, result_content_type),
+            properties=pika.BasicProperties(delivery_mode=2, content_type=result_content_type, headers=headers)
+        )
+    
+    def objects(self):
+        """Magasin d'objets, créé (avec son répertoire) au premier message par référence"""
+        if self.object_store is None:
+            self.object_store = ObjectStore(OBJECT_STORE_DIR)
+        return self.object_store
+    
+    def cached_result(self, task_message):
+        """Résultat mémorisé pour cette tâche (cache local puis cache partagé), sans délai de traitement, ou None"""
+        if (is_batch_message(task_message) or is_reduce_message(task_message) or is_claim_message(task_message)
+                or is_matmul_message(task_message) or (self.result_cache is None and self.shared_cache is None)):
+            return None
+        
+        key = ResultCache.key(task_message["operation"], task_message["n1"], task_message["n2"])
+        result = self.result_cache.get(key) if self.result_cache is not None else None
+        if result is None and self.shared_cache is not None:
+            result = self.shared_cache.get(key)
+            if result is not None and self.result_cache is not None:
+                self.result_cache.put(key, result)
+        if result is None:
+            return None
+        
+        result_message = create_result_message(task_message, result, self.worker_id, 0.0)
+        result_message["cached"] = True
+        print(f"{Fore.CYAN}⚡ Résultat en cache: {task_message['n1']} {task_message['operation']} "
+              f"{task_message['n2']} = {result}{Style.RESET_ALL}")
+        return result_message
+    
+    def replayed_result(self, method, task_message):
+        """
+        Relivraison d'un calcul déjà terminé: renvoie (déjà vu, résultat mémorisé ou None)
+
+        Seules les livraisons marquées redelivered sont vérifiées, si bien qu'un faux positif
+        du filtre de Bloom ne peut concerner qu'une tâche déjà remise en queue.
+        """
+        if not method.redelivered:
+            return False, None
+        
+        seen, result_message = self.seen_tasks.check(message_identity(task_message))
+        if seen:
+            self.duplicate_count += 1
+            action = "résultat republié" if result_message is not None else "acquittée sans recalcul"
+            print(f"{Fore.YELLOW}♻️  Tâche {task_message['request_id'][:8]} relivrée mais déjà terminée: "
+                  f"{action}{Style.RESET_ALL}")
+        return seen, result_message
+    
+    def finish_task(self, task_message, result_message):
+        """Met à jour les compteurs et les caches, puis affiche le résultat"""
+        self.seen_tasks.add(message_identity(result_message), result_message)
+        if not is_batch_message(result_message) and not is_reduce_message(result_message) \
+                and not is_claim_message(result_message) and not is_matmul_message(result_message) \
+                and not result_message.get("cached"):
+            key = ResultCache.key(result_message["op"], task_message["n1"], task_message["n2"])
+            if self.result_cache is not None:
+                self.result_cache.put(key, result_message["result"])
+            if self.shared_cache is not None:
+                self.shared_cache.put(key, result_message["result"])
+        
+        if self.shared_counter is not None:
+            with self.shared_counter.get_lock():
+                self.shared_counter.value += result_message.get("count", 1)
+        
+        if is_reduce_message(result_message):
+            self.processed_count += result_message["count"]
+            self.operation_counts[result_message["op"]] += result_message["count"]
+            print(f"{Fore.GREEN}✅ Partition {task_message['partition'] + 1}/{task_message['partitions']} réduite: "
+                  f"{result_message['count']} valeurs '{result_message['op']}' = {result_message['result']} "
+                  f"(Total traité: {self.processed_count}){Style.RESET_ALL}")
+        elif is_claim_message(result_message):
+            self.processed_count += result_message["count"]
+            self.operation_counts[result_message["op"]] += result_message["count"]
+            print(f"{Fore.GREEN}✅ Plage {task_message['partition'] + 1}/{task_message['partitions']} calculée: "
+                  f"{result_message['count']} valeurs '{result_message['op']}' dans l'objet {result_message['out']} "
+                  f"(Total traité: {self.processed_count}){Style.RESET_ALL}")
+        elif is_matmul_message(result_message):
             self.processed_count += 1
-            print(f"{Fore.GREEN}✅ Calcul terminé: {task_message['n1']} {self.operation} {task_message['n2']} = {result} "
+            self.operation_counts[result_message["op"]] += 1
+            print(f"{Fore.GREEN}✅ Tuile {tuple(result_message['tile'])} calculée: "
+                  f"{result_message['rows']}x{result_message['cols']} (Total traité: {self.processed_count}){Style.RESET_ALL}")
+        elif is_batch_message(result_message):
+            self.processed_count += result_message["count"]
+            self.operation_counts[result_message["op"]] += result_message["count"]
+            print(f"{Fore.GREEN}✅ Lot terminé: {result_message['count']} calculs '{result_message['op']}' "
                   f"(Total traité: {self.processed_count}){Style.RESET_ALL}")
+        else:
+            self.processed_count += 1
+            self.operation_counts[result_message["op"]] += 1
+            print(f"{Fore.GREEN}✅ Calcul terminé: {task_message['n1']} {result_message['op']} {task_message['n2']} "
+                  f"= {result_message['result']} (Total traité: {self.processed_count}){Style.RESET_ALL}")
+    
+    def process_message(self, channel, method, properties, body, operation=None, lane=SHARED_LANE):
+        """
+        Traite un message de calcul
+
+        Le décodage a lieu sur le thread I/O de pika, le calcul sur le thread d'exécution:
+        la connexion continue ainsi à répondre aux heartbeats quelle que soit la durée de la tâche.
+        La tâche attend son tour dans la voie de sa queue; l'ordonnanceur choisit la suivante à exécuter.
+        """
+        try:
+            task_message = self.decode_task(properties, body, operation)
+        except Exception as e:
+            # Message illisible: inutile de réessayer, il part dans la queue de côté (dead-letter)
+            print(f"{Fore.RED}❌ Message illisible mis de côté: {e}{Style.RESET_ALL}")
+            channel.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
+            return
+        
+        if task_message is None:
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        
+        seen, result_message = self.replayed_result(method, task_message)
+        if seen:
+            try:
+                if result_message is not None:
+                    self.publish_result(channel, result_message, properties.content_type)
+                channel.basic_ack(delivery_tag=method.delivery_tag)
+            except Exception as e:
+                print(f"{Fore.RED}❌ Erreur lors de l'envoi du résultat: {e}{Style.RESET_ALL}")
+            return
+        
+        self.in_flight_counts[task_message["operation"]] += 1
+        
+        # Un résultat en cache est publié immédiatement, sans passer par le thread d'exécution
+        result_message = self.cached_result(task_message)
+        if result_message is not None:
+            self.complete_task(channel, method, properties, task_message, result_message)
+            return
+        
+        # Événement positionné par une annulation pour interrompre le calcul en cours
+        cancel_event = threading.Event()
+        self.running[method.delivery_tag] = (task_message["request_id"], cancel_event)
+        execute = functools.partial(self.execute_task, channel, method, properties, task_message, cancel_event)
+        self.scheduler.push(lane, (task_message["operation"], execute), task_cost(task_message))
+        self.dispatch()
+    
+    def can_start(self, scheduled):
+        """Indique si une tâche de l'ordonnanceur (opération, exécution) peut démarrer maintenant"""
+        return True
+    
+    def dispatch(self):
+        """Démarre les tâches choisies par l'ordonnanceur tant que le pool a des places libres (thread I/O)"""
+        while sum(self.executing.values()) < self.pool_size():
+            scheduled = self.scheduler.pop(self.can_start)
+            if scheduled is None:
+                return
+            _, (operation, execute) = scheduled
+            self.executing[operation] += 1
+            self.executor.submit(execute)
+    
+    def task_done(self, operation, callback):
+        """Fin d'exécution (thread I/O): termine la tâche puis libère sa place pour la suivante"""
+        self.executing[operation] -= 1
+        callback()
+        self.dispatch()
+    
+    def execute_task(self, channel, method, properties, task_message, cancel_event):
+        """Exécute la tâche sur le thread d'exécution puis rend la main au thread I/O pour publier et acquitter"""
+        service_start = time.monotonic()
+        if is_expired(task_message):
+            # Expirée pendant l'attente d'un thread d'exécution libre
+            callback = functools.partial(self.expire_task, channel, method, task_message)
+        elif cancel_event.is_set():
+            callback = functools.partial(self.cancel_task, channel, method, task_message)
+        else:
+            try:
+                channel.connection.add_callback_threadsafe(
+                    functools.partial(self.announce_start, channel, task_message))
+                processing_time = self.start_task(task_message)
+                
+                start_time = time.time()
+                interrupted = cancel_event.wait(processing_time)
+                actual_processing_time = time.time() - start_time
+                
+                if interrupted:
+                    callback = functools.partial(self.cancel_task, channel, method, task_message)
+                else:
+                    result_message = self.compute_result(task_message, actual_processing_time)
+                    callback = functools.partial(self.complete_task, channel, method, properties, task_message,
+                                                 result_message, time.monotonic() - service_start)
+                
+            except Exception as e:
+                print(f"{Fore.RED}❌ Erreur lors du traitement: {e}{Style.RESET_ALL}")
+                callback = functools.partial(self.reject_task, channel, method, properties, task_message, e)
+        
+        try:
+            # Connexion du canal de la livraison: après une reconnexion, le résultat d'une ancienne
+            # livraison n'est pas remis au nouveau thread I/O, dont les compteurs sont repartis de zéro
+            channel.connection.add_callback_threadsafe(
+                functools.partial(self.task_done, task_message["operation"], callback))
+        except Exception as e:
+            # Connexion fermée: le message non acquitté sera redistribué par le broker
+            print(f"{Fore.RED}❌ Impossible de renvoyer le résultat au thread I/O: {e}{Style.RESET_ALL}")
+    
+    def complete_task(self, channel, method, properties, task_message, result_message, service_time=None):
+        """Publie le résultat et acquitte la tâche (exécuté sur le thread I/O de pika)"""
+        try:
+            self.release_task(method, task_message)
+            self.publish_result(channel, result_message, properties.content_type)
+            self.finish_task(task_message, result_message)
             
             # Acquitter le message
             channel.basic_ack(delivery_tag=method.delivery_tag)
             
+            if self.prefetch_controller and service_time is not None:
+                self.prefetch_controller.record_service_time(service_time)
+                if self.prefetch_controller.maybe_adjust(channel):
+                    print(f"{Fore.CYAN}🔧 Prefetch ajusté: {self.prefetch_controller.describe()}{Style.RESET_ALL}")
+            
         except Exception as e:
-            print(f"{Fore.RED}❌ Erreur lors du traitement: {e}{Style.RESET_ALL}")
-            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            print(f"{Fore.RED}❌ Erreur lors de l'envoi du résultat: {e}{Style.RESET_ALL}")
+            self.retry_task(channel, method, properties, task_message, e)
+    
+    def release_task(self, method, task_message):
+        """Retire la tâche des tâches en cours (exécuté sur le thread I/O de pika)"""
+        self.in_flight_counts[task_message["operation"]] -= 1
+        self.running.pop(method.delivery_tag, None)
+    
+    def expire_task(self, channel, method, task_message):
+        """Acquitte sans la calculer une tâche expirée avant son exécution (exécuté sur le thread I/O de pika)"""
+        self.release_task(method, task_message)
+        self.count_expired(task_message)
+        if channel.is_open:
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+    
+    def cancel_task(self, channel, method, task_message):
+        """Acquitte sans résultat une tâche annulée avant ou pendant son calcul (exécuté sur le thread I/O de pika)"""
+        self.release_task(method, task_message)
+        self.count_cancelled(task_message)
+        if channel.is_open:
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+    
+    def reject_task(self, channel, method, properties, task_message, error):
+        """Tâche en échec sur le thread d'exécution (exécuté sur le thread I/O de pika)"""
+        self.release_task(method, task_message)
+        self.retry_task(channel, method, properties, task_message, error)
+    
+    def republish_failed_task(self, channel, properties, task_message, error):
+        """
+        Republie une tâche en échec dans le palier de retry correspondant à son nombre de tentatives
+        (en-tête x-attempts), ou dans la queue des messages mis de côté après MAX_TASK_ATTEMPTS,
+        au lieu de la remettre immédiatement en tête de queue; une tâche expirée est abandonnée
+
+        Renvoie False si rien n'a été publié (tâche expirée)
+        """
+        if is_expired(task_message):
+            self.count_expired(task_message)
+            return False
+        
+        operation = task_message["operation"]
+        headers = dict(properties.headers or {})
+        attempts = int(headers.get(TASK_ATTEMPTS_HEADER, 0)) + 1
+        headers[TASK_ATTEMPTS_HEADER] = attempts
+        headers[TASK_ERROR_HEADER] = str(error)[:200]
+        
+        if attempts >= MAX_TASK_ATTEMPTS:
+            routing_key = PARKED_QUEUES[operation]
+            print(f"{Fore.RED}🅿️  Tâche {task_message['request_id'][:8]} mise de côté après {attempts} "
+                  f"tentatives ({routing_key}){Style.RESET_ALL}")
+        else:
+            delay = retry_delay(attempts)
+            routing_key = retry_queue_name(operation, delay)
+            print(f"{Fore.YELLOW}🔁 Tâche {task_message['request_id'][:8]} réessayée dans {delay}s "
+                  f"(tentative {attempts}/{MAX_TASK_ATTEMPTS}){Style.RESET_ALL}")
+        
+        retry_properties = copy.copy(properties)
+        retry_properties.headers = headers
+        retry_properties.expiration = message_expiration(task_message)
+        channel.basic_publish(
+            exchange='',
+            routing_key=routing_key,
+            body=encode_task_message(task_message, properties.content_type),
+            properties=retry_properties
+        )
+        return True
+    
+    def retry_task(self, channel, method, properties, task_message, error):
+        """Envoie la tâche en échec vers son palier de retry puis l'acquitte"""
+        if not channel.is_open:
+            return  # Le message non acquitté sera redistribué par le broker
+        try:
+            self.republish_failed_task(channel, properties, task_message, error)
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de republier la tâche en échec: {e}{Style.RESET_ALL}")
+            if channel.is_open:
+                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+    
+    def prefetch_budget(self):
+        """Tâches non acquittées au plus sur tout le canal, toutes voies confondues: la taille du pool"""
+        return self.pool_size()
+    
+    def configure_consumers(self):
+        """Borne le canal au budget de prefetch (ou au prefetch adaptatif) et s'abonne aux voies de l'opération"""
+        if self.prefetch_controller:
+            self.prefetch_controller.apply(self.channel)
+            budget = self.prefetch_controller.maximum
+        else:
+            budget = self.prefetch_budget()
+            self.channel.basic_qos(prefetch_count=budget, global_qos=True)
+        self.consume_lanes(self.operation, budget)
+    
+    def lane_prefetch(self, lane, lanes, budget):
+        """
+        Part d'une voie dans le budget de prefetch: proportionnelle à son poids parmi `lanes`, au moins 1
+
+        Le canal reste borné au budget (global_qos): le worker ne garde pas plus de tâches d'avance
+        que son pool quel que soit le nombre de voies. Quand toutes les voies sont chargées, le broker
+        remet leurs tâches dans la proportion des poids, que l'ordonnanceur conserve.
+        """
+        weights = self.scheduler.weights
+        total = sum(weights.get(other, 1) for other in lanes)
+        return max(1, -(-budget * weights.get(lane, 1) // total))
+    
+    def consume_lanes(self, operation, budget):
+        """S'abonne à la queue partagée et aux sous-queues par source d'une opération (prefetch par voie)"""
+        lanes = task_lanes(operation)
+        for lane, queue_name in lanes:
+            self.channel.basic_qos(prefetch_count=self.lane_prefetch(lane, [name for name, _ in lanes], budget))
+            self.channel.basic_consume(
+                queue=queue_name,
+                on_message_callback=functools.partial(self.process_message, operation=operation, lane=lane)
+            )
     
     def start_consuming(self):
-        """Démarre l'écoute des messages"""
+        """
+        Démarre l'écoute des messages
+
+        Une connexion perdue est rétablie par le même worker: les tâches déjà terminées (seen_tasks)
+        sont conservées, si bien que les livraisons redistribuées par le broker ne sont pas recalculées.
+        """
+        self.load_state()
         if not self.connect_to_rabbitmq():
             return
         
-        # Configuration du consumer
-        task_queue = TASK_QUEUES[self.operation]
-        self.channel.basic_qos(prefetch_count=1)
-        self.channel.basic_consume(
-            queue=task_queue,
-            on_message_callback=self.process_message
+        try:
+            while True:
+                # Configuration du consumer et abonnement aux annulations
+                self.configure_consumers()
+                self.subscribe_control()
+                
+                task_queues = ', '.join(queue_name for operation in self.operations
+                                        for _, queue_name in task_lanes(operation))
+                print(f"{Fore.CYAN}👂 En écoute des messages sur '{task_queues}'...{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}   Pour arrêter, appuyez sur CTRL+C{Style.RESET_ALL}")
+                
+                try:
+                    self.channel.start_consuming()
+                    return
+                except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError) as e:
+                    print(f"{Fore.YELLOW}⚠️  Connexion perdue ({e!r}), reconnexion...{Style.RESET_ALL}")
+                    self.drop_connection_state()
+                    if not self.connect_to_rabbitmq():
+                        self.executor.shutdown(wait=False)
+                        self.save_state()
+                        return
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}⏹️  Arrêt du worker {self.worker_id}...{Style.RESET_ALL}")
+            if self.connection.is_open:
+                # Interruption possible pendant une reconnexion: la connexion est alors déjà fermée
+                self.channel.stop_consuming()
+                self.connection.close()
+            # Une tâche en cours non acquittée sera redistribuée par le broker
+            self.executor.shutdown(wait=False)
+            print(f"{Fore.GREEN}✅ Worker arrêté proprement. Total traité: {self.processed_count}{Style.RESET_ALL}")
+            if self.prefetch_controller:
+                print(f"{Fore.GREEN}   Prefetch adaptatif: {self.prefetch_controller.describe()}{Style.RESET_ALL}")
+            self.save_state()
+    
+    def drop_connection_state(self):
+        """
+        Oublie les livraisons du canal perdu, que le broker redistribuera (thread I/O)
+
+        Les tâches en cours sont interrompues et celles en attente dans l'ordonnanceur abandonnées;
+        les tâches déjà vues, les caches et les compteurs de résultats sont conservés.
+        """
+        for _, cancel_event in self.running.values():
+            cancel_event.set()
+        self.running.clear()
+        self.scheduler.clear()
+        self.executing.clear()
+        self.in_flight_counts.clear()
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+    
+    def load_state(self):
+        """Recharge l'état local persistant (cache des résultats) au démarrage"""
+        if self.result_cache is not None:
+            loaded = self.result_cache.load()
+            print(f"{Fore.CYAN}💾 Cache des résultats: {loaded} entrées rechargées{Style.RESET_ALL}")
+    
+    def save_state(self):
+        """Sauvegarde l'état local persistant à l'arrêt et affiche ses statistiques"""
+        for lane, waits in sorted(self.queue_waits.items()):
+            print(f"{Fore.GREEN}   Attente en queue [{lane}]: {waits.describe()}{Style.RESET_ALL}")
+        if self.scheduler.served:
+            print(f"{Fore.GREEN}   Ordonnanceur: {self.scheduler.describe()}{Style.RESET_ALL}")
+        if self.cancelled_count:
+            print(f"{Fore.GREEN}   Tâches annulées, non calculées: {self.cancelled_count}{Style.RESET_ALL}")
+        if self.expired_count:
+            print(f"{Fore.GREEN}   Tâches expirées, non calculées: {self.expired_count}{Style.RESET_ALL}")
+        if self.duplicate_count:
+            print(f"{Fore.GREEN}   Relivraisons déjà traitées, non recalculées: {self.duplicate_count}{Style.RESET_ALL}")
+        if self.result_cache is not None:
+            try:
+                self.result_cache.save()
+            except OSError as e:
+                print(f"{Fore.RED}❌ Impossible de sauvegarder le cache: {e}{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}   Cache: {self.result_cache.describe()}{Style.RESET_ALL}")
+        if self.shared_cache is not None:
+            print(f"{Fore.GREEN}   Cache partagé: {self.shared_cache.describe()}{Style.RESET_ALL}")
+            self.shared_cache.close()
+
+
+def operations_label(operations):
+    """Nom d'un ensemble d'opérations: 'all' pour les quatre, sinon 'add+mul'..."""
+    return ALL_OPERATION if set(operations) == set(OPERATIONS) else '+'.join(operations)
+
+
+class MultiOperationWorker(CalculationWorker):
+    """
+    Worker unique consommant les queues de plusieurs opérations
+
+    Les tâches partagent un même pool de threads. Le broker borne les tâches reçues pour tout
+    le canal (global_qos) et par voie (prefetch de chaque consumer); le worker applique un plafond
+    de tâches simultanées par opération, pour qu'une opération en rafale ne monopolise pas le pool.
+    """
+    
+    def __init__(self, operations, verbose: bool = False, threads: int = WORKER_THREADS,
+                 operation_limits=None, worker_id: str = None):
+        self.threads = threads
+        self.operation_limits = {op: min(limit, threads) for op, limit in (operation_limits or {}).items()}
+        super().__init__(operations_label(operations), verbose, worker_id)
+        self.operations = list(operations)
+    
+    def pool_size(self):
+        """Pool de threads partagé par toutes les opérations"""
+        return self.threads
+    
+    def can_start(self, scheduled):
+        """Une tâche ne démarre que si son opération est sous son plafond"""
+        operation, _ = scheduled
+        return self.executing[operation] < self.operation_limits.get(operation, self.threads)
+    
+    def configure_consumers(self):
+        """
+        Limite globale = taille du pool (ou prefetch adaptatif), puis un consumer par voie de chaque
+        opération, dont les parts se partagent le plafond de l'opération
+        """
+        if self.prefetch_controller:
+            self.prefetch_controller.apply(self.channel)
+            default_limit = self.prefetch_controller.maximum
+        else:
+            self.channel.basic_qos(prefetch_count=self.prefetch_budget(), global_qos=True)
+            default_limit = self.threads
+        for operation in self.operations:
+            self.consume_lanes(operation, self.operation_limits.get(operation, default_limit))
+    
+    def start_consuming(self):
+        """Démarre l'écoute puis affiche les compteurs par opération"""
+        super().start_consuming()
+        for operation in self.operations:
+            print(f"{Fore.GREEN}   {operation.upper()}: {self.operation_counts[operation]} calculs{Style.RESET_ALL}")
+
+
+class AckPipeline:
+    """
+    Confirmations d'éditeur et acquittements groupés pour un canal asynchrone
+
+    Chaque résultat publié est associé à la livraison de sa tâche. Une tâche n'est
+    acquittée qu'après la confirmation de son résultat par le broker: un résultat perdu
+    ne peut donc pas correspondre à une tâche acquittée. Les tâches confirmées sont
+    acquittées par groupes (multiple=True sur le plus long préfixe contigu) dès que
+    `max_batch` confirmations sont en attente ou après `max_delay` secondes.
+    """
+    
+    def __init__(self, channel, loop, max_batch: int = WORKER_ACK_BATCH_SIZE,
+                 max_delay: float = WORKER_ACK_MAX_DELAY):
+        self.channel = channel
+        self.loop = loop
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pending = set()      # livraisons non encore acquittées
+        self.confirmed = set()    # livraisons dont le résultat est confirmé
+        self.unconfirmed = {}     # numéro de publication -> livraison
+        self.publish_seq = 0
+        self.timer = None
+        self.stats = defaultdict(int)
+    
+    def register(self, delivery_tag: int):
+        """Enregistre une livraison dès sa réception (avant tout acquittement groupé)"""
+        self.pending.add(delivery_tag)
+    
+    def discard(self, delivery_tag: int):
+        """Retire une livraison acquittée ou rejetée individuellement par l'appelant"""
+        self.pending.discard(delivery_tag)
+        self.confirmed.discard(delivery_tag)
+    
+    def published(self, delivery_tag: int):
+        """Associe le prochain numéro de publication du canal à la livraison"""
+        self.publish_seq += 1
+        self.unconfirmed[self.publish_seq] = delivery_tag
+    
+    def reserve(self):
+        """
+        Consomme le numéro de publication d'un message sans livraison associée (ex. événement de
+        démarrage): le broker confirme toutes les publications du canal, sans cela les numéros
+        suivants seraient décalés et une tâche acquittée sur la confirmation d'un autre message
+        """
+        self.publish_seq += 1
+    
+    def on_confirm(self, frame):
+        """Callback de confirmation (Basic.Ack / Basic.Nack) du broker"""
+        method = frame.method
+        if method.multiple:
+            sequences = [seq for seq in self.unconfirmed if seq <= method.delivery_tag]
+        else:
+            sequences = [method.delivery_tag]
+        
+        for seq in sequences:
+            delivery_tag = self.unconfirmed.pop(seq, None)
+            if delivery_tag is None:
+                continue
+            if isinstance(method, Basic.Ack):
+                self.confirmed.add(delivery_tag)
+                self.stats['confirmed'] += 1
+            else:
+                # Résultat refusé par le broker: la tâche est remise dans la queue
+                self.stats['result_nacks'] += 1
+                self.discard(delivery_tag)
+                if self.channel.is_open:
+                    self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+        
+        if len(self.confirmed) >= self.max_batch:
+            self.flush()
+        elif self.confirmed and self.timer is None:
+            self.timer = self.loop.call_later(self.max_delay, self.flush)
+    
+    def flush(self):
+        """Acquitte les livraisons confirmées: un ack multiple pour le préfixe contigu, le reste un par un"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.confirmed or not self.channel.is_open:
+            return
+        
+        outstanding = self.pending - self.confirmed
+        floor = min(outstanding) if outstanding else None
+        prefix = [tag for tag in self.confirmed if floor is None or tag < floor]
+        if prefix:
+            self.channel.basic_ack(delivery_tag=max(prefix), multiple=True)
+            self.stats['acks_sent'] += 1
+            self.stats['acked'] += len(prefix)
+            for tag in prefix:
+                self.discard(tag)
+        
+        for tag in sorted(self.confirmed):
+            self.channel.basic_ack(delivery_tag=tag)
+            self.stats['acks_sent'] += 1
+            self.stats['acked'] += 1
+            self.discard(tag)
+
+
+class AsyncCalculationWorker(CalculationWorker):
+    """
+    Worker asyncio: garde jusqu'à `concurrency` tâches en cours dans un seul processus
+
+    Le broker borne les tâches reçues par voie via basic_qos(prefetch_count), l'ordonnanceur
+    en démarre au plus `concurrency` à la fois; chaque tâche attend son temps de traitement
+    sans bloquer les autres.
+    """
+    
+    def __init__(self, operation: str, verbose: bool = False, concurrency: int = WORKER_ASYNC_CONCURRENCY,
+                 worker_id: str = None, pipeline: bool = False,
+                 ack_batch_size: int = WORKER_ACK_BATCH_SIZE, ack_max_delay: float = WORKER_ACK_MAX_DELAY):
+        super().__init__(operation, verbose, worker_id)
+        self.concurrency = concurrency
+        self.pipeline = pipeline
+        self.ack_batch_size = ack_batch_size
+        self.ack_max_delay = ack_max_delay
+        self.ack_pipeline = None
+        self.loop = None
+        self.in_flight = set()
+        self.closed = None
+    
+    def _call(self, method, *args, callback_name='callback', **kwargs):
+        """Appelle une méthode pika asynchrone et renvoie un future résolu par son callback"""
+        future = self.loop.create_future()
+        
+        def on_done(result):
+            if not future.done():
+                future.set_result(result)
+        
+        kwargs[callback_name] = on_done
+        method(*args, **kwargs)
+        return future
+    
+    async def _open_connection(self):
+        """Ouvre une connexion AsyncioConnection et attend qu'elle soit prête"""
+        opened = self.loop.create_future()
+        
+        def on_open(connection):
+            if not opened.done():
+                opened.set_result(connection)
+        
+        def on_open_error(connection, error):
+            if not opened.done():
+                opened.set_exception(error if isinstance(error, Exception) else Exception(str(error)))
+        
+        def on_close(connection, reason):
+            if not self.closed.done():
+                self.closed.set_result(reason)
+        
+        AsyncioConnection(
+            self.connection_parameters(),
+            on_open_callback=on_open,
+            on_open_error_callback=on_open_error,
+            on_close_callback=on_close,
+            custom_ioloop=self.loop
         )
+        return await opened
+    
+    async def connect_async(self):
+        """Établit la connexion asynchrone et déclare la topologie"""
+        max_retries = 5
+        for attempt in range(max_retries):
+            try:
+                self.closed = self.loop.create_future()
+                self.connection = await self._open_connection()
+                self.channel = await self._call(self.connection.channel, callback_name='on_open_callback')
+                
+                # Déclarer les queues, l'exchange "all" et la liaison, les paliers de retry
+                # et la queue des messages mis de côté
+                for method, arguments in topology_declarations(self.operations):
+                    await self._call(getattr(self.channel, method), **arguments)
+                
+                # Mode pipeline: confirmations d'éditeur suivies de façon asynchrone
+                if self.pipeline:
+                    self.ack_pipeline = AckPipeline(self.channel, self.loop, self.ack_batch_size, self.ack_max_delay)
+                    await self._call(self.channel.confirm_delivery, ack_nack_callback=self.ack_pipeline.on_confirm)
+                
+                print(f"{Fore.CYAN}✅ Connexion asynchrone à RabbitMQ établie{Style.RESET_ALL}")
+                return True
+                
+            except Exception as e:
+                print(f"{Fore.YELLOW}⚠️  Tentative {attempt + 1}/{max_retries} échouée: {e}{Style.RESET_ALL}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2)
+        
+        print(f"{Fore.RED}❌ Impossible de se connecter à RabbitMQ après {max_retries} tentatives{Style.RESET_ALL}")
+        return False
+    
+    def prefetch_budget(self):
+        """
+        Concurrence, plus en mode pipeline un lot d'acquittements: une tâche terminée reste
+        non acquittée jusqu'à la confirmation de son résultat
+        """
+        return self.concurrency + (self.ack_batch_size if self.pipeline else 0)
+    
+    def on_message(self, channel, method, properties, body, lane=SHARED_LANE):
+        """
+        Callback pika: décode la tâche, la met en attente dans sa voie avec son coût (comme le worker
+        à threads) et démarre les suivantes sans bloquer la boucle
+        """
+        try:
+            task_message = self.decode_task(properties, body)
+        except Exception as e:
+            # Message illisible: directement dans la queue de côté (dead-letter)
+            print(f"{Fore.RED}❌ Message illisible mis de côté: {e}{Style.RESET_ALL}")
+            channel.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
+            return
+        
+        if task_message is None:
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        
+        if self.ack_pipeline:
+            self.ack_pipeline.register(method.delivery_tag)
+        process = functools.partial(self.process_message_async, channel, method, properties, task_message)
+        self.scheduler.push(lane, (self.operation, process), task_cost(task_message))
+        self.dispatch()
+    
+    def dispatch(self):
+        """Lance les tâches choisies par l'ordonnanceur tant que la concurrence le permet"""
+        while len(self.in_flight) < self.concurrency:
+            scheduled = self.scheduler.pop()
+            if scheduled is None:
+                return
+            _, (_, process) = scheduled
+            task = self.loop.create_task(process())
+            self.in_flight.add(task)
+            task.add_done_callback(self.on_task_done)
+    
+    def on_task_done(self, task):
+        """Libère la place de la tâche terminée pour la suivante (sauf à l'arrêt)"""
+        self.in_flight.discard(task)
+        if not self.closed.done():
+            self.dispatch()
+    
+    async def process_message_async(self, channel, method, properties, task_message):
+        """Traite une tâche décodée en attendant le temps de traitement sans bloquer"""
+        try:
+            seen, result_message = self.replayed_result(method, task_message)
+            if seen and result_message is None:
+                self.ack_now(channel, method)
+                return
+            
+            if not seen:
+                result_message = self.cached_result(task_message)
+            if result_message is None:
+                if is_expired(task_message):
+                    # Expirée pendant son attente dans l'ordonnanceur
+                    self.count_expired(task_message)
+                    self.ack_now(channel, method)
+                    return
+                if self.is_cancelled(task_message["request_id"]):
+                    # Annulée pendant son attente dans l'ordonnanceur
+                    self.count_cancelled(task_message)
+                    self.ack_now(channel, method)
+                    return
+                self.announce_start(channel, task_message)
+                processing_time = self.start_task(task_message)
+                
+                # Attente interruptible par une annulation reçue sur l'exchange de contrôle
+                cancel_event = asyncio.Event()
+                self.running[method.delivery_tag] = (task_message["request_id"], cancel_event)
+                start_time = time.time()
+                try:
+                    await asyncio.wait_for(cancel_event.wait(), processing_time)
+                    interrupted = True
+                except asyncio.TimeoutError:
+                    interrupted = False
+                finally:
+                    self.running.pop(method.delivery_tag, None)
+                actual_processing_time = time.time() - start_time
+                
+                if interrupted:
+                    self.count_cancelled(task_message)
+                    self.ack_now(channel, method)
+                    return
+                
+                result_message = self.compute_result(task_message, actual_processing_time)
+            
+            self.publish_result(channel, result_message, properties.content_type)
+            if not seen:
+                self.finish_task(task_message, result_message)
+            
+            if self.ack_pipeline:
+                # Acquittement différé jusqu'à la confirmation du résultat
+                self.ack_pipeline.published(method.delivery_tag)
+            else:
+                channel.basic_ack(delivery_tag=method.delivery_tag)
+            
+        except Exception as e:
+            print(f"{Fore.RED}❌ Erreur lors du traitement: {e}{Style.RESET_ALL}")
+            self.retry_task(channel, method, properties, task_message, e)
+    
+    def retry_task(self, channel, method, properties, task_message, error):
+        """Envoie la tâche en échec vers son palier de retry; en mode pipeline, l'acquittement attend sa confirmation"""
+        if not self.ack_pipeline:
+            super().retry_task(channel, method, properties, task_message, error)
+            return
+        
+        if not channel.is_open:
+            self.ack_pipeline.discard(method.delivery_tag)
+            return
+        try:
+            if self.republish_failed_task(channel, properties, task_message, error):
+                self.ack_pipeline.published(method.delivery_tag)
+            else:
+                # Aucune publication à confirmer: acquittement immédiat, hors séquence des confirmations
+                self.ack_now(channel, method)
+        except Exception as e:
+            print(f"{Fore.RED}❌ Impossible de republier la tâche en échec: {e}{Style.RESET_ALL}")
+            self.ack_pipeline.discard(method.delivery_tag)
+            if channel.is_open:
+                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+    
+    def announce_start(self, channel, task_message):
+        """Annonce le démarrage; en mode pipeline, l'événement réserve son numéro de confirmation"""
+        published = super().announce_start(channel, task_message)
+        if published and self.ack_pipeline:
+            self.ack_pipeline.reserve()
+        return published
+    
+    def ack_now(self, channel, method):
+        """Acquitte immédiatement une livraison qui ne produit pas de résultat"""
+        if self.ack_pipeline:
+            self.ack_pipeline.discard(method.delivery_tag)
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+    
+    async def consume(self):
+        """
+        Démarre la consommation asynchrone; une connexion perdue est rétablie par le même worker,
+        qui garde ainsi ses tâches déjà terminées (seen_tasks) pour les livraisons redistribuées
+        """
+        self.loop = asyncio.get_running_loop()
+        while await self.connect_async():
+            await self.consume_connection()
+            print(f"{Fore.YELLOW}⚠️  Connexion perdue ({self.closed.result()!r}), reconnexion...{Style.RESET_ALL}")
+    
+    async def consume_connection(self):
+        """Consomme sur la connexion ouverte jusqu'à sa fermeture, puis oublie ses livraisons"""
+        budget = self.prefetch_budget()
+        await self._call(self.channel.basic_qos, prefetch_count=budget, global_qos=True)
+        lanes = task_lanes(self.operation)
+        for lane, queue_name in lanes:
+            await self._call(self.channel.basic_qos,
+                             prefetch_count=self.lane_prefetch(lane, [name for name, _ in lanes], budget))
+            self.channel.basic_consume(queue=queue_name,
+                                       on_message_callback=functools.partial(self.on_message, lane=lane))
         
-        print(f"{Fore.CYAN}👂 En écoute des messages sur la queue '{task_queue}'...{Style.RESET_ALL}")
+        # Annulations diffusées à tous les workers
+        control = await self._call(self.channel.queue_declare, queue='', exclusive=True)
+        await self._call(self.channel.queue_bind, queue=control.method.queue, exchange=CONTROL_EXCHANGE)
+        self.channel.basic_consume(queue=control.method.queue, on_message_callback=self.on_control_message,
+                                   auto_ack=True)
+        
+        task_queues = ', '.join(queue_name for _, queue_name in task_lanes(self.operation))
+        print(f"{Fore.CYAN}👂 En écoute asynchrone sur '{task_queues}' "
+              f"({self.concurrency} tâches simultanées max)...{Style.RESET_ALL}")
         print(f"{Fore.CYAN}   Pour arrêter, appuyez sur CTRL+C{Style.RESET_ALL}")
         
         try:
-            self.channel.start_consuming()
+            await self.closed
+        finally:
+            # Les livraisons en cours ou en attente seront redistribuées par le broker
+            self.scheduler.clear()
+            for task in list(self.in_flight):
+                task.cancel()
+            if self.ack_pipeline:
+                self.ack_pipeline.flush()
+                stats = self.ack_pipeline.stats
+                print(f"{Fore.CYAN}📊 Pipeline: {stats['confirmed']} résultats confirmés, "
+                      f"{stats['acked']} tâches acquittées en {stats['acks_sent']} acquittements, "
+                      f"{stats['result_nacks']} résultats refusés{Style.RESET_ALL}")
+            if self.connection.is_open:
+                self.connection.close()
+        
+        # Attendre la fin des tâches annulées avant que de nouvelles livraisons réutilisent leurs numéros
+        await asyncio.gather(*self.in_flight, return_exceptions=True)
+        self.running.clear()
+    
+    def start_consuming(self):
+        """Démarre la boucle asyncio du worker"""
+        self.load_state()
+        try:
+            asyncio.run(self.consume())
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}⏹️  Arrêt du worker {self.worker_id}...{Style.RESET_ALL}")
-            self.channel.stop_consuming()
-            self.connection.close()
-            print(f"{Fore.GREEN}✅ Worker arrêté proprement. Total traité: {self.processed_count}{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}✅ Worker arrêté. Total traité: {self.processed_count} "
+                  f"(tâches en cours non acquittées seront redistribuées){Style.RESET_ALL}")
+            self.save_state()
+
+
+def build_worker(args, worker_id=None):
+    """Construit le worker correspondant aux options de la ligne de commande"""
+    if args.ops:
+        worker = MultiOperationWorker(args.ops, args.verbose, args.threads, args.op_limits, worker_id)
+    elif args.async_mode:
+        worker = AsyncCalculationWorker(args.operation, args.verbose, args.concurrency, worker_id,
+                                        args.pipeline, args.ack_batch_size, args.ack_max_delay)
+    else:
+        worker = CalculationWorker(args.operation, args.verbose, worker_id)
+    
+    if args.weights:
+        worker.scheduler = DeficitRoundRobin(lane_weights(args.weights))
+    if args.adaptive_prefetch:
+        worker.prefetch_controller = build_prefetch_controller(worker)
+    if args.cache_size > 0:
+        worker.result_cache = ResultCache(args.cache_size, args.cache_ttl, args.cache_file)
+    if args.shared_cache:
+        worker.shared_cache = SharedResultCache(args.shared_cache, SHARED_CACHE_SIZE, args.cache_ttl)
+    return worker
+
+
+def build_prefetch_controller(worker):
+    """Contrôleur de prefetch adaptatif dimensionné sur le pool du worker"""
+    return PrefetchController(
+        concurrency=worker.pool_size(),
+        minimum=PREFETCH_MIN,
+        maximum=PREFETCH_MAX,
+        interval=PREFETCH_ADJUST_INTERVAL
+    )
+
+
+def run_supervised_worker(args, worker_id, shared_counter):
+    """Point d'entrée d'un processus enfant du superviseur"""
+    # Gestionnaires hérités du superviseur remplacés: CTRL+C comme SIGTERM (envoyé par le superviseur)
+    # interrompent le worker, qui s'arrête proprement (état sauvegardé, tâches non acquittées redistribuées)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    worker = build_worker(args, worker_id)
+    worker.shared_counter = shared_counter
+    try:
+        worker.start_consuming()
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerSupervisor:
+    """
+    Superviseur prefork: lance N processus workers et redémarre ceux qui s'arrêtent
+
+    Chaque enfant a sa propre connexion et un worker_id stable (suffixe = numéro d'emplacement,
+    conservé au redémarrage). Un emplacement dont le processus s'arrête à répétition est redémarré
+    avec un délai doublé à chaque fois (plafonné), pour ne pas boucler sur un broker indisponible.
+    Les compteurs de chaque emplacement sont partagés avec le superviseur, qui affiche le total à l'arrêt.
+    """
+    
+    # Intervalle (secondes) entre deux vérifications des enfants et délai de grâce d'un enfant à l'arrêt
+    CHECK_INTERVAL = 1
+    STOP_TIMEOUT = 10
+    
+    def __init__(self, args, processes: int):
+        self.args = args
+        self.processes = processes
+        label = operations_label(args.ops) if args.ops else args.operation
+        self.base_id = f"worker_{label}_{random.randint(1000, 9999)}"
+        self.children = {}
+        self.counters = [multiprocessing.Value('q', 0) for _ in range(processes)]
+        self.restart_count = 0
+        # Par emplacement: arrêts consécutifs, démarrage du processus courant, redémarrage prévu
+        self.failures = [0] * processes
+        self.started_at = [0.0] * processes
+        self.restart_at = {}
+        self.stopping = False
+        self.stop_signal = None
+        
+        print(f"{Fore.GREEN}🚀 Superviseur {self.base_id} démarré avec {processes} processus{Style.RESET_ALL}")
+    
+    def start_child(self, slot: int):
+        """Démarre (ou redémarre) le processus de l'emplacement donné"""
+        process = multiprocessing.Process(
+            target=run_supervised_worker,
+            args=(self.args, f"{self.base_id}_{slot}", self.counters[slot]),
+            name=f"{self.base_id}_{slot}"
+        )
+        process.start()
+        self.children[slot] = process
+        self.started_at[slot] = time.monotonic()
+    
+    def restart_delay(self, slot: int) -> float:
+        """Délai avant le redémarrage de l'emplacement: doublé à chaque arrêt consécutif, plafonné"""
+        if time.monotonic() - self.started_at[slot] >= WORKER_SUPERVISOR_MAX_RESTART_DELAY:
+            self.failures[slot] = 0  # Processus resté stable: l'arrêt n'est pas une rechute
+        delay = min(WORKER_SUPERVISOR_RESTART_DELAY * 2 ** self.failures[slot], WORKER_SUPERVISOR_MAX_RESTART_DELAY)
+        self.failures[slot] += 1
+        return delay
+    
+    def on_signal(self, signum, frame):
+        """SIGTERM / SIGINT: arrêt du superviseur et de ses enfants à la prochaine vérification"""
+        self.stopping = True
+        self.stop_signal = signum
+    
+    def run(self):
+        """Démarre les enfants et les surveille jusqu'à CTRL+C ou SIGTERM"""
+        signal.signal(signal.SIGINT, self.on_signal)
+        signal.signal(signal.SIGTERM, self.on_signal)
+        for slot in range(self.processes):
+            self.start_child(slot)
+        
+        try:
+            while not self.stopping:
+                time.sleep(self.CHECK_INTERVAL)
+                now = time.monotonic()
+                for slot, process in list(self.children.items()):
+                    if self.stopping or process.is_alive():
+                        continue
+                    if slot not in self.restart_at:
+                        delay = self.restart_delay(slot)
+                        self.restart_at[slot] = now + delay
+                        print(f"{Fore.YELLOW}⚠️  Processus {process.name} arrêté (code {process.exitcode}), "
+                              f"redémarrage dans {delay:g}s...{Style.RESET_ALL}")
+                    elif now >= self.restart_at[slot]:
+                        del self.restart_at[slot]
+                        self.restart_count += 1
+                        self.start_child(slot)
+            print(f"\n{Fore.YELLOW}⏹️  Arrêt du superviseur {self.base_id}...{Style.RESET_ALL}")
+        finally:
+            self.stop()
+    
+    def stop(self):
+        """
+        Arrête les enfants et affiche le total
+
+        CTRL+C est transmis par le terminal à tout le groupe de processus: les enfants s'arrêtent déjà
+        et disposent d'un délai de grâce. Un SIGTERM (ou un SIGINT adressé au seul superviseur) est
+        ensuite relayé aux enfants encore en vie; un enfant qui ne s'arrête toujours pas est tué.
+        """
+        if self.stop_signal == signal.SIGINT:
+            for process in self.children.values():
+                process.join(timeout=self.STOP_TIMEOUT)
+        for process in self.children.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.children.values():
+            process.join(timeout=self.STOP_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        
+        total = sum(counter.value for counter in self.counters)
+        print(f"{Fore.GREEN}✅ Superviseur arrêté. Total traité par {self.processes} processus: {total} "
+              f"(redémarrages: {self.restart_count}){Style.RESET_ALL}")
+        for slot, counter in enumerate(self.counters):
+            print(f"{Fore.GREEN}   {self.base_id}_{slot}: {counter.value}{Style.RESET_ALL}")
+
+
+def parse_processes(value):
+    """Analyse --processes: un entier positif ou 'auto' (os.cpu_count())"""
+    if value == 'auto':
+        return os.cpu_count() or 1
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f"Nombre de processus invalide: {value}")
+    return int(value)
+
+
+def parse_operations(value):
+    """Analyse --ops: liste séparée par des virgules ou 'all'"""
+    if value == ALL_OPERATION:
+        return list(OPERATIONS)
+    operations = [op.strip() for op in value.split(',') if op.strip()]
+    for operation in operations:
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Opération non supportée: {operation}")
+    return operations
+
+
+def parse_operation_limits(value):
+    """Analyse --op-limits: ex. 'add=2,mul=8'"""
+    limits = {}
+    for item in value.split(','):
+        operation, _, limit = item.partition('=')
+        if operation not in OPERATIONS or not limit.isdigit() or int(limit) < 1:
+            raise argparse.ArgumentTypeError(f"Limite invalide: {item} (format: op=N)")
+        limits[operation] = int(limit)
+    return limits
+
+
+def parse_lane_weights(value):
+    """Analyse --weights: ex. 'web=4,auto=1,shared=2' (même syntaxe que TASK_SOURCE_WEIGHTS)"""
+    try:
+        return parse_source_weights(value, '--weights')
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
 def main():
     parser = argparse.ArgumentParser(description='Worker pour calculs distribués')
-    parser.add_argument('operation', choices=['add', 'sub', 'mul', 'div'],
+    parser.add_argument('operation', nargs='?', choices=list(OPERATIONS),
                         help='Type d\'opération à traiter')
+    parser.add_argument('--ops', type=parse_operations,
+                        help='Plusieurs opérations dans un seul processus (ex: add,sub ou all)')
+    parser.add_argument('--threads', type=int, default=WORKER_THREADS,
+                        help=f'Taille du pool de threads partagé avec --ops (défaut: {WORKER_THREADS})')
+    parser.add_argument('--op-limits', type=parse_operation_limits, default={},
+                        help='Plafond de tâches simultanées par opération avec --ops (ex: add=2,mul=8)')
     parser.add_argument('--verbose', action='store_true',
                         help='Mode verbose avec plus de détails')
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help='Mode asyncio avec plusieurs tâches simultanées par processus')
+    parser.add_argument('--concurrency', type=int, default=WORKER_ASYNC_CONCURRENCY,
+                        help=f'Nombre de tâches simultanées en mode --async (défaut: {WORKER_ASYNC_CONCURRENCY})')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Confirmations d\'éditeur et acquittements groupés (implique --async)')
+    parser.add_argument('--ack-batch-size', type=int, default=WORKER_ACK_BATCH_SIZE,
+                        help=f'Taille max d\'un groupe d\'acquittements en mode --pipeline (défaut: {WORKER_ACK_BATCH_SIZE})')
+    parser.add_argument('--ack-max-delay', type=float, default=WORKER_ACK_MAX_DELAY,
+                        help=f'Délai max (s) avant acquittement en mode --pipeline (défaut: {WORKER_ACK_MAX_DELAY})')
+    parser.add_argument('--adaptive-prefetch', action='store_true',
+                        help='Ajuster le prefetch selon le temps de service et la latence du broker')
+    parser.add_argument('--cache-size', type=int, default=WORKER_CACHE_SIZE,
+                        help=f'Taille du cache local des résultats, 0 pour désactiver (défaut: {WORKER_CACHE_SIZE})')
+    parser.add_argument('--cache-ttl', type=float, default=WORKER_CACHE_TTL,
+                        help=f'Durée de vie (s) des résultats en cache (défaut: {WORKER_CACHE_TTL})')
+    parser.add_argument('--cache-file', default=WORKER_CACHE_FILE,
+                        help='Fichier de sauvegarde du cache pour un redémarrage à chaud')
+    parser.add_argument('--shared-cache', nargs='?', const=SHARED_CACHE_PATH, default=None, metavar='FICHIER',
+                        help=f'Cache SQLite partagé entre les workers de l\'hôte (défaut: {SHARED_CACHE_PATH})')
+    parser.add_argument('--weights', type=parse_lane_weights, default={},
+                        help='Poids du tourniquet entre les voies (ex: web=4,auto=1,shared=2; défaut: TASK_SOURCE_WEIGHTS)')
+    parser.add_argument('--processes', type=parse_processes, default=1,
+                        help='Nombre de processus workers sous un superviseur prefork, ou "auto" (un par cœur)')
     
     args = parser.parse_args()
     
-    worker = CalculationWorker(args.operation, args.verbose)
-    worker.start_consuming()
+    if args.pipeline:
+        # Les confirmations asynchrones nécessitent l'adaptateur asyncio
+        args.async_mode = True
+    if (args.operation is None) == (args.ops is None):
+        parser.error("indiquer soit une opération, soit --ops")
+    if args.ops and args.async_mode:
+        parser.error("--ops n'est pas disponible en mode --async")
+    if args.adaptive_prefetch and args.async_mode:
+        parser.error("--adaptive-prefetch n'est pas disponible en mode --async (prefetch = --concurrency)")
+    
+    if args.processes > 1:
+        WorkerSupervisor(args, args.processes).run()
+    else:
+        build_worker(args).start_consuming()
 
 
 if __name__ == '__main__':
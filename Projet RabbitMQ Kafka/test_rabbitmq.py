@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config.rabbitmq_config import *
 from utils.message_utils import *
+from utils.topology import declare_topology
 
 def test_rabbitmq():
     print("🔧 Test de connectivité RabbitMQ...")
@@ -28,8 +29,8 @@ def test_rabbitmq():
         print("✅ Connexion RabbitMQ réussie")
         
         # Déclarer les queues
+        declare_topology(channel, TASK_QUEUES)
         for operation, queue_name in TASK_QUEUES.items():
-            channel.queue_declare(queue=queue_name, durable=True)
             print(f"✅ Queue {queue_name} déclarée")
         
         # Envoyer une tâche test
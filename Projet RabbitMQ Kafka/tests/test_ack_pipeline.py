@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests des acquittements groupés après confirmation des résultats (sans broker)
+Usage: python tests/test_ack_pipeline.py
+"""
+
+import sys
+import os
+import unittest
+from types import SimpleNamespace
+
+# Ajouter le répertoire parent (et src) au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from pika.spec import Basic
+
+from src.worker import AckPipeline, AsyncCalculationWorker
+from utils.message_utils import create_task_message
+
+
+class FakeChannel:
+    """Canal qui enregistre les acquittements et les publications"""
+
+    is_open = True
+
+    def __init__(self):
+        self.acks = []
+        self.nacks = []
+        self.published = []
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self.nacks.append((delivery_tag, requeue))
+
+    def basic_publish(self, **kwargs):
+        self.published.append(kwargs)
+
+
+class FakeLoop:
+    """Boucle dont les minuteries ne se déclenchent que sur demande"""
+
+    def __init__(self):
+        self.timers = []
+
+    def call_later(self, delay, callback):
+        timer = SimpleNamespace(callback=callback, cancelled=False)
+        timer.cancel = lambda: setattr(timer, 'cancelled', True)
+        self.timers.append(timer)
+        return timer
+
+    def fire(self):
+        for timer in self.timers:
+            if not timer.cancelled:
+                timer.callback()
+        self.timers.clear()
+
+
+def confirm(pipeline, sequence, multiple=False, ack=True):
+    method = (Basic.Ack if ack else Basic.Nack)(delivery_tag=sequence, multiple=multiple)
+    pipeline.on_confirm(SimpleNamespace(method=method))
+
+
+class AckPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.channel = FakeChannel()
+        self.loop = FakeLoop()
+
+    def pipeline(self, max_batch=100):
+        return AckPipeline(self.channel, self.loop, max_batch=max_batch, max_delay=0.1)
+
+    def publish(self, pipeline, *tags):
+        """Livraisons reçues puis résultats publiés, dans l'ordre donné"""
+        for tag in tags:
+            pipeline.register(tag)
+        for tag in tags:
+            pipeline.published(tag)
+
+    def test_single_confirm_waits_for_batch_or_timer(self):
+        pipeline = self.pipeline(max_batch=2)
+        self.publish(pipeline, 1, 2)
+        confirm(pipeline, 1)
+        self.assertEqual(self.channel.acks, [])
+        self.assertEqual(len(self.loop.timers), 1)
+
+        # Délai écoulé: la tâche confirmée est acquittée, l'autre attend sa confirmation
+        self.loop.fire()
+        self.assertEqual(self.channel.acks, [(1, True)])
+        confirm(pipeline, 2)
+        self.loop.fire()
+        self.assertEqual(self.channel.acks, [(1, True), (2, True)])
+        self.assertEqual(pipeline.stats['confirmed'], 2)
+
+    def test_full_batch_is_acked_at_once(self):
+        pipeline = self.pipeline(max_batch=3)
+        self.publish(pipeline, 1, 2, 3)
+        for sequence in (1, 2, 3):
+            confirm(pipeline, sequence)
+        self.assertEqual(self.channel.acks, [(3, True)])
+        self.assertEqual((pipeline.stats['acked'], pipeline.stats['acks_sent']), (3, 1))
+        self.assertTrue(all(timer.cancelled for timer in self.loop.timers))
+
+    def test_multiple_confirm_covers_earlier_publishes(self):
+        pipeline = self.pipeline(max_batch=3)
+        self.publish(pipeline, 1, 2, 3, 4)
+        confirm(pipeline, 3, multiple=True)
+        self.assertEqual(self.channel.acks, [(3, True)])
+        self.assertEqual(pipeline.unconfirmed, {4: 4})
+
+    def test_ack_floor_stops_at_unconfirmed_delivery(self):
+        pipeline = self.pipeline()
+        self.publish(pipeline, 1, 2, 3, 4)
+        confirm(pipeline, 1)
+        confirm(pipeline, 3)
+        confirm(pipeline, 4)
+        pipeline.flush()
+        # 2 non confirmée: ack multiple jusqu'à 1, puis 3 et 4 un par un
+        self.assertEqual(self.channel.acks, [(1, True), (3, False), (4, False)])
+        self.assertEqual(pipeline.pending, {2})
+
+    def test_results_confirmed_out_of_delivery_order(self):
+        pipeline = self.pipeline()
+        for tag in (1, 2, 3):
+            pipeline.register(tag)
+        # Résultats publiés dans l'ordre 3, 1, 2 (tâches de durées différentes)
+        for tag in (3, 1, 2):
+            pipeline.published(tag)
+        confirm(pipeline, 1)  # résultat de la livraison 3
+        pipeline.flush()
+        self.assertEqual(self.channel.acks, [(3, False)])
+        confirm(pipeline, 3, multiple=True)
+        pipeline.flush()
+        self.assertEqual(self.channel.acks, [(3, False), (2, True)])
+
+    def test_nack_requeues_only_its_delivery(self):
+        pipeline = self.pipeline()
+        self.publish(pipeline, 1, 2, 3)
+        confirm(pipeline, 2, ack=False)
+        self.assertEqual(self.channel.nacks, [(2, True)])
+        self.assertEqual(pipeline.stats['result_nacks'], 1)
+        confirm(pipeline, 3, multiple=True)
+        pipeline.flush()
+        # La livraison refusée ne bloque pas l'ack multiple des autres
+        self.assertEqual(self.channel.acks, [(3, True)])
+        self.assertEqual(pipeline.pending, set())
+
+    def test_multiple_nack_requeues_every_covered_delivery(self):
+        pipeline = self.pipeline()
+        self.publish(pipeline, 5, 6, 7)
+        confirm(pipeline, 2, multiple=True, ack=False)
+        self.assertEqual(self.channel.nacks, [(5, True), (6, True)])
+        self.assertEqual(self.channel.acks, [])
+        self.assertEqual(pipeline.pending, {7})
+
+    def test_discarded_delivery_does_not_hold_the_floor(self):
+        pipeline = self.pipeline()
+        self.publish(pipeline, 2, 3)
+        pipeline.register(1)
+        pipeline.discard(1)  # acquittée immédiatement par l'appelant (ex. tâche expirée)
+        confirm(pipeline, 2, multiple=True)
+        pipeline.flush()
+        self.assertEqual(self.channel.acks, [(3, True)])
+
+    def test_closed_channel_acks_nothing(self):
+        pipeline = self.pipeline()
+        self.publish(pipeline, 1)
+        confirm(pipeline, 1)
+        self.channel.is_open = False
+        pipeline.flush()
+        self.assertEqual(self.channel.acks, [])
+
+    def test_start_events_do_not_shift_confirm_sequence(self):
+        worker = AsyncCalculationWorker('add', pipeline=True)
+        worker.ack_pipeline = pipeline = self.pipeline(max_batch=1)
+        for tag in (1, 2):
+            pipeline.register(tag)
+        first, second = create_task_message(1, 2, 'add'), create_task_message(3, 4, 'add')
+
+        # Événements de démarrage (numéros 1 et 2) intercalés avec les résultats (3 et 4)
+        self.assertTrue(worker.announce_start(self.channel, first))
+        self.assertTrue(worker.announce_start(self.channel, second))
+        pipeline.published(1)
+        pipeline.published(2)
+
+        confirm(pipeline, 2, multiple=True)
+        self.assertEqual(self.channel.acks, [], "tâche acquittée sur la confirmation d'un événement")
+        confirm(pipeline, 3)
+        self.assertEqual(self.channel.acks, [(1, True)])
+        confirm(pipeline, 4)
+        self.assertEqual(self.channel.acks, [(1, True), (2, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests du tourniquet à déficit (sans broker): parts de service des voies pondérées en charge
+Usage: python tests/test_fair_queue.py
+"""
+
+import sys
+import os
+import unittest
+from types import SimpleNamespace
+
+# Ajouter le répertoire parent (et src) au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from pika import BasicProperties
+
+from config.rabbitmq_config import parse_source_weights
+from utils.fair_queue import DeficitRoundRobin
+from utils.message_utils import create_batch_task_message, encode_task_message, CONTENT_TYPE_BINARY
+
+WEIGHTS = {'web': 4, 'auto': 1, 'shared': 2}
+
+
+def serve(scheduler, depths, rounds):
+    """
+    Simule des voies toujours en attente: chaque voie est réalimentée jusqu'à sa profondeur
+    (prefetch du broker) après chaque service, puis compte les tâches servies par voie
+    """
+    served = {lane: 0 for lane in depths}
+    for lane, depth in depths.items():
+        for _ in range(depth):
+            scheduler.push(lane, lane)
+    for _ in range(rounds):
+        lane, _ = scheduler.pop()
+        served[lane] += 1
+        scheduler.push(lane, lane)
+    return served
+
+
+class DeficitRoundRobinTest(unittest.TestCase):
+
+    def assertShares(self, served, weights):
+        total, total_weight = sum(served.values()), sum(weights.values())
+        for lane, weight in weights.items():
+            self.assertAlmostEqual(served[lane] / total, weight / total_weight, delta=0.01, msg=served)
+
+    def test_shares_follow_weights_under_backlog(self):
+        served = serve(DeficitRoundRobin(WEIGHTS), {lane: 100 for lane in WEIGHTS}, 700)
+        self.assertShares(served, WEIGHTS)
+
+    def test_shares_follow_weights_with_weight_deep_buffers(self):
+        # Voies réalimentées dans la proportion de leurs poids
+        served = serve(DeficitRoundRobin(WEIGHTS), dict(WEIGHTS), 700)
+        self.assertShares(served, WEIGHTS)
+
+    def test_costly_items_share_by_cost(self):
+        scheduler = DeficitRoundRobin({'web': 1, 'auto': 1})
+        served = {'web': 0, 'auto': 0}
+        for _ in range(100):
+            scheduler.push('web', 'web', cost=10)
+            scheduler.push('auto', 'auto', cost=1)
+        for _ in range(110):
+            lane, _ = scheduler.pop()
+            served[lane] += 1
+        # Même crédit par tour: dix tâches de coût 1 pour une de coût 10
+        self.assertAlmostEqual(served['auto'] / served['web'], 10, delta=1)
+
+    def test_ineligible_lane_keeps_its_place(self):
+        scheduler = DeficitRoundRobin(WEIGHTS)
+        scheduler.push('web', 'blocked')
+        scheduler.push('auto', 'ready')
+        self.assertEqual(scheduler.pop(lambda item: item != 'blocked'), ('auto', 'ready'))
+        self.assertIsNone(scheduler.pop(lambda item: item != 'blocked'))
+        self.assertEqual(scheduler.pop(), ('web', 'blocked'))
+
+
+class QosChannel:
+    """Canal qui enregistre la QoS appliquée avant chaque abonnement"""
+
+    def __init__(self):
+        self.global_prefetch = None
+        self.prefetch = None
+        self.consumers = {}
+
+    def basic_qos(self, prefetch_count, global_qos=False):
+        if global_qos:
+            self.global_prefetch = prefetch_count
+        else:
+            self.prefetch = prefetch_count
+
+    def basic_consume(self, queue, on_message_callback):
+        self.consumers[queue] = self.prefetch
+
+
+class LanePrefetchTest(unittest.TestCase):
+
+    def configure(self, worker):
+        worker.scheduler = DeficitRoundRobin(WEIGHTS)
+        worker.channel = QosChannel()
+        worker.configure_consumers()
+        worker.executor.shutdown()
+        return worker.channel
+
+    def test_single_thread_worker_holds_one_task(self):
+        from src.worker import CalculationWorker
+
+        channel = self.configure(CalculationWorker('add'))
+        self.assertEqual(channel.global_prefetch, 1)
+        self.assertTrue(all(prefetch == 1 for prefetch in channel.consumers.values()), channel.consumers)
+
+    def test_lane_prefetch_follows_weights_within_budget(self):
+        from src.worker import MultiOperationWorker
+
+        channel = self.configure(MultiOperationWorker(['add'], threads=14))
+        self.assertEqual(channel.global_prefetch, 14)
+        self.assertEqual(channel.consumers, {'task_queue_add': 4, 'task_queue_add.web': 8,
+                                             'task_queue_add.auto': 2})
+
+    def test_async_batch_cost_matches_thread_worker(self):
+        from src.worker import AsyncCalculationWorker, task_cost
+
+        worker = AsyncCalculationWorker('add', concurrency=0)
+        worker.scheduler = DeficitRoundRobin(WEIGHTS)
+        task_message = create_batch_task_message([1, 2, 3], [4, 5, 6], 'add')
+        body, content_type = encode_task_message(task_message), CONTENT_TYPE_BINARY
+        method = SimpleNamespace(delivery_tag=1, redelivered=False)
+        worker.on_message(None, method, BasicProperties(content_type=content_type), body, lane='web')
+        worker.executor.shutdown()
+        self.assertEqual(worker.scheduler.lanes['web'][0][1], task_cost(task_message))
+        self.assertEqual(task_cost(task_message), 3)
+
+
+class SourceWeightsTest(unittest.TestCase):
+
+    def test_same_syntax_as_weights_option(self):
+        self.assertEqual(parse_source_weights('web=4, auto=1'), {'web': 4, 'auto': 1})
+
+    def test_malformed_entry_is_named(self):
+        with self.assertRaisesRegex(ValueError, "TASK_SOURCE_WEIGHTS: poids invalide 'web:4'"):
+            parse_source_weights('web:4,auto=1')
+
+
+if __name__ == '__main__':
+    unittest.main()
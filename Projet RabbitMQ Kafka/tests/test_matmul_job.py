@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests du produit matriciel par blocs (sans broker), avec et sans NumPy
+Usage: python tests/test_matmul_job.py
+"""
+
+import sys
+import os
+import random
+import unittest
+from unittest import mock
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.matmul_job as matmul_job
+import utils.message_utils as message_utils
+from utils.matmul_job import BlockedMatmul
+from utils.message_utils import (perform_matmul, create_matmul_task_message, encode_task_message,
+                                 decode_message, CONTENT_TYPE_BINARY)
+
+
+def matrix(rng, rows, cols):
+    return [rng.uniform(-10, 10) for _ in range(rows * cols)]
+
+
+def run_job(job, order=None):
+    """Calcule chaque produit de blocs comme un worker et accumule les tuiles dans l'ordre donné"""
+    products = [(tile, perform_matmul(a_block, b_block, rows, inner, cols))
+                for tile, a_block, b_block, rows, inner, cols in job.blocks()]
+    for index in (order if order is not None else range(len(products))):
+        job.accumulate(*products[index])
+    return products
+
+
+class BlockedMatmulTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(7)
+
+    def assertMatmul(self, rows, inner, cols, tile, order=None):
+        a, b = matrix(self.rng, rows, inner), matrix(self.rng, inner, cols)
+        job = BlockedMatmul(a, b, rows, inner, cols, tile)
+        run_job(job, order)
+        self.assertTrue(job.done)
+        expected = perform_matmul(a, b, rows, inner, cols)
+        for got, want in zip(job.c, expected):
+            self.assertAlmostEqual(got, want, places=9)
+        return job
+
+    def test_divisible_shapes(self):
+        self.assertMatmul(8, 8, 8, 4)
+
+    def test_non_divisible_shapes(self):
+        for rows, inner, cols, tile in ((7, 5, 9, 4), (1, 13, 3, 5), (10, 1, 10, 3), (5, 6, 7, 16)):
+            with self.subTest(shape=(rows, inner, cols), tile=tile):
+                job = self.assertMatmul(rows, inner, cols, tile)
+                self.assertEqual(job.total, -(-rows // tile) * -(-cols // tile) * -(-inner // tile))
+
+    def test_tiles_in_any_order(self):
+        a, b = matrix(self.rng, 9, 7), matrix(self.rng, 7, 5)
+        order = list(range(BlockedMatmul(a, b, 9, 7, 5, 3).total))
+        self.rng.shuffle(order)
+        job = BlockedMatmul(a, b, 9, 7, 5, 3)
+        run_job(job, order)
+        for got, want in zip(job.c, perform_matmul(a, b, 9, 7, 5)):
+            self.assertAlmostEqual(got, want, places=9)
+
+    def test_duplicate_tiles_are_ignored(self):
+        a, b = matrix(self.rng, 6, 6), matrix(self.rng, 6, 6)
+        job = BlockedMatmul(a, b, 6, 6, 6, 4)
+        products = run_job(job)
+        before = list(job.c)
+        for tile, c_block in products:
+            self.assertFalse(job.accumulate(tile, c_block))
+        self.assertEqual(list(job.c), before)
+        self.assertEqual(job.progress, 1.0)
+
+    def test_blocks_survive_the_wire(self):
+        # Un bloc (vue NumPy non contiguë) est encodé ligne par ligne dans le message
+        a, b = matrix(self.rng, 5, 7), matrix(self.rng, 7, 3)
+        job = BlockedMatmul(a, b, 5, 7, 3, 2)
+        for tile, a_block, b_block, rows, inner, cols in job.blocks():
+            message = create_matmul_task_message(a_block, b_block, rows, inner, cols, list(tile), 'job', 'amq.q')
+            decoded = decode_message(encode_task_message(message), CONTENT_TYPE_BINARY)
+            job.accumulate(tile, perform_matmul(decoded["a"], decoded["b"], rows, inner, cols))
+        for got, want in zip(job.c, perform_matmul(a, b, 5, 7, 3)):
+            self.assertAlmostEqual(got, want, places=9)
+
+    def test_rejects_inconsistent_dimensions(self):
+        with self.assertRaises(ValueError):
+            BlockedMatmul([1.0] * 5, [1.0] * 6, 2, 3, 2, 2)
+        with self.assertRaises(ValueError):
+            BlockedMatmul([1.0] * 6, [1.0] * 6, 2, 3, 2, 0)
+
+
+@unittest.skipIf(matmul_job.np is None, "NumPy absent: le repli array est déjà testé")
+class BlockedMatmulWithoutNumpyTest(BlockedMatmulTest):
+    """Mêmes tests sur le repli du module array"""
+
+    def setUp(self):
+        super().setUp()
+        for module in (matmul_job, message_utils):
+            patcher = mock.patch.object(module, 'np', None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+if __name__ == '__main__':
+    unittest.main()
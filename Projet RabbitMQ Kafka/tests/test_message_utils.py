@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests du format des messages (sans broker): aller-retour binaire et JSON de chaque type,
+anciens messages JSON, corps tronqués ou de type inconnu
+Usage: python tests/test_message_utils.py
+"""
+
+import sys
+import os
+import json
+import unittest
+from array import array
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.message_utils import *
+
+
+def sample_messages():
+    """Un message de chaque type (tâche et résultat), avec des champs hors du format fixe"""
+    task = create_task_message(1.5, -2.25, 'add', source='tenant_a', ttl=30, reply_to='amq.gen-reply')
+    group = create_task_message(3, 4, ALL_OPERATION)
+    group["operation"] = 'mul'
+    batch = create_batch_task_message([1, 2, 3], [4, 5, 6], 'sub', source='web')
+    reduce = create_reduce_task_message([1.0, 2.5, 4.0], 'add', 'job1', 1, 3, 'amq.gen-reduce')
+    claim = create_claim_task_message('mul', 'obj-a', 'obj-b', 'obj-out', 1000, 500, 'job2', 2, 4, 'amq.gen-claim')
+    matmul = create_matmul_task_message([1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12], 2, 3, 2, [0, 1], 'job3',
+                                        'amq.gen-matmul')
+    return {
+        'task': task,
+        'result': create_result_message(task, -0.75, 'worker_add_1', 0.5),
+        'group task': group,
+        'group result': create_result_message(group, 12, 'worker_mul_1', 0.25),
+        'batch task': batch,
+        'batch result': create_batch_result_message(batch, array('d', [-3, -3, -3]), 'worker_sub_1', 0.1),
+        'reduce task': reduce,
+        'reduce result': create_reduce_result_message(reduce, 7.5, 'worker_add_2', 0.01),
+        'claim task': claim,
+        'claim result': create_claim_result_message(claim, 'worker_mul_2', 0.2),
+        'matmul task': matmul,
+        'matmul result': create_matmul_result_message(matmul, [1, 2, 3, 4], 'worker_mul_3', 0.3),
+    }
+
+
+def encode(message, content_type):
+    """Encode avec l'encodeur de tâches ou de résultats selon le message"""
+    if "operation" in message:
+        return encode_task_message(message, content_type)
+    return encode_result_message(message, content_type)
+
+
+def plain(message):
+    """Colonnes (array, ndarray) converties en listes, tuples en listes, pour comparer les messages"""
+    return {key: list(value) if isinstance(value, (array, tuple)) or hasattr(value, 'tolist') else value
+            for key, value in message.items()}
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def assertRoundTrip(self, content_type):
+        for name, message in sample_messages().items():
+            with self.subTest(name):
+                decoded = decode_message(encode(message, content_type), content_type)
+                self.assertEqual(plain(decoded), plain(message))
+
+    def test_binary_round_trip(self):
+        self.assertRoundTrip(CONTENT_TYPE_BINARY)
+
+    def test_json_round_trip(self):
+        self.assertRoundTrip(CONTENT_TYPE_JSON)
+
+    def test_binary_kinds(self):
+        kinds = {
+            'task': KIND_TASK, 'result': KIND_RESULT, 'batch task': KIND_BATCH_TASK,
+            'batch result': KIND_BATCH_RESULT, 'reduce task': KIND_REDUCE_TASK,
+            'reduce result': KIND_REDUCE_RESULT, 'claim task': KIND_CLAIM_TASK,
+            'claim result': KIND_CLAIM_RESULT, 'matmul task': KIND_MATMUL_TASK,
+            'matmul result': KIND_MATMUL_RESULT,
+        }
+        messages = sample_messages()
+        for name, kind in kinds.items():
+            with self.subTest(name):
+                self.assertEqual(encode(messages[name], CONTENT_TYPE_BINARY)[:2], bytes([WIRE_VERSION, kind]))
+
+    def test_extras_trailer(self):
+        # Source hors des codes connus, échéance et reply_to: champs additionnels JSON en fin de message
+        task = sample_messages()['task']
+        decoded = decode_message(encode_task_message(task), CONTENT_TYPE_BINARY)
+        self.assertEqual(decoded['source'], 'tenant_a')
+        self.assertEqual(decoded['reply_to'], 'amq.gen-reply')
+        self.assertEqual(decoded['deadline'], task['timestamp'] + 30 * 10 ** 9)
+
+    def test_fixed_layout_without_extras(self):
+        task = create_task_message(1, 2, 'div', source='web')
+        body = encode_task_message(task)
+        self.assertEqual(body[-2:], b'\x00\x00')  # longueur nulle des champs additionnels
+        self.assertEqual(decode_message(body, CONTENT_TYPE_BINARY), task)
+
+
+class LegacyJsonTest(unittest.TestCase):
+
+    def test_body_without_content_type(self):
+        legacy = {"n1": 6, "n2": 7, "operation": "mul", "request_id": "0123456789abcdef",
+                  "timestamp": "2024-01-01T12:00:00"}
+        decoded = decode_message(json.dumps(legacy).encode('utf-8'))
+        self.assertEqual(decoded, legacy)
+        self.assertTrue(validate_task_message(decoded))
+        self.assertGreater(message_age(decoded), 0)
+
+    def test_legacy_result_can_be_reencoded_in_binary(self):
+        legacy = {"n1": 6, "n2": 7, "op": "mul", "result": 42, "source": "auto",
+                  "request_id": "0123456789abcdef", "worker_id": "worker_mul_1",
+                  "processing_time": 1.0, "timestamp": "2024-01-01T12:00:00"}
+        decoded = decode_message(encode_result_message(decode_message(json.dumps(legacy))), CONTENT_TYPE_BINARY)
+        self.assertEqual(decoded["result"], 42)
+        self.assertIsInstance(decoded["timestamp"], int)
+
+
+class RejectedBodyTest(unittest.TestCase):
+
+    def test_truncated_binary_bodies_are_rejected(self):
+        for name, message in sample_messages().items():
+            body = encode(message, CONTENT_TYPE_BINARY)
+            for cut in range(len(body)):
+                with self.subTest(name, cut=cut):
+                    with self.assertRaises(ValueError):
+                        decode_message(body[:cut], CONTENT_TYPE_BINARY)
+
+    def test_truncated_json_body_is_rejected(self):
+        body = encode_task_message(sample_messages()['task'], CONTENT_TYPE_JSON)
+        with self.assertRaises(ValueError):
+            decode_message(body[:-1], CONTENT_TYPE_JSON)
+
+    def test_unknown_kind_is_rejected(self):
+        body = bytearray(encode_task_message(create_task_message(1, 2, 'add')))
+        body[1] = 99
+        with self.assertRaisesRegex(ValueError, "Type de message inconnu"):
+            decode_message(bytes(body), CONTENT_TYPE_BINARY)
+
+    def test_unknown_version_is_rejected(self):
+        body = bytearray(encode_task_message(create_task_message(1, 2, 'add')))
+        body[0] = WIRE_VERSION + 1
+        with self.assertRaisesRegex(ValueError, "Version de format"):
+            decode_message(bytes(body), CONTENT_TYPE_BINARY)
+
+    def test_unknown_operation_code_is_rejected(self):
+        body = bytearray(encode_task_message(create_task_message(1, 2, 'add')))
+        body[2] = 0  # premier octet après l'en-tête: code d'opération
+        with self.assertRaises(ValueError):
+            decode_message(bytes(body), CONTENT_TYPE_BINARY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests de la combinaison en arbre des réductions (sans broker)
+Usage: python tests/test_reduce_job.py
+"""
+
+import sys
+import os
+import random
+import unittest
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.message_utils import perform_reduce
+from utils.reduce_job import TreeCombiner
+
+
+def partitions_of(values, size):
+    """Découpe les valeurs en partitions de `size` (comme reduce_client.py)"""
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def combine(operation, chunks, order):
+    """Réduit chaque partition puis combine les partiels dans l'ordre d'arrivée donné"""
+    combiner = TreeCombiner(operation, len(chunks))
+    for partition in order:
+        combiner.add(partition, perform_reduce(operation, chunks[partition]), len(chunks[partition]))
+    return combiner
+
+
+class TreeCombinerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(42)
+
+    def test_final_value_matches_perform_reduce(self):
+        values = [self.random.uniform(-1000, 1000) for _ in range(10007)]
+        chunks = partitions_of(values, 1000)
+        combiner = combine('add', chunks, range(len(chunks)))
+        self.assertTrue(combiner.done)
+        self.assertEqual(combiner.count, len(values))
+        self.assertAlmostEqual(combiner.result, perform_reduce('add', values), delta=1e-6)
+
+    def test_product_matches_perform_reduce(self):
+        values = [self.random.uniform(0.9, 1.1) for _ in range(999)]
+        chunks = partitions_of(values, 100)
+        combiner = combine('mul', chunks, range(len(chunks)))
+        self.assertAlmostEqual(combiner.result, perform_reduce('mul', values), places=9)
+
+    def test_out_of_order_arrival_gives_identical_result(self):
+        values = [self.random.uniform(-1, 1) * 10 ** self.random.randint(-8, 8) for _ in range(4000)]
+        chunks = partitions_of(values, 250)
+        in_order = combine('add', chunks, range(len(chunks))).result
+        for _ in range(20):
+            order = list(range(len(chunks)))
+            self.random.shuffle(order)
+            # Ordre gauche/droite conservé: mêmes additions, même arrondi, au bit près
+            self.assertEqual(combine('add', chunks, order).result, in_order)
+
+    def test_duplicate_partials_are_ignored(self):
+        combiner = TreeCombiner('add', 4)
+        self.assertTrue(combiner.add(1, 10.0, 1))
+        self.assertFalse(combiner.add(1, 10.0, 1))
+        for partition, value in ((0, 1.0), (3, 1000.0), (2, 100.0)):
+            combiner.add(partition, value, 1)
+        self.assertFalse(combiner.add(3, 1000.0, 1))  # relivraison après la fin
+        self.assertEqual((combiner.result, combiner.count), (1111.0, 4))
+
+    def test_unknown_partition_is_ignored(self):
+        combiner = TreeCombiner('add', 2)
+        self.assertFalse(combiner.add(2, 1.0))
+        self.assertFalse(combiner.add(-1, 1.0))
+        self.assertEqual(combiner.missing(), [0, 1])
+
+    def test_odd_number_of_leaves(self):
+        for partitions in (1, 3, 5, 7, 9, 33):
+            with self.subTest(partitions=partitions):
+                order = list(range(partitions))
+                self.random.shuffle(order)
+                combiner = TreeCombiner('add', partitions)
+                for partition in order:
+                    self.assertIsNone(combiner.result)
+                    combiner.add(partition, float(partition + 1))
+                self.assertTrue(combiner.done)
+                self.assertEqual(combiner.result, partitions * (partitions + 1) / 2)
+                self.assertEqual(combiner.held, 0)
+
+    def test_only_unpaired_partials_are_held(self):
+        combiner = TreeCombiner('add', 8)
+        for partition in (0, 2, 4, 6):
+            combiner.add(partition, 1.0)
+        self.assertEqual(combiner.held, 4)
+        combiner.add(1, 1.0)  # 0+1 remonte et attend 2+3
+        self.assertEqual(combiner.held, 4)
+        self.assertEqual(combiner.missing(), [3, 5, 7])
+        self.assertAlmostEqual(combiner.progress, 5 / 8)
+
+    def test_rejects_non_associative_operation(self):
+        with self.assertRaises(ValueError):
+            TreeCombiner('sub', 2)
+        with self.assertRaises(ValueError):
+            TreeCombiner('add', 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
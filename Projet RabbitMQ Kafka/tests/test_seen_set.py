@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests de la mémoire des tâches déjà terminées (sans broker)
+Usage: python tests/test_seen_set.py
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Ajouter le répertoire parent (et src) au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils.seen_set import BloomFilter, SeenSet, RecentIds
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        keys = [f"task-{i}" for i in range(2000)]  # au-delà de la capacité prévue
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"task-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+
+    def test_clear(self):
+        bloom = BloomFilter(100)
+        bloom.add("task")
+        bloom.clear()
+        self.assertNotIn("task", bloom)
+
+
+class SeenSetTest(unittest.TestCase):
+
+    def test_recent_results_are_kept(self):
+        seen = SeenSet(capacity=2, window=60)
+        seen.add("a", {"result": 1})
+        self.assertEqual(seen.check("a"), (True, {"result": 1}))
+        self.assertEqual(seen.check("b"), (False, None))
+
+    def test_evicted_ids_are_remembered_without_result(self):
+        seen = SeenSet(capacity=2, window=60)
+        for key in ("a", "b", "c"):
+            seen.add(key, key.upper())
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(seen.check("a"), (True, None))
+        self.assertEqual(seen.check("c"), (True, "C"))
+
+    def test_window_expiry(self):
+        seen = SeenSet(capacity=1, window=60)
+        seen.add("a")
+        seen.add("b")  # "a" ne reste que dans le filtre de Bloom
+
+        # Une fenêtre écoulée: "a" passe dans la génération précédente
+        seen.rotated_at -= 61
+        self.assertEqual(seen.check("a"), (True, None))
+
+        # Une seconde fenêtre: la génération de "a" est effacée
+        seen.rotated_at -= 61
+        self.assertEqual(seen.check("a"), (False, None))
+        self.assertEqual(seen.check("b")[0], True)  # toujours dans l'anneau exact
+
+    def test_long_idle_period_clears_both_generations(self):
+        seen = SeenSet(capacity=1, window=60)
+        seen.add("a")
+        seen.add("b")
+        seen.rotated_at -= 121
+        self.assertEqual(seen.check("a"), (False, None))
+
+
+class RecentIdsTest(unittest.TestCase):
+
+    def test_duplicates_are_reported(self):
+        ids = RecentIds(capacity=3)
+        self.assertTrue(ids.add("a"))
+        self.assertFalse(ids.add("a"))
+        self.assertEqual(len(ids), 1)
+
+    def test_oldest_id_is_evicted(self):
+        ids = RecentIds(capacity=2)
+        for key in ("a", "b", "c"):
+            ids.add(key)
+        self.assertNotIn("a", ids)
+        self.assertIn("b", ids)
+        self.assertIn("c", ids)
+
+    def test_seen_again_refreshes_position(self):
+        ids = RecentIds(capacity=2)
+        ids.add("a")
+        ids.add("b")
+        ids.add("a")  # "a" redevient le plus récent
+        ids.add("c")
+        self.assertIn("a", ids)
+        self.assertNotIn("b", ids)
+
+
+class ReconnectStateTest(unittest.TestCase):
+
+    def test_lost_connection_keeps_seen_tasks(self):
+        from src.worker import CalculationWorker
+
+        worker = CalculationWorker('add')
+        worker.seen_tasks.add("done", {"result": 3})
+        cancel_event = threading.Event()
+        worker.running[1] = ("running", cancel_event)
+        worker.scheduler.push('web', ('add', None))
+        worker.executing['add'] = 1
+        worker.in_flight_counts['add'] = 2
+
+        worker.drop_connection_state()
+
+        self.assertTrue(cancel_event.is_set())
+        self.assertEqual((worker.running, len(worker.scheduler)), ({}, 0))
+        self.assertEqual(sum(worker.executing.values()) + sum(worker.in_flight_counts.values()), 0)
+        self.assertEqual(worker.seen_tasks.check("done"), (True, {"result": 3}))
+        worker.executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
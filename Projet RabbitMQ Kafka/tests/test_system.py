@@ -94,9 +94,8 @@ class SystemTester:
                     
                     # Enregistrer le résultat pour le test
                     try:
-                        from utils.message_utils import deserialize_message
-                        message_str = body.decode('utf-8')
-                        result_message = deserialize_message(message_str)
+                        from utils.message_utils import decode_message
+                        result_message = decode_message(body, properties.content_type)
                         self.tester.results_received.append(result_message)
                     except Exception:
                         pass
@@ -0,0 +1,123 @@
+"""Découpage d'une expression arithmétique en graphe (DAG) d'opérations binaires indépendantes"""
+
+import ast
+from typing import Dict, List, Optional, Tuple
+
+# Opérateurs Python acceptés et opération correspondante des workers
+_BINARY_OPERATORS = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div'}
+_SYMBOLS = {'add': '+', 'sub': '-', 'mul': '*', 'div': '/'}
+
+
+class ExpressionDag:
+    """
+    Graphe des opérations d'une expression comme `(a+b)*(c-d)/e`
+
+    Chaque nœud est une opération binaire dont les opérandes sont des constantes ou les
+    résultats d'autres nœuds; les sous-expressions identiques ne sont calculées qu'une fois.
+    Les nœuds prêts (opérandes connus) sont indépendants et peuvent être calculés en parallèle:
+    le temps total est la profondeur du graphe, pas le nombre d'opérations. Ils sont rendus par
+    chemin critique décroissant (nombre d'opérations restant jusqu'à la racine).
+    """
+
+    def __init__(self, expression: str, variables: Optional[Dict[str, float]] = None, max_nodes: int = 256):
+        self.expression = expression
+        self.variables = variables or {}
+        self.max_nodes = max_nodes
+        # Nœud: [opération, opérande gauche, opérande droit]; opérande = ('node', index) ou ('value', nombre)
+        self.nodes: List[list] = []
+        self.keys: Dict[tuple, int] = {}
+        self.values: Dict[int, float] = {}
+        self.dispatched = set()
+        self.parents: Dict[int, List[int]] = {}
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Expression invalide: {e.msg}")
+        self.root = self._build(tree.body)
+        self.critical_path = self._critical_paths()
+
+    def _build(self, node) -> Tuple[str, object]:
+        """Construit récursivement les nœuds; renvoie l'opérande représentant `node`"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            return ('value', float(node.value))
+        if isinstance(node, ast.Name):
+            if node.id not in self.variables:
+                raise ValueError(f"Variable inconnue: {node.id}")
+            return ('value', float(self.variables[node.id]))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self._build(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if operand[0] == 'value':
+                return ('value', -operand[1])
+            return self._add_node('sub', ('value', 0.0), operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            left = self._build(node.left)
+            right = self._build(node.right)
+            return self._add_node(_BINARY_OPERATORS[type(node.op)], left, right)
+        raise ValueError(f"Élément non supporté dans l'expression: {type(getattr(node, 'op', node)).__name__}")
+
+    def _add_node(self, operation: str, left, right) -> Tuple[str, int]:
+        """Ajoute un nœud, ou réutilise celui d'une sous-expression identique"""
+        key = (operation, left, right)
+        if key not in self.keys:
+            if len(self.nodes) >= self.max_nodes:
+                raise ValueError(f"Expression trop grande (plus de {self.max_nodes} opérations)")
+            self.keys[key] = len(self.nodes)
+            self.nodes.append([operation, left, right])
+            for kind, child in (left, right):
+                if kind == 'node':
+                    self.parents.setdefault(child, []).append(len(self.nodes) - 1)
+        return ('node', self.keys[key])
+
+    def _critical_paths(self) -> List[int]:
+        """Nombre d'opérations entre chaque nœud et la racine, lui compris (plus long chemin)"""
+        paths = [0] * len(self.nodes)
+        # Les nœuds sont créés après leurs opérandes: l'ordre inverse parcourt les parents d'abord
+        for index in reversed(range(len(self.nodes))):
+            paths[index] = 1 + max((paths[parent] for parent in self.parents.get(index, ())), default=0)
+        return paths
+
+    @property
+    def depth(self) -> int:
+        """Profondeur du graphe: nombre minimal d'étapes de calcul séquentielles"""
+        return max(self.critical_path, default=0)
+
+    @property
+    def done(self) -> bool:
+        return self.root[0] == 'value' or self.root[1] in self.values
+
+    @property
+    def result(self) -> Optional[float]:
+        """Valeur de l'expression une fois tous les nœuds nécessaires calculés"""
+        kind, index = self.root
+        return index if kind == 'value' else self.values.get(index)
+
+    def _value(self, operand) -> Optional[float]:
+        kind, index = operand
+        return index if kind == 'value' else self.values.get(index)
+
+    def operands(self, index: int) -> Tuple[str, float, float]:
+        """(opération, n1, n2) d'un nœud prêt"""
+        operation, left, right = self.nodes[index]
+        return operation, self._value(left), self._value(right)
+
+    def ready(self) -> List[int]:
+        """Nœuds non encore envoyés dont les opérandes sont connus, par chemin critique décroissant"""
+        ready = [index for index, (_, left, right) in enumerate(self.nodes)
+                 if index not in self.dispatched
+                 and self._value(left) is not None and self._value(right) is not None]
+        return sorted(ready, key=lambda index: -self.critical_path[index])
+
+    def mark_dispatched(self, index: int):
+        self.dispatched.add(index)
+
+    def complete(self, index: int, value: float):
+        """Enregistre le résultat d'un nœud (un doublon est ignoré)"""
+        self.values.setdefault(index, value)
+
+    def describe(self, index: int) -> str:
+        """Représentation lisible d'un nœud: ex. '3.0 * 7.5'"""
+        operation, n1, n2 = self.operands(index)
+        return f"{n1} {_SYMBOLS[operation]} {n2}"
@@ -0,0 +1,109 @@
+"""Ordonnancement équitable pondéré entre les voies (sources) de tâches d'un worker"""
+
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.latency_stats import LatencyWindow
+
+
+class DeficitRoundRobin:
+    """
+    Tourniquet à déficit (DRR) entre des voies pondérées
+
+    Chaque voie non vide reçoit à son tour `poids × quantum` crédits et sert ses éléments
+    tant que son déficit couvre leur coût (1 par tâche, le nombre de valeurs pour un lot).
+    Une voie en rafale n'obtient donc que sa part des places libres, et toute voie en attente
+    est servie à chaque tour: son attente reste bornée quel que soit le volume des autres.
+    Les voies inconnues sont créées à la volée avec un poids de 1.
+
+    Une instance ne doit être utilisée que depuis un seul thread (thread I/O ou boucle asyncio).
+    """
+
+    def __init__(self, weights: Dict[str, int], quantum: int = 1):
+        self.weights = {lane: max(1, int(weight)) for lane, weight in weights.items()}
+        self.quantum = quantum
+        self.lanes = defaultdict(deque)
+        self.deficits = defaultdict(int)
+        self.active = OrderedDict()  # voies non vides, dans l'ordre du tourniquet
+        self.turn = None  # voie dont le tour est en cours (quantum déjà reçu)
+        self.served = defaultdict(int)
+        self.waits = defaultdict(LatencyWindow)
+
+    def push(self, lane: str, item: Any, cost: int = 1):
+        """Met un élément en attente dans sa voie"""
+        self.lanes[lane].append((item, max(1, cost), time.monotonic()))
+        self.active[lane] = None
+
+    def pop(self, eligible: Optional[Callable[[Any], bool]] = None) -> Optional[Tuple[str, Any]]:
+        """
+        Renvoie (voie, élément) suivant selon le tourniquet, ou None si aucune voie n'a d'élément prêt
+
+        `eligible` écarte pour cet appel les voies dont l'élément en tête ne peut pas démarrer
+        (ex. plafond de son opération atteint); elles gardent leur place et leur crédit.
+        """
+        while True:
+            candidates = [lane for lane in self.active
+                          if eligible is None or eligible(self.lanes[lane][0][0])]
+            if not candidates:
+                return None
+            if len(candidates) > 1:
+                self._skip_rounds(candidates)
+            lane = candidates[0]
+            item, cost, enqueued_at = self.lanes[lane][0]
+            if lane != self.turn:
+                # Début du tour de la voie: elle reçoit son quantum et sert aussitôt ce qu'il couvre
+                self.turn = lane
+                self.deficits[lane] += self.weights.get(lane, 1) * self.quantum
+            if self.deficits[lane] < cost and len(candidates) > 1:
+                # Crédit épuisé: fin du tour, la voie passe en fin de tourniquet
+                self.turn = None
+                self.active.move_to_end(lane)
+                continue
+
+            self.lanes[lane].popleft()
+            self.deficits[lane] = max(0, self.deficits[lane] - cost)
+            if not self.lanes[lane]:
+                # Une voie vidée ne garde pas de crédit pour le tour suivant
+                del self.active[lane]
+                self.deficits[lane] = 0
+                self.turn = None
+            self.served[lane] += 1
+            self.waits[lane].record(time.monotonic() - enqueued_at)
+            return lane, item
+
+    def _skip_rounds(self, candidates):
+        """
+        Accorde d'un coup les tours complets où aucune voie ne pourrait servir son élément en tête
+        (chaque voie reçoit ensuite à son tour le dernier quantum qui lui manque)
+
+        Sans ce raccourci, un élément coûteux (lot, plage d'un grand tableau) ferait tourner la
+        boucle une fois par quantum manquant.
+        """
+        rounds = min(
+            -(-(self.lanes[lane][0][1] - self.deficits[lane]) // (self.weights.get(lane, 1) * self.quantum))
+            for lane in candidates
+        )
+        if rounds > 1:
+            for lane in candidates:
+                self.deficits[lane] += (rounds - 1) * self.weights.get(lane, 1) * self.quantum
+
+    def clear(self) -> int:
+        """Abandonne les éléments en attente (ex. livraisons d'un canal fermé); renvoie leur nombre"""
+        dropped = len(self)
+        self.lanes.clear()
+        self.deficits.clear()
+        self.active.clear()
+        self.turn = None
+        return dropped
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.lanes.values())
+
+    def describe(self) -> str:
+        """Par voie: poids, tâches servies et attente locale avant exécution"""
+        return ", ".join(
+            f"{lane} (poids {self.weights.get(lane, 1)}): {self.served[lane]} servies, "
+            f"attente p95 {1000 * (self.waits[lane].percentile(95) or 0):.0f}ms"
+            for lane in sorted(self.served)
+        )
@@ -0,0 +1,31 @@
+"""Fenêtre glissante de mesures de latence et percentiles"""
+
+from collections import deque
+from typing import Optional
+
+
+class LatencyWindow:
+    """Garde les `size` dernières mesures (secondes) pour en calculer les percentiles"""
+
+    def __init__(self, size: int = 1000):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentile p (0-100) des mesures récentes, au rang le plus proche; None sans mesure"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))
+        return ordered[index]
+
+    def describe(self) -> str:
+        """Résumé lisible: nombre de mesures et p50/p95/p99 en ms"""
+        if not self.samples:
+            return "aucune mesure"
+        return (f"{self.count} mesures, p50 {1000 * self.percentile(50):.0f}ms, "
+                f"p95 {1000 * self.percentile(95):.0f}ms, p99 {1000 * self.percentile(99):.0f}ms")
@@ -0,0 +1,100 @@
+"""Découpage d'un produit matriciel en produits de blocs et accumulation des tuiles de C"""
+
+import math
+from array import array
+from typing import Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: découpage et accumulation par le module array
+    np = None
+
+
+class BlockedMatmul:
+    """
+    Produit C = A @ B (A: rows x inner, B: inner x cols, stockées ligne par ligne) découpé en tuiles
+
+    Chaque produit de blocs (i, j, k) = A[i, k] @ B[k, j] est une tâche indépendante; sa tuile
+    est ajoutée à C[i, j] dès son arrivée (accumulation sur k, dans n'importe quel ordre).
+    Seule C est gardée en mémoire; un produit déjà reçu (relivraison) est ignoré.
+    """
+
+    def __init__(self, a, b, rows: int, inner: int, cols: int, tile: int):
+        if len(a) != rows * inner or len(b) != inner * cols:
+            raise ValueError(f"Dimensions incohérentes: A {rows}x{inner}, B {inner}x{cols}")
+        if tile < 1:
+            raise ValueError("La taille des tuiles doit être positive")
+        self.a = a
+        self.b = b
+        self.rows = rows
+        self.inner = inner
+        self.cols = cols
+        self.tile = tile
+        self.grid = (math.ceil(rows / tile), math.ceil(cols / tile), math.ceil(inner / tile))
+        self.c = array('d', bytes(8 * rows * cols))
+        self.received = set()
+
+    @property
+    def total(self) -> int:
+        """Nombre de produits de blocs du travail"""
+        row_tiles, col_tiles, inner_tiles = self.grid
+        return row_tiles * col_tiles * inner_tiles
+
+    @property
+    def done(self) -> bool:
+        return len(self.received) == self.total
+
+    @property
+    def progress(self) -> float:
+        return len(self.received) / self.total
+
+    def _bounds(self, index: int, size: int) -> Tuple[int, int]:
+        return index * self.tile, min(size, (index + 1) * self.tile)
+
+    @staticmethod
+    def _block(matrix, width: int, row_bounds, col_bounds):
+        """
+        Bloc de la matrice, ligne par ligne: vue NumPy sur la matrice (sans copie; l'encodage du
+        message la copie en mémoire contiguë) ou copie array sans NumPy
+        """
+        (r0, r1), (c0, c1) = row_bounds, col_bounds
+        if np is not None:
+            return np.asarray(matrix, dtype=np.float64).reshape(-1, width)[r0:r1, c0:c1]
+        block = array('d')
+        for row in range(r0, r1):
+            block.extend(matrix[row * width + c0:row * width + c1])
+        return block
+
+    def blocks(self) -> Iterator[tuple]:
+        """Produits à calculer: ((i, j, k), bloc de A, bloc de B, lignes, dimension commune, colonnes)"""
+        row_tiles, col_tiles, inner_tiles = self.grid
+        for i in range(row_tiles):
+            row_bounds = self._bounds(i, self.rows)
+            for k in range(inner_tiles):
+                inner_bounds = self._bounds(k, self.inner)
+                a_block = self._block(self.a, self.inner, row_bounds, inner_bounds)
+                for j in range(col_tiles):
+                    col_bounds = self._bounds(j, self.cols)
+                    yield ((i, j, k), a_block, self._block(self.b, self.cols, inner_bounds, col_bounds),
+                           row_bounds[1] - row_bounds[0], inner_bounds[1] - inner_bounds[0],
+                           col_bounds[1] - col_bounds[0])
+
+    def accumulate(self, tile, c_block) -> bool:
+        """Ajoute la tuile A[i, k] @ B[k, j] à C[i, j]; renvoie False pour un doublon"""
+        i, j, k = tile
+        if (i, j, k) in self.received:
+            return False
+        self.received.add((i, j, k))
+        r0, r1 = self._bounds(i, self.rows)
+        c0, c1 = self._bounds(j, self.cols)
+        if np is not None:
+            c = np.frombuffer(self.c, dtype=np.float64).reshape(self.rows, self.cols)
+            c[r0:r1, c0:c1] += np.asarray(c_block, dtype=np.float64).reshape(r1 - r0, c1 - c0)
+            return True
+        width = c1 - c0
+        for row in range(r0, r1):
+            offset = row * self.cols + c0
+            block_offset = (row - r0) * width
+            for col in range(width):
+                self.c[offset + col] += c_block[block_offset + col]
+        return True
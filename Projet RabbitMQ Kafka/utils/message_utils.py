@@ -1,12 +1,122 @@
 """Utilitaires pour la gestion des messages"""
 
 import json
+import math
+import operator
+import re
+import struct
+import sys
+import time
 import uuid
+from array import array
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: repli sur le module array
+    np = None
 
-def create_task_message(n1: float, n2: float, operation: str, source="auto") -> Dict[str, Any]:
+
+# Formats de message sur le fil, sélectionnés via l'en-tête AMQP content_type
+CONTENT_TYPE_JSON = 'application/json'
+CONTENT_TYPE_BINARY = 'application/x-calc-v1'
+CONTENT_TYPES = {
+    'json': CONTENT_TYPE_JSON,
+    'binary': CONTENT_TYPE_BINARY
+}
+
+# Version du format binaire et types d'enveloppe
+WIRE_VERSION = 1
+KIND_TASK = 1
+KIND_RESULT = 2
+KIND_BATCH_TASK = 3
+KIND_BATCH_RESULT = 4
+KIND_REDUCE_TASK = 5
+KIND_REDUCE_RESULT = 6
+KIND_CLAIM_TASK = 7
+KIND_CLAIM_RESULT = 8
+KIND_MATMUL_TASK = 9
+KIND_MATMUL_RESULT = 10
+
+# Opérations de base et opération "all" (chaque worker calcule sa propre opération)
+OPERATIONS = ('add', 'sub', 'mul', 'div')
+ALL_OPERATION = 'all'
+
+# Opérations associatives utilisables par une réduction (somme, produit)
+REDUCE_OPERATIONS = ('add', 'mul')
+
+# Codes d'opération (un octet sur le fil)
+OPERATION_CODES = {'add': 1, 'sub': 2, 'mul': 3, 'div': 4, 'all': 5}
+OPERATION_NAMES = {code: op for op, code in OPERATION_CODES.items()}
+
+# Codes de source; 0xFF signifie que la source est dans les champs additionnels
+SOURCE_CODES = {'auto': 0, 'web': 1}
+SOURCE_NAMES = {code: source for source, code in SOURCE_CODES.items()}
+SOURCE_EXTRA = 0xFF
+
+# En-tête commun: version, type d'enveloppe
+_HEADER = struct.Struct('<BB')
+# Tâche: opération, source, request_id 64 bits, n1, n2, timestamp (ns)
+_TASK = struct.Struct('<BBQddq')
+# Résultat: opération, source, request_id, n1, n2, résultat, temps de traitement, timestamp (ns)
+_RESULT = struct.Struct('<BBQddddq')
+# Lot de tâches: opération, source, request_id, timestamp (ns), nombre de paires
+_BATCH_TASK = struct.Struct('<BBQqI')
+# Lot de résultats: opération, source, request_id, temps de traitement, timestamp (ns), nombre
+_BATCH_RESULT = struct.Struct('<BBQdqI')
+# Partition de réduction: opération, source, request_id, timestamp (ns), nombre de valeurs
+_REDUCE_TASK = struct.Struct('<BBQqI')
+# Résultat partiel de réduction: opération, source, request_id, résultat, temps de traitement, timestamp (ns), nombre
+_REDUCE_RESULT = struct.Struct('<BBQddqI')
+# Plage d'un tableau par référence: opération, source, request_id, timestamp (ns), début, nombre
+_CLAIM_TASK = struct.Struct('<BBQqQI')
+# Plage calculée: opération, source, request_id, temps de traitement, timestamp (ns), début, nombre
+_CLAIM_RESULT = struct.Struct('<BBQdqQI')
+# Produit de deux blocs: opération, source, request_id, timestamp (ns), lignes, dimension commune, colonnes
+_MATMUL_TASK = struct.Struct('<BBQqIII')
+# Tuile produit: opération, source, request_id, temps de traitement, timestamp (ns), lignes, colonnes
+_MATMUL_RESULT = struct.Struct('<BBQdqII')
+_LENGTH8 = struct.Struct('<B')
+_LENGTH16 = struct.Struct('<H')
+
+_TASK_FIELDS = ("n1", "n2", "operation", "source", "request_id", "timestamp")
+_RESULT_FIELDS = ("n1", "n2", "op", "result", "source", "request_id",
+                  "worker_id", "processing_time", "timestamp")
+_BATCH_TASK_FIELDS = ("batch", "n1", "n2", "operation", "source", "request_id", "timestamp")
+_BATCH_RESULT_FIELDS = ("batch", "op", "results", "count", "source", "request_id",
+                        "worker_id", "processing_time", "timestamp")
+_REDUCE_TASK_FIELDS = ("reduce", "values", "operation", "source", "request_id", "timestamp")
+_REDUCE_RESULT_FIELDS = ("reduce", "op", "result", "count", "source", "request_id",
+                         "worker_id", "processing_time", "timestamp")
+_CLAIM_TASK_FIELDS = ("claim", "operation", "source", "request_id", "timestamp", "start", "count")
+_CLAIM_RESULT_FIELDS = ("claim", "op", "source", "request_id", "worker_id", "processing_time",
+                        "timestamp", "start", "count")
+_MATMUL_TASK_FIELDS = ("matmul", "a", "b", "operation", "source", "request_id", "timestamp",
+                       "rows", "inner", "cols")
+_MATMUL_RESULT_FIELDS = ("matmul", "op", "c", "rows", "cols", "source", "request_id",
+                         "worker_id", "processing_time", "timestamp")
+
+
+def new_request_id() -> str:
+    """Génère un identifiant de requête de 64 bits (16 caractères hexadécimaux)"""
+    return uuid.uuid4().hex[:16]
+
+
+def timestamp_ns() -> int:
+    """Horodatage courant en nanosecondes depuis l'epoch"""
+    return time.time_ns()
+
+
+def format_timestamp(timestamp) -> str:
+    """Formate un horodatage (entier en ns ou chaîne ISO des anciens producteurs)"""
+    if isinstance(timestamp, int):
+        return datetime.fromtimestamp(timestamp / 1e9).isoformat()
+    return str(timestamp)
+
+
+def create_task_message(n1: float, n2: float, operation: str, source="auto",
+                        ttl: Optional[float] = None, reply_to: Optional[str] = None) -> Dict[str, Any]:
     """
     Crée un message de tâche de calcul
     
@@ -15,21 +125,31 @@ def create_task_message(n1: float, n2: float, operation: str, source="auto") ->
         n2: Deuxième nombre  
         operation: Type d'opération (add, sub, mul, div)
         source: Source de la tâche ("auto" pour automatique, "web" pour interface web)
+        ttl: Durée de validité en secondes (optionnelle): passé l'échéance, la tâche est abandonnée
+        reply_to: Queue du demandeur (optionnelle): le résultat lui est adressé directement,
+            sans passer par l'exchange des résultats
     """
-    return {
+    message = {
         "n1": n1,
         "n2": n2,
         "operation": operation,
         "source": source,
-        "request_id": str(uuid.uuid4())[:8],
-        "timestamp": datetime.now().isoformat()
+        "request_id": new_request_id(),
+        "timestamp": timestamp_ns()
     }
+    if operation == ALL_OPERATION:
+        # Les quatre résultats forment un groupe, regroupé par result_aggregator.py
+        message["group"] = message["request_id"]
+        message["group_size"] = len(OPERATIONS)
+    if reply_to is not None:
+        message["reply_to"] = reply_to
+    return _with_deadline(message, ttl)
 
 
 def create_result_message(task_message: Dict[str, Any], result: float, 
                          worker_id: str, processing_time: float) -> Dict[str, Any]:
     """Crée un message de résultat au format JSON"""
-    return {
+    message = {
         "n1": task_message["n1"],
         "n2": task_message["n2"],
         "op": task_message["operation"],
@@ -38,20 +158,813 @@ def create_result_message(task_message: Dict[str, Any], result: float,
         "request_id": task_message["request_id"],
         "worker_id": worker_id,
         "processing_time": processing_time,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp_ns()
+    }
+    if "group" in task_message:
+        message["group"] = task_message["group"]
+        message["group_size"] = task_message["group_size"]
+    if "reply_to" in task_message:
+        message["reply_to"] = task_message["reply_to"]
+    return message
+
+
+def create_group_result_message(group: str, members: Dict[str, Dict[str, Any]], size: int) -> Dict[str, Any]:
+    """
+    Crée le résultat regroupé d'un groupe ("all"): un résultat par opération reçue
+
+    Args:
+        group: Identifiant du groupe (request_id de la tâche "all")
+        members: Résultats reçus, par opération
+        size: Nombre de résultats attendus; le groupe est partiel s'il en manque
+    """
+    first = next(iter(members.values()))
+    return {
+        "type": "group",
+        "request_id": group,
+        "n1": first["n1"],
+        "n2": first["n2"],
+        "source": first.get("source", "auto"),
+        "results": {op: member["result"] for op, member in members.items()},
+        "complete": len(members) >= size,
+        "missing": [op for op in OPERATIONS if op not in members],
+        "processing_time": max(member["processing_time"] for member in members.values()),
+        "timestamp": timestamp_ns()
+    }
+
+
+def create_batch_task_message(n1_values, n2_values, operation: str, source="auto",
+                              ttl: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Crée un lot de tâches: une seule opération appliquée à des colonnes d'opérandes
+
+    Args:
+        n1_values: Colonne des premiers opérandes
+        n2_values: Colonne des deuxièmes opérandes (même longueur)
+        operation: Type d'opération (add, sub, mul, div)
+        source: Source des tâches ("auto" ou "web")
+        ttl: Durée de validité en secondes (optionnelle)
+    """
+    n1_column = array('d', n1_values)
+    n2_column = array('d', n2_values)
+    if len(n1_column) != len(n2_column):
+        raise ValueError("Les colonnes n1 et n2 doivent avoir la même longueur")
+
+    message = {
+        "batch": True,
+        "n1": n1_column,
+        "n2": n2_column,
+        "operation": operation,
+        "source": source,
+        "request_id": new_request_id(),
+        "timestamp": timestamp_ns()
+    }
+    return _with_deadline(message, ttl)
+
+
+def _with_deadline(message: Dict[str, Any], ttl: Optional[float]) -> Dict[str, Any]:
+    """Ajoute l'échéance (ns depuis l'epoch) d'une tâche ayant une durée de validité"""
+    if ttl is not None:
+        message["deadline"] = message["timestamp"] + int(ttl * 1e9)
+    return message
+
+
+def is_expired(message: Dict[str, Any]) -> bool:
+    """Indique si l'échéance d'une tâche est dépassée (jamais pour une tâche sans échéance)"""
+    deadline = message.get("deadline")
+    return deadline is not None and timestamp_ns() >= deadline
+
+
+def message_expiration(message: Dict[str, Any]) -> Optional[str]:
+    """
+    Propriété AMQP expiration d'une tâche: millisecondes restantes avant son échéance, ou None
+
+    Le broker supprime alors la tâche expirée (dead-letter) sans la livrer, du moins lorsqu'elle
+    atteint la tête de la queue; le worker vérifie de toute façon l'échéance avant de calculer.
+    """
+    deadline = message.get("deadline")
+    if deadline is None:
+        return None
+    return str(max(0, (deadline - timestamp_ns()) // 1_000_000))
+
+
+def create_batch_result_message(task_message: Dict[str, Any], results,
+                                worker_id: str, processing_time: float) -> Dict[str, Any]:
+    """Crée un lot de résultats, dans l'ordre des opérandes du lot de tâches"""
+    return {
+        "batch": True,
+        "op": task_message["operation"],
+        "results": results,
+        "count": len(results),
+        "source": task_message.get("source", "auto"),
+        "request_id": task_message["request_id"],
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp_ns()
+    }
+
+
+# Identifiant accepté par l'annulation: complet (16 hexadécimaux) ou ses 8 premiers caractères,
+# les seules formes que les workers reconnaissent
+_CANCEL_ID = re.compile(r'^[0-9a-f]{8}([0-9a-f]{8})?$')
+
+
+def is_cancel_id(request_id: str) -> bool:
+    """Indique si l'identifiant peut désigner une requête à annuler (complet ou 8 premiers caractères)"""
+    return bool(_CANCEL_ID.match(request_id))
+
+
+def create_cancel_message(request_id: str) -> Dict[str, Any]:
+    """
+    Crée un message de contrôle d'annulation, diffusé à tous les workers
+
+    Args:
+        request_id: Identifiant complet de la requête, ou ses 8 premiers caractères tels qu'affichés
+
+    Raises:
+        ValueError: identifiant qu'aucun worker ne reconnaîtrait
+    """
+    if not is_cancel_id(request_id):
+        raise ValueError(f"Identifiant de requête invalide: {request_id!r} (16 ou 8 premiers caractères hexadécimaux)")
+    return {
+        "type": "cancel",
+        "request_id": request_id,
+        "timestamp": timestamp_ns()
+    }
+
+
+def create_task_started_message(task_message: Dict[str, Any], worker_id: str) -> Dict[str, Any]:
+    """Crée l'événement de démarrage d'une tâche par un worker (identité request_id, opération calculée)"""
+    return {
+        "type": "started",
+        "request_id": task_message["request_id"],
+        "op": task_message["operation"],
+        "worker_id": worker_id,
+        "timestamp": timestamp_ns()
+    }
+
+
+def is_batch_message(message: Dict[str, Any]) -> bool:
+    """Indique si un message est un lot (tâches ou résultats)"""
+    return bool(message.get("batch"))
+
+
+def create_reduce_task_message(values, operation: str, job: str, partition: int, partitions: int,
+                               reply_to: str, source="auto", ttl: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Crée une partition d'un travail de réduction: le worker la réduit à une seule valeur
+
+    Args:
+        values: Valeurs de la partition
+        operation: Opération associative (add pour une somme, mul pour un produit)
+        job: Identifiant du travail de réduction
+        partition: Numéro de la partition (0 à partitions - 1)
+        partitions: Nombre total de partitions du travail
+        reply_to: Queue du combineur, destinataire du résultat partiel
+        source: Source des tâches ("auto" ou "web")
+        ttl: Durée de validité en secondes (optionnelle)
+    """
+    if operation not in REDUCE_OPERATIONS:
+        raise ValueError(f"Opération non associative pour une réduction: {operation}")
+    message = {
+        "reduce": True,
+        "values": array('d', values),
+        "operation": operation,
+        "source": source,
+        "request_id": new_request_id(),
+        "timestamp": timestamp_ns(),
+        "job": job,
+        "partition": partition,
+        "partitions": partitions,
+        "reply_to": reply_to
+    }
+    return _with_deadline(message, ttl)
+
+
+def create_reduce_result_message(task_message: Dict[str, Any], result: float,
+                                 worker_id: str, processing_time: float) -> Dict[str, Any]:
+    """Crée le résultat partiel d'une partition de réduction, adressé au combineur du travail"""
+    return {
+        "reduce": True,
+        "op": task_message["operation"],
+        "result": result,
+        "count": len(task_message["values"]),
+        "source": task_message.get("source", "auto"),
+        "request_id": task_message["request_id"],
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp_ns(),
+        "job": task_message["job"],
+        "partition": task_message["partition"],
+        "reply_to": task_message["reply_to"]
+    }
+
+
+def is_reduce_message(message: Dict[str, Any]) -> bool:
+    """Indique si un message est une partition de réduction ou son résultat partiel"""
+    return bool(message.get("reduce"))
+
+
+def create_claim_task_message(operation: str, a: str, b: str, out: str, start: int, count: int,
+                              job: str, partition: int, partitions: int, reply_to: str,
+                              source="auto", ttl: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Crée une tâche élément par élément sur une plage de tableaux du magasin d'objets (claim check)
+
+    Le message ne transporte que les identifiants des objets et la plage [start, start + count):
+    le worker lit les opérandes et écrit le résultat directement dans les fichiers projetés.
+
+    Args:
+        operation: Opération à effectuer (add, sub, mul, div)
+        a, b: Objets des opérandes
+        out: Objet de sortie (déjà alloué à la taille des opérandes)
+        start, count: Plage d'indices traitée par cette tâche
+        job: Identifiant du travail
+        partition: Numéro de la plage (0 à partitions - 1)
+        partitions: Nombre total de plages du travail
+        reply_to: Queue du demandeur, destinataire de la référence du résultat
+        source: Source des tâches ("auto" ou "web")
+        ttl: Durée de validité en secondes (optionnelle)
+    """
+    message = {
+        "claim": True,
+        "operation": operation,
+        "source": source,
+        "request_id": new_request_id(),
+        "timestamp": timestamp_ns(),
+        "start": start,
+        "count": count,
+        "a": a,
+        "b": b,
+        "out": out,
+        "job": job,
+        "partition": partition,
+        "partitions": partitions,
+        "reply_to": reply_to
+    }
+    return _with_deadline(message, ttl)
+
+
+def create_claim_result_message(task_message: Dict[str, Any], worker_id: str,
+                                processing_time: float) -> Dict[str, Any]:
+    """Crée la référence de la plage calculée (objet de sortie et plage), adressée au demandeur"""
+    return {
+        "claim": True,
+        "op": task_message["operation"],
+        "source": task_message.get("source", "auto"),
+        "request_id": task_message["request_id"],
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp_ns(),
+        "start": task_message["start"],
+        "count": task_message["count"],
+        "out": task_message["out"],
+        "job": task_message["job"],
+        "partition": task_message["partition"],
+        "reply_to": task_message["reply_to"]
+    }
+
+
+def is_claim_message(message: Dict[str, Any]) -> bool:
+    """Indique si un message est une plage de tableaux par référence ou la référence de son résultat"""
+    return bool(message.get("claim"))
+
+
+def create_matmul_task_message(a_block, b_block, rows: int, inner: int, cols: int, tile, job: str,
+                               reply_to: str, source="auto", ttl: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Crée le produit de deux blocs d'un produit matriciel par blocs, calculé par un worker 'mul'
+
+    Args:
+        a_block: Bloc de A (rows x inner), ligne par ligne
+        b_block: Bloc de B (inner x cols), ligne par ligne
+        rows, inner, cols: Dimensions des blocs
+        tile: Position (i, j, k) du produit: contribution du bloc k à la tuile (i, j) de C
+        job: Identifiant du travail
+        reply_to: Queue du demandeur, qui accumule les tuiles
+        source: Source des tâches ("auto" ou "web")
+        ttl: Durée de validité en secondes (optionnelle)
+    """
+    message = {
+        "matmul": True,
+        "a": a_block,
+        "b": b_block,
+        "operation": "mul",
+        "source": source,
+        "request_id": new_request_id(),
+        "timestamp": timestamp_ns(),
+        "rows": rows,
+        "inner": inner,
+        "cols": cols,
+        "tile": list(tile),
+        "job": job,
+        "reply_to": reply_to
+    }
+    return _with_deadline(message, ttl)
+
+
+def create_matmul_result_message(task_message: Dict[str, Any], c_block,
+                                 worker_id: str, processing_time: float) -> Dict[str, Any]:
+    """Crée le résultat d'un produit de blocs (tuile rows x cols), adressé au demandeur"""
+    return {
+        "matmul": True,
+        "op": task_message["operation"],
+        "c": c_block,
+        "rows": task_message["rows"],
+        "cols": task_message["cols"],
+        "source": task_message.get("source", "auto"),
+        "request_id": task_message["request_id"],
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp_ns(),
+        "tile": task_message["tile"],
+        "job": task_message["job"],
+        "reply_to": task_message["reply_to"]
     }
 
 
+def is_matmul_message(message: Dict[str, Any]) -> bool:
+    """Indique si un message est un produit de blocs ou la tuile qui en résulte"""
+    return bool(message.get("matmul"))
+
+
+def message_identity(message: Dict[str, Any]) -> str:
+    """
+    Identité d'un calcul: request_id et opération
+
+    Les résultats d'une tâche "all" partagent le request_id de la tâche, l'opération les distingue.
+    """
+    operation = message["operation"] if "operation" in message else message["op"]
+    return f"{message['request_id']}:{operation}"
+
+
+def _json_default(value):
+    """Convertit les colonnes (array, NumPy) en listes pour JSON"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
 def serialize_message(message: Dict[str, Any]) -> str:
-    """Sérialise un message en JSON"""
-    return json.dumps(message, indent=2)
+    """Sérialise un message en JSON compact"""
+    return json.dumps(message, separators=(',', ':'), default=_json_default)
 
 
-def deserialize_message(message_str: str) -> Dict[str, Any]:
-    """Désérialise un message JSON"""
+def deserialize_message(message_str) -> Dict[str, Any]:
+    """Désérialise un message JSON (str ou bytes)"""
     return json.loads(message_str)
 
 
+def _pack_extras(extras: Dict[str, Any]) -> bytes:
+    """Encode les champs hors du format fixe (JSON préfixé par sa longueur)"""
+    payload = json.dumps(extras, separators=(',', ':')).encode('utf-8') if extras else b''
+    return _LENGTH16.pack(len(payload)) + payload
+
+
+def _unpack_extras(view: memoryview, offset: int) -> Dict[str, Any]:
+    """Décode les champs additionnels à partir de la position donnée"""
+    (length,) = _LENGTH16.unpack_from(view, offset)
+    offset += _LENGTH16.size
+    if not length:
+        return {}
+    return json.loads(bytes(view[offset:offset + length]))
+
+
+def _source_code(message: Dict[str, Any], extras: Dict[str, Any]) -> int:
+    source = message.get("source", "auto")
+    if source in SOURCE_CODES:
+        return SOURCE_CODES[source]
+    extras["source"] = source
+    return SOURCE_EXTRA
+
+
+def _timestamp_value(timestamp) -> int:
+    """Convertit un horodatage en ns (les chaînes ISO sont converties)"""
+    if isinstance(timestamp, int):
+        return timestamp
+    return int(datetime.fromisoformat(timestamp).timestamp() * 1e9)
+
+
+def message_age(message: Dict[str, Any]) -> float:
+    """Âge (secondes) d'un message d'après son horodatage"""
+    return (timestamp_ns() - _timestamp_value(message["timestamp"])) / 1e9
+
+
+def encode_task_message(message: Dict[str, Any], content_type: str = CONTENT_TYPE_BINARY) -> bytes:
+    """Encode un message de tâche dans le format indiqué par content_type"""
+    if content_type != CONTENT_TYPE_BINARY:
+        return serialize_message(message).encode('utf-8')
+    if is_batch_message(message):
+        return _encode_batch_task(message)
+    if is_reduce_message(message):
+        return _encode_reduce_task(message)
+    if is_claim_message(message):
+        return _encode_claim_task(message)
+    if is_matmul_message(message):
+        return _encode_matmul_task(message)
+
+    extras = {key: value for key, value in message.items() if key not in _TASK_FIELDS}
+    source = _source_code(message, extras)
+    return (_HEADER.pack(WIRE_VERSION, KIND_TASK)
+            + _TASK.pack(OPERATION_CODES[message["operation"]], source,
+                         int(message["request_id"], 16),
+                         message["n1"], message["n2"],
+                         _timestamp_value(message["timestamp"]))
+            + _pack_extras(extras))
+
+
+def encode_result_message(message: Dict[str, Any], content_type: str = CONTENT_TYPE_BINARY) -> bytes:
+    """Encode un message de résultat dans le format indiqué par content_type"""
+    if content_type != CONTENT_TYPE_BINARY:
+        return serialize_message(message).encode('utf-8')
+    if is_batch_message(message):
+        return _encode_batch_result(message)
+    if is_reduce_message(message):
+        return _encode_reduce_result(message)
+    if is_claim_message(message):
+        return _encode_claim_result(message)
+    if is_matmul_message(message):
+        return _encode_matmul_result(message)
+
+    extras = {key: value for key, value in message.items() if key not in _RESULT_FIELDS}
+    source = _source_code(message, extras)
+    worker_id = message["worker_id"].encode('utf-8')
+    return (_HEADER.pack(WIRE_VERSION, KIND_RESULT)
+            + _RESULT.pack(OPERATION_CODES[message["op"]], source,
+                           int(message["request_id"], 16),
+                           message["n1"], message["n2"], message["result"],
+                           message["processing_time"],
+                           _timestamp_value(message["timestamp"]))
+            + _LENGTH8.pack(len(worker_id)) + worker_id
+            + _pack_extras(extras))
+
+
+def _pack_column(values) -> bytes:
+    """Encode une colonne en float64 little-endian"""
+    if np is not None and isinstance(values, np.ndarray):
+        return values.astype('<f8', copy=False).tobytes()
+    column = values if isinstance(values, array) and values.typecode == 'd' else array('d', values)
+    if sys.byteorder == 'big':
+        column = array('d', column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack_column(view: memoryview, offset: int, count: int) -> array:
+    """Décode une colonne de float64 little-endian depuis le buffer"""
+    column = array('d')
+    column.frombytes(view[offset:offset + count * column.itemsize])
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+def _encode_batch_task(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _BATCH_TASK_FIELDS}
+    source = _source_code(message, extras)
+    count = len(message["n1"])
+    if len(message["n2"]) != count:
+        raise ValueError("Les colonnes n1 et n2 doivent avoir la même longueur")
+    return (_HEADER.pack(WIRE_VERSION, KIND_BATCH_TASK)
+            + _BATCH_TASK.pack(OPERATION_CODES[message["operation"]], source,
+                               int(message["request_id"], 16),
+                               _timestamp_value(message["timestamp"]), count)
+            + _pack_column(message["n1"]) + _pack_column(message["n2"])
+            + _pack_extras(extras))
+
+
+def _encode_batch_result(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _BATCH_RESULT_FIELDS}
+    source = _source_code(message, extras)
+    worker_id = message["worker_id"].encode('utf-8')
+    return (_HEADER.pack(WIRE_VERSION, KIND_BATCH_RESULT)
+            + _BATCH_RESULT.pack(OPERATION_CODES[message["op"]], source,
+                                 int(message["request_id"], 16),
+                                 message["processing_time"],
+                                 _timestamp_value(message["timestamp"]),
+                                 len(message["results"]))
+            + _LENGTH8.pack(len(worker_id)) + worker_id
+            + _pack_column(message["results"])
+            + _pack_extras(extras))
+
+
+def _encode_reduce_task(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _REDUCE_TASK_FIELDS}
+    source = _source_code(message, extras)
+    return (_HEADER.pack(WIRE_VERSION, KIND_REDUCE_TASK)
+            + _REDUCE_TASK.pack(OPERATION_CODES[message["operation"]], source,
+                                int(message["request_id"], 16),
+                                _timestamp_value(message["timestamp"]), len(message["values"]))
+            + _pack_column(message["values"])
+            + _pack_extras(extras))
+
+
+def _encode_reduce_result(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _REDUCE_RESULT_FIELDS}
+    source = _source_code(message, extras)
+    worker_id = message["worker_id"].encode('utf-8')
+    return (_HEADER.pack(WIRE_VERSION, KIND_REDUCE_RESULT)
+            + _REDUCE_RESULT.pack(OPERATION_CODES[message["op"]], source,
+                                  int(message["request_id"], 16),
+                                  message["result"], message["processing_time"],
+                                  _timestamp_value(message["timestamp"]), message["count"])
+            + _LENGTH8.pack(len(worker_id)) + worker_id
+            + _pack_extras(extras))
+
+
+def _encode_claim_task(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _CLAIM_TASK_FIELDS}
+    source = _source_code(message, extras)
+    return (_HEADER.pack(WIRE_VERSION, KIND_CLAIM_TASK)
+            + _CLAIM_TASK.pack(OPERATION_CODES[message["operation"]], source,
+                               int(message["request_id"], 16), _timestamp_value(message["timestamp"]),
+                               message["start"], message["count"])
+            + _pack_extras(extras))
+
+
+def _encode_claim_result(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _CLAIM_RESULT_FIELDS}
+    source = _source_code(message, extras)
+    worker_id = message["worker_id"].encode('utf-8')
+    return (_HEADER.pack(WIRE_VERSION, KIND_CLAIM_RESULT)
+            + _CLAIM_RESULT.pack(OPERATION_CODES[message["op"]], source,
+                                 int(message["request_id"], 16), message["processing_time"],
+                                 _timestamp_value(message["timestamp"]), message["start"], message["count"])
+            + _LENGTH8.pack(len(worker_id)) + worker_id
+            + _pack_extras(extras))
+
+
+def _encode_matmul_task(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _MATMUL_TASK_FIELDS}
+    source = _source_code(message, extras)
+    return (_HEADER.pack(WIRE_VERSION, KIND_MATMUL_TASK)
+            + _MATMUL_TASK.pack(OPERATION_CODES[message["operation"]], source,
+                                int(message["request_id"], 16), _timestamp_value(message["timestamp"]),
+                                message["rows"], message["inner"], message["cols"])
+            + _pack_column(message["a"])
+            + _pack_column(message["b"])
+            + _pack_extras(extras))
+
+
+def _encode_matmul_result(message: Dict[str, Any]) -> bytes:
+    extras = {key: value for key, value in message.items() if key not in _MATMUL_RESULT_FIELDS}
+    source = _source_code(message, extras)
+    worker_id = message["worker_id"].encode('utf-8')
+    return (_HEADER.pack(WIRE_VERSION, KIND_MATMUL_RESULT)
+            + _MATMUL_RESULT.pack(OPERATION_CODES[message["op"]], source,
+                                  int(message["request_id"], 16), message["processing_time"],
+                                  _timestamp_value(message["timestamp"]), message["rows"], message["cols"])
+            + _LENGTH8.pack(len(worker_id)) + worker_id
+            + _pack_column(message["c"])
+            + _pack_extras(extras))
+
+
+def _decode_task(view: memoryview, offset: int) -> Dict[str, Any]:
+    op, source, request_id, n1, n2, timestamp = _TASK.unpack_from(view, offset)
+    message = {
+        "n1": n1,
+        "n2": n2,
+        "operation": OPERATION_NAMES[op],
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset + _TASK.size))
+    return message
+
+
+def _decode_result(view: memoryview, offset: int) -> Dict[str, Any]:
+    (op, source, request_id, n1, n2, result,
+     processing_time, timestamp) = _RESULT.unpack_from(view, offset)
+    offset += _RESULT.size
+    (length,) = _LENGTH8.unpack_from(view, offset)
+    offset += _LENGTH8.size
+    worker_id = str(view[offset:offset + length], 'utf-8')
+    message = {
+        "n1": n1,
+        "n2": n2,
+        "op": OPERATION_NAMES[op],
+        "result": result,
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset + length))
+    return message
+
+
+def _decode_batch_task(view: memoryview, offset: int) -> Dict[str, Any]:
+    op, source, request_id, timestamp, count = _BATCH_TASK.unpack_from(view, offset)
+    offset += _BATCH_TASK.size
+    n1_column = _unpack_column(view, offset, count)
+    offset += count * n1_column.itemsize
+    n2_column = _unpack_column(view, offset, count)
+    offset += count * n2_column.itemsize
+    message = {
+        "batch": True,
+        "n1": n1_column,
+        "n2": n2_column,
+        "operation": OPERATION_NAMES[op],
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset))
+    return message
+
+
+def _decode_batch_result(view: memoryview, offset: int) -> Dict[str, Any]:
+    op, source, request_id, processing_time, timestamp, count = _BATCH_RESULT.unpack_from(view, offset)
+    offset += _BATCH_RESULT.size
+    (length,) = _LENGTH8.unpack_from(view, offset)
+    offset += _LENGTH8.size
+    worker_id = str(view[offset:offset + length], 'utf-8')
+    offset += length
+    results = _unpack_column(view, offset, count)
+    offset += count * results.itemsize
+    message = {
+        "batch": True,
+        "op": OPERATION_NAMES[op],
+        "results": results,
+        "count": count,
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset))
+    return message
+
+
+def _decode_reduce_task(view: memoryview, offset: int) -> Dict[str, Any]:
+    op, source, request_id, timestamp, count = _REDUCE_TASK.unpack_from(view, offset)
+    offset += _REDUCE_TASK.size
+    values = _unpack_column(view, offset, count)
+    offset += count * values.itemsize
+    message = {
+        "reduce": True,
+        "values": values,
+        "operation": OPERATION_NAMES[op],
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset))
+    return message
+
+
+def _decode_reduce_result(view: memoryview, offset: int) -> Dict[str, Any]:
+    (op, source, request_id, result, processing_time,
+     timestamp, count) = _REDUCE_RESULT.unpack_from(view, offset)
+    offset += _REDUCE_RESULT.size
+    (length,) = _LENGTH8.unpack_from(view, offset)
+    offset += _LENGTH8.size
+    worker_id = str(view[offset:offset + length], 'utf-8')
+    message = {
+        "reduce": True,
+        "op": OPERATION_NAMES[op],
+        "result": result,
+        "count": count,
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset + length))
+    return message
+
+
+def _decode_claim_task(view: memoryview, offset: int) -> Dict[str, Any]:
+    op, source, request_id, timestamp, start, count = _CLAIM_TASK.unpack_from(view, offset)
+    message = {
+        "claim": True,
+        "operation": OPERATION_NAMES[op],
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "timestamp": timestamp,
+        "start": start,
+        "count": count
+    }
+    message.update(_unpack_extras(view, offset + _CLAIM_TASK.size))
+    return message
+
+
+def _decode_claim_result(view: memoryview, offset: int) -> Dict[str, Any]:
+    (op, source, request_id, processing_time,
+     timestamp, start, count) = _CLAIM_RESULT.unpack_from(view, offset)
+    offset += _CLAIM_RESULT.size
+    (length,) = _LENGTH8.unpack_from(view, offset)
+    offset += _LENGTH8.size
+    worker_id = str(view[offset:offset + length], 'utf-8')
+    message = {
+        "claim": True,
+        "op": OPERATION_NAMES[op],
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp,
+        "start": start,
+        "count": count
+    }
+    message.update(_unpack_extras(view, offset + length))
+    return message
+
+
+def _decode_matmul_task(view: memoryview, offset: int) -> Dict[str, Any]:
+    op, source, request_id, timestamp, rows, inner, cols = _MATMUL_TASK.unpack_from(view, offset)
+    offset += _MATMUL_TASK.size
+    a_block = _unpack_column(view, offset, rows * inner)
+    offset += rows * inner * a_block.itemsize
+    b_block = _unpack_column(view, offset, inner * cols)
+    offset += inner * cols * b_block.itemsize
+    message = {
+        "matmul": True,
+        "a": a_block,
+        "b": b_block,
+        "operation": OPERATION_NAMES[op],
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "timestamp": timestamp,
+        "rows": rows,
+        "inner": inner,
+        "cols": cols
+    }
+    message.update(_unpack_extras(view, offset))
+    return message
+
+
+def _decode_matmul_result(view: memoryview, offset: int) -> Dict[str, Any]:
+    (op, source, request_id, processing_time,
+     timestamp, rows, cols) = _MATMUL_RESULT.unpack_from(view, offset)
+    offset += _MATMUL_RESULT.size
+    (length,) = _LENGTH8.unpack_from(view, offset)
+    offset += _LENGTH8.size
+    worker_id = str(view[offset:offset + length], 'utf-8')
+    offset += length
+    c_block = _unpack_column(view, offset, rows * cols)
+    offset += rows * cols * c_block.itemsize
+    message = {
+        "matmul": True,
+        "op": OPERATION_NAMES[op],
+        "c": c_block,
+        "rows": rows,
+        "cols": cols,
+        "source": SOURCE_NAMES.get(source, "auto"),
+        "request_id": f"{request_id:016x}",
+        "worker_id": worker_id,
+        "processing_time": processing_time,
+        "timestamp": timestamp
+    }
+    message.update(_unpack_extras(view, offset))
+    return message
+
+
+_DECODERS = {
+    KIND_TASK: _decode_task,
+    KIND_RESULT: _decode_result,
+    KIND_BATCH_TASK: _decode_batch_task,
+    KIND_BATCH_RESULT: _decode_batch_result,
+    KIND_REDUCE_TASK: _decode_reduce_task,
+    KIND_REDUCE_RESULT: _decode_reduce_result,
+    KIND_CLAIM_TASK: _decode_claim_task,
+    KIND_CLAIM_RESULT: _decode_claim_result,
+    KIND_MATMUL_TASK: _decode_matmul_task,
+    KIND_MATMUL_RESULT: _decode_matmul_result
+}
+
+
+def decode_message(body: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Décode un message directement depuis le buffer reçu
+
+    Args:
+        body: Corps du message AMQP
+        content_type: En-tête content_type (None ou JSON pour les anciens producteurs)
+
+    Un corps binaire tronqué, d'une version ou d'un type inconnus lève ValueError.
+    """
+    if content_type != CONTENT_TYPE_BINARY:
+        return json.loads(body)
+
+    view = memoryview(body)
+    try:
+        version, kind = _HEADER.unpack_from(view, 0)
+        if version != WIRE_VERSION:
+            raise ValueError(f"Version de format non supportée: {version}")
+        if kind not in _DECODERS:
+            raise ValueError(f"Type de message inconnu: {kind}")
+        return _DECODERS[kind](view, _HEADER.size)
+    except struct.error as e:
+        # Corps plus court que les champs annoncés par son en-tête
+        raise ValueError(f"Message binaire tronqué: {e}")
+    except KeyError as e:
+        raise ValueError(f"Code d'opération inconnu: {e}")
+
+
 def perform_operation(operation: str, n1: float, n2: float) -> float:
     """Effectue l'opération mathématique demandée"""
     operations = {
@@ -67,17 +980,136 @@ def perform_operation(operation: str, n1: float, n2: float) -> float:
     return operations[operation](n1, n2)
 
 
+def perform_operation_batch(operation: str, n1_values, n2_values):
+    """
+    Effectue l'opération sur des colonnes entières en une seule passe
+
+    Utilise NumPy s'il est disponible, sinon le module array. Les résultats sont
+    renvoyés dans l'ordre des opérandes; la division par zéro donne inf comme
+    perform_operation.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Opération non supportée: {operation}")
+
+    if np is not None:
+        a = np.asarray(n1_values, dtype=np.float64)
+        b = np.asarray(n2_values, dtype=np.float64)
+        if operation == 'add':
+            return np.add(a, b)
+        if operation == 'sub':
+            return np.subtract(a, b)
+        if operation == 'mul':
+            return np.multiply(a, b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(b != 0, np.divide(a, b), np.inf)
+
+    if operation == 'div':
+        return array('d', (x / y if y != 0 else float('inf') for x, y in zip(n1_values, n2_values)))
+    kernels = {'add': operator.add, 'sub': operator.sub, 'mul': operator.mul}
+    return array('d', map(kernels[operation], n1_values, n2_values))
+
+
+def perform_operation_into(operation: str, n1_values, n2_values, out):
+    """
+    Effectue l'opération élément par élément en écrivant directement dans `out` (ex. vue d'un objet projeté)
+
+    Avec NumPy, les vues sont utilisées sans copie; sinon la plage est calculée par
+    perform_operation_batch puis recopiée dans `out`.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Opération non supportée: {operation}")
+
+    if np is None:
+        out[:] = perform_operation_batch(operation, n1_values, n2_values)
+        return
+    a = np.frombuffer(n1_values, dtype=np.float64)
+    b = np.frombuffer(n2_values, dtype=np.float64)
+    result = np.frombuffer(out, dtype=np.float64)
+    if operation == 'add':
+        np.add(a, b, out=result)
+    elif operation == 'sub':
+        np.subtract(a, b, out=result)
+    elif operation == 'mul':
+        np.multiply(a, b, out=result)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(a, b, out=result)
+        result[b == 0] = np.inf
+
+
+def perform_matmul(a_block, b_block, rows: int, inner: int, cols: int):
+    """
+    Produit de deux blocs stockés ligne par ligne: (rows x inner) @ (inner x cols), renvoyé ligne par ligne
+
+    Utilise NumPy (BLAS) s'il est disponible, sinon une boucle ligne par ligne sur le module array.
+    """
+    if np is not None:
+        a = np.asarray(a_block, dtype=np.float64).reshape(rows, inner)
+        b = np.asarray(b_block, dtype=np.float64).reshape(inner, cols)
+        return (a @ b).ravel()
+
+    c_block = array('d')
+    for row in range(rows):
+        accumulator = [0.0] * cols
+        for k in range(inner):
+            x = a_block[row * inner + k]
+            if x:
+                b_row = b_block[k * cols:(k + 1) * cols]
+                for col in range(cols):
+                    accumulator[col] += x * b_row[col]
+        c_block.extend(accumulator)
+    return c_block
+
+
+def perform_reduce(operation: str, values) -> float:
+    """
+    Réduit une partition à une seule valeur (somme ou produit) en une seule passe
+
+    Utilise NumPy s'il est disponible, sinon math.fsum (somme exacte) et math.prod.
+    """
+    if operation not in REDUCE_OPERATIONS:
+        raise ValueError(f"Opération non associative pour une réduction: {operation}")
+
+    if np is not None:
+        column = np.asarray(values, dtype=np.float64)
+        return float(np.sum(column) if operation == 'add' else np.prod(column))
+    return math.fsum(values) if operation == 'add' else math.prod(values)
+
+
 def validate_task_message(message: Dict[str, Any]) -> bool:
     """Valide qu'un message de tâche a tous les champs requis"""
+    if is_reduce_message(message):
+        required_fields = ["values", "operation", "request_id", "timestamp", "job", "partition", "reply_to"]
+        return all(field in message for field in required_fields) and message["operation"] in REDUCE_OPERATIONS
+    if is_matmul_message(message):
+        required_fields = ["a", "b", "rows", "inner", "cols", "request_id", "timestamp", "tile", "job", "reply_to"]
+        return (all(field in message for field in required_fields) and message.get("operation") == 'mul'
+                and len(message["a"]) == message["rows"] * message["inner"]
+                and len(message["b"]) == message["inner"] * message["cols"])
+    if is_claim_message(message):
+        required_fields = ["operation", "request_id", "timestamp", "start", "count", "a", "b", "out",
+                           "job", "partition", "reply_to"]
+        return all(field in message for field in required_fields) and message["operation"] in OPERATIONS
     required_fields = ["n1", "n2", "operation", "request_id", "timestamp"]
-    return all(field in message for field in required_fields)
+    if not all(field in message for field in required_fields):
+        return False
+    if is_batch_message(message):
+        return len(message["n1"]) == len(message["n2"])
+    return True
 
 
 def format_result_display(result_message: Dict[str, Any]) -> str:
     """Formate un message de résultat pour l'affichage"""
-    return (f"[{result_message['timestamp']}] "
+    if is_batch_message(result_message):
+        return (f"[{format_timestamp(result_message['timestamp'])}] "
+                f"Lot de {result_message['count']} résultats '{result_message['op']}' "
+                f"(Worker: {result_message['worker_id']}, "
+                f"Temps: {result_message['processing_time']:.1f}s, "
+                f"ID: {result_message['request_id'][:8]})")
+    return (f"[{format_timestamp(result_message['timestamp'])}] "
             f"Résultat: {result_message['n1']} {result_message['op']} {result_message['n2']} "
             f"= {result_message['result']} "
             f"(Worker: {result_message['worker_id']}, "
             f"Temps: {result_message['processing_time']:.1f}s, "
-            f"ID: {result_message['request_id'][:8]})") 
\ No newline at end of file
+            f"ID: {result_message['request_id'][:8]})"
+            + (" [cache]" if result_message.get('cached') else "")) 
\ No newline at end of file
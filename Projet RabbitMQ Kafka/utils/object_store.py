@@ -0,0 +1,111 @@
+"""Magasin d'objets local: tableaux de float64 dans des fichiers projetés en mémoire (mmap)"""
+
+import mmap
+import os
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+# Identifiant d'objet: 16 caractères hexadécimaux (aucun chemin ne peut être désigné)
+_OBJECT_ID = re.compile(r'^[0-9a-f]{16}$')
+
+
+class ObjectStore:
+    """
+    Tableaux de float64 stockés chacun dans un fichier `<id>.f64` d'un répertoire partagé
+
+    Les messages ne transportent que l'identifiant d'un objet et une plage d'indices (claim check).
+    Chaque processus projette le fichier en mémoire et travaille sur une vue memoryview de la
+    plage, sans copie: le producteur écrit les opérandes dans la projection, le worker calcule
+    directement dans celle de l'objet de sortie et le consommateur lit cette même projection.
+    Les valeurs sont dans l'ordre d'octets de la machine: le répertoire n'est partagé qu'entre
+    processus d'une même architecture.
+    """
+
+    SUFFIX = '.f64'
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, object_id: str) -> str:
+        if not _OBJECT_ID.match(object_id):
+            raise ValueError(f"Identifiant d'objet invalide: {object_id!r}")
+        return os.path.join(self.root, object_id + self.SUFFIX)
+
+    def create(self, count: int) -> Tuple[str, memoryview]:
+        """Alloue un objet de `count` valeurs (initialisées à 0); renvoie son identifiant et une vue modifiable"""
+        if count < 1:
+            raise ValueError("Un objet contient au moins une valeur")
+        object_id = secrets.token_hex(8)
+        with open(self.path(object_id), 'x+b') as object_file:
+            object_file.truncate(count * 8)
+        return object_id, self.open(object_id, writable=True)
+
+    def _map(self, object_id: str, writable: bool) -> mmap.mmap:
+        with open(self.path(object_id), 'r+b' if writable else 'rb') as object_file:
+            return mmap.mmap(object_file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+    @staticmethod
+    def _slice(object_id: str, values: memoryview, start: int, count: Optional[int]) -> memoryview:
+        end = len(values) if count is None else start + count
+        if not 0 <= start <= end <= len(values):
+            raise ValueError(f"Plage [{start}, {end}) hors de l'objet {object_id} ({len(values)} valeurs)")
+        return values[start:end]
+
+    def open(self, object_id: str, start: int = 0, count: Optional[int] = None,
+             writable: bool = False) -> memoryview:
+        """Vue (sans copie) des valeurs [start, start + count) d'un objet, projetée tant qu'elle est référencée"""
+        values = memoryview(self._map(object_id, writable)).cast('d')
+        return self._slice(object_id, values, start, count)
+
+    @contextmanager
+    def mapped(self, object_id: str, start: int = 0, count: Optional[int] = None,
+               writable: bool = False) -> Iterator[memoryview]:
+        """
+        Comme open(), mais la vue est libérée et la projection fermée à la sortie du bloc
+
+        Pour les usages courts (une tâche d'un worker): la durée de vie de la projection ne dépend
+        pas du ramasse-miettes. Une vue encore exportée à la sortie (ex. tableau NumPy retenu par
+        une trace d'exception) laisse la projection au ramasse-miettes.
+        """
+        mapping = self._map(object_id, writable)
+        base = memoryview(mapping)
+        values = base.cast('d')
+        view = None
+        try:
+            view = self._slice(object_id, values, start, count)
+            yield view
+        finally:
+            try:
+                for buffer in (view, values, base):
+                    if buffer is not None:
+                        buffer.release()
+                mapping.close()
+            except BufferError:
+                pass
+
+    def size(self, object_id: str) -> int:
+        """Nombre de valeurs d'un objet"""
+        return os.path.getsize(self.path(object_id)) // 8
+
+    def delete(self, object_id: str):
+        try:
+            os.remove(self.path(object_id))
+        except FileNotFoundError:
+            pass
+
+    def purge(self, max_age: float) -> int:
+        """Supprime les objets non modifiés depuis `max_age` secondes (travaux abandonnés); renvoie leur nombre"""
+        removed = 0
+        limit = time.time() - max_age
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(self.SUFFIX) and entry.stat().st_mtime < limit:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
@@ -0,0 +1,96 @@
+"""Contrôleur adaptatif du prefetch (basic_qos) des consommateurs"""
+
+import time
+from typing import Dict, Any
+
+
+class PrefetchController:
+    """
+    Ajuste périodiquement le prefetch d'un canal selon le temps de service et la latence du broker
+
+    Pour garder `concurrency` unités de traitement occupées sans réserver de travail aux
+    dépens des autres consommateurs, il faut environ concurrency * (1 + RTT / temps de service)
+    messages en vol: une tâche lente garde un prefetch proche de la concurrence, une tâche
+    rapide l'augmente pour couvrir l'aller-retour réseau. Les mesures sont lissées (moyenne
+    mobile exponentielle) et la valeur est bornée par [minimum, maximum].
+
+    Le prefetch est réappliqué avec global_qos=True: contrairement à la QoS par consommateur,
+    elle s'applique immédiatement aux consommateurs déjà abonnés du canal. Chaque appel à
+    basic_qos (synchrone) sert aussi à mesurer la latence aller-retour du broker.
+    """
+
+    def __init__(self, concurrency: int = 1, minimum: int = 1, maximum: int = 100,
+                 interval: float = 5.0, smoothing: float = 0.2):
+        self.concurrency = concurrency
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.interval = interval
+        self.smoothing = smoothing
+        self.prefetch = self._clamp(concurrency)
+        self.service_time = None
+        self.round_trip = None
+        self.adjustments = 0
+        self.last_check = time.monotonic()
+        self.last_decision = "initial"
+
+    def _clamp(self, value: int) -> int:
+        return max(self.minimum, min(self.maximum, value))
+
+    def _smooth(self, previous, sample: float) -> float:
+        if previous is None:
+            return sample
+        return previous + self.smoothing * (sample - previous)
+
+    def record_service_time(self, seconds: float):
+        """Enregistre le temps de service d'une tâche"""
+        self.service_time = self._smooth(self.service_time, seconds)
+
+    def record_round_trip(self, seconds: float):
+        """Enregistre une mesure de latence aller-retour du broker"""
+        self.round_trip = self._smooth(self.round_trip, seconds)
+
+    def target(self) -> int:
+        """Prefetch cible d'après les mesures courantes"""
+        if not self.service_time or self.round_trip is None:
+            return self.prefetch
+        return self._clamp(round(self.concurrency * (1 + self.round_trip / self.service_time)))
+
+    def apply(self, channel, prefetch: int = None):
+        """Applique le prefetch au canal (basic_qos synchrone) et mesure l'aller-retour"""
+        if prefetch is not None:
+            self.prefetch = prefetch
+        start = time.monotonic()
+        channel.basic_qos(prefetch_count=self.prefetch, global_qos=True)
+        self.record_round_trip(time.monotonic() - start)
+
+    def maybe_adjust(self, channel) -> bool:
+        """Réapplique le prefetch si l'intervalle est écoulé; renvoie True s'il a changé"""
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return False
+        self.last_check = now
+
+        target = self.target()
+        changed = target != self.prefetch
+        if changed:
+            self.adjustments += 1
+            self.last_decision = f"{self.prefetch} → {target}"
+        self.apply(channel, target)
+        return changed
+
+    def stats(self) -> Dict[str, Any]:
+        """Décisions et mesures du contrôleur, pour l'affichage des statistiques"""
+        return {
+            "prefetch": self.prefetch,
+            "service_time_ms": round(self.service_time * 1000, 2) if self.service_time is not None else None,
+            "round_trip_ms": round(self.round_trip * 1000, 2) if self.round_trip is not None else None,
+            "adjustments": self.adjustments,
+            "last_decision": self.last_decision
+        }
+
+    def describe(self) -> str:
+        """Résumé lisible des décisions du contrôleur"""
+        stats = self.stats()
+        return (f"prefetch={stats['prefetch']} (service: {stats['service_time_ms']}ms, "
+                f"RTT: {stats['round_trip_ms']}ms, ajustements: {stats['adjustments']}, "
+                f"dernier: {stats['last_decision']})")
@@ -0,0 +1,76 @@
+"""Combinaison en arbre des résultats partiels d'un travail de réduction"""
+
+import operator
+from typing import List, Optional
+
+# Opération de la réduction et combinaison de deux résultats partiels
+_COMBINE = {'add': operator.add, 'mul': operator.mul}
+
+
+class TreeCombiner:
+    """
+    Combine les résultats partiels des partitions deux à deux, niveau par niveau (arbre binaire)
+
+    Un partiel attend son voisin (partition 2k avec 2k+1) puis leur combinaison remonte au niveau
+    supérieur, et ainsi de suite jusqu'à la racine: seuls les partiels sans voisin encore arrivé
+    sont gardés en mémoire, quel que soit l'ordre d'arrivée. Pour une somme, l'ordre des additions
+    est celui d'une sommation par paires (erreur d'arrondi en O(log n) plutôt qu'en O(n)).
+    Une partition déjà reçue (relivraison, exécution spéculative) est ignorée.
+    """
+
+    def __init__(self, operation: str, partitions: int):
+        if operation not in _COMBINE:
+            raise ValueError(f"Opération non associative pour une réduction: {operation}")
+        if partitions < 1:
+            raise ValueError("Un travail de réduction a au moins une partition")
+        self.combine = _COMBINE[operation]
+        self.partitions = partitions
+        # Nombre de nœuds par niveau, des partitions (niveau 0) jusqu'à la racine
+        self.sizes: List[int] = [partitions]
+        while self.sizes[-1] > 1:
+            self.sizes.append((self.sizes[-1] + 1) // 2)
+        # Partiels en attente de leur voisin, par niveau: index -> valeur
+        self.waiting = [{} for _ in self.sizes]
+        self.received = set()
+        self.count = 0
+        self.result: Optional[float] = None
+
+    def add(self, partition: int, value: float, count: int = 0) -> bool:
+        """Intègre le résultat partiel d'une partition; renvoie False pour un doublon ou une partition inconnue"""
+        if partition in self.received or not 0 <= partition < self.partitions:
+            return False
+        self.received.add(partition)
+        self.count += count
+
+        level, index = 0, partition
+        while level < len(self.sizes) - 1:
+            sibling = index ^ 1
+            if sibling < self.sizes[level]:
+                if sibling not in self.waiting[level]:
+                    self.waiting[level][index] = value
+                    return True
+                other = self.waiting[level].pop(sibling)
+                # L'ordre gauche/droite est conservé: résultat indépendant de l'ordre d'arrivée
+                value = self.combine(other, value) if sibling < index else self.combine(value, other)
+            # Dernier nœud d'un niveau impair: remonte tel quel
+            level, index = level + 1, index // 2
+        self.result = value
+        return True
+
+    @property
+    def done(self) -> bool:
+        return len(self.received) == self.partitions
+
+    @property
+    def progress(self) -> float:
+        """Fraction des partitions reçues"""
+        return len(self.received) / self.partitions
+
+    @property
+    def held(self) -> int:
+        """Nombre de partiels gardés en attente de leur voisin"""
+        return sum(len(level) for level in self.waiting)
+
+    def missing(self) -> List[int]:
+        """Partitions dont le résultat n'est pas encore arrivé"""
+        return [partition for partition in range(self.partitions) if partition not in self.received]
@@ -0,0 +1,106 @@
+"""Ensemble borné des tâches déjà terminées, pour détecter les relivraisons"""
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class BloomFilter:
+    """Filtre de Bloom de taille fixe (faux positifs possibles, jamais de faux négatifs)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hachage: h1 + i * h2 à partir d'un seul condensat
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+
+
+class SeenSet:
+    """
+    Mémoire bornée des calculs terminés par ce worker
+
+    Un anneau exact garde les `capacity` derniers identifiants avec leur résultat, qui peut
+    ainsi être republié. Au-delà, un filtre de Bloom à fenêtre glissante (deux générations
+    tournant toutes les `window` secondes) se souvient encore pendant `window` à `2 * window`
+    secondes que le calcul a été fait, sans son résultat.
+    """
+
+    def __init__(self, capacity: int = 10000, window: float = 3600.0,
+                 expected_items: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.window = window
+        self.recent = OrderedDict()
+        self.current = BloomFilter(expected_items, error_rate)
+        self.previous = BloomFilter(expected_items, error_rate)
+        self.rotated_at = time.monotonic()
+
+    def _rotate(self):
+        elapsed = time.monotonic() - self.rotated_at
+        if elapsed < self.window:
+            return
+        self.previous, self.current = self.current, self.previous
+        self.current.clear()
+        if elapsed >= 2 * self.window:
+            self.previous.clear()
+        self.rotated_at = time.monotonic()
+
+    def add(self, key: str, result: Any = None):
+        """Mémorise un calcul terminé et, si fourni, son résultat"""
+        self._rotate()
+        self.current.add(key)
+        self.recent[key] = result
+        self.recent.move_to_end(key)
+        while len(self.recent) > self.capacity:
+            self.recent.popitem(last=False)
+
+    def check(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """Renvoie (déjà vu, résultat mémorisé ou None)"""
+        if key in self.recent:
+            return True, self.recent[key]
+        self._rotate()
+        return key in self.current or key in self.previous, None
+
+    def __len__(self):
+        return len(self.recent)
+
+
+class RecentIds:
+    """Ensemble exact des `capacity` derniers identifiants vus (sans faux positif)"""
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.ids = OrderedDict()
+
+    def add(self, key: str) -> bool:
+        """Mémorise l'identifiant; renvoie False s'il avait déjà été vu (doublon)"""
+        if key in self.ids:
+            self.ids.move_to_end(key)
+            return False
+        self.ids[key] = None
+        if len(self.ids) > self.capacity:
+            self.ids.popitem(last=False)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ids
+
+    def __len__(self):
+        return len(self.ids)
@@ -0,0 +1,109 @@
+"""Cache de résultats partagé entre les workers d'une même machine (fichier SQLite local)"""
+
+import math
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+
+class SharedResultCache:
+    """
+    Cache de résultats partagé par tous les workers d'un hôte, sans service externe
+
+    Les entrées sont stockées dans un fichier SQLite en mode WAL: plusieurs processus
+    peuvent lire en parallèle et chaque insertion (INSERT OR REPLACE) est atomique.
+    La taille est bornée: au-delà de `max_size`, les entrées expirées puis les plus
+    anciennes (ordre d'expiration, donc d'insertion) sont évincées. Les statistiques
+    (taux de hits, latence des lectures) sont propres à chaque worker.
+
+    Une instance ne doit être utilisée que depuis le thread qui l'a créée (thread I/O).
+    """
+
+    # Nombre d'insertions entre deux vérifications de la taille
+    EVICTION_CHECK_INTERVAL = 100
+
+    def __init__(self, path: str, max_size: int = 100000, ttl: float = 300.0):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " operation TEXT NOT NULL, n1 REAL NOT NULL, n2 REAL NOT NULL,"
+            " result REAL NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (operation, n1, n2))"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+        self.lookup_time = 0.0
+        self.max_lookup_time = 0.0
+
+    def get(self, key: Tuple[str, float, float]) -> Optional[float]:
+        """Renvoie le résultat partagé encore valide pour (opération, n1, n2), ou None"""
+        start = time.perf_counter()
+        try:
+            row = self.connection.execute(
+                "SELECT result FROM results WHERE operation = ? AND n1 = ? AND n2 = ? AND expires_at > ?",
+                (*key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        elapsed = time.perf_counter() - start
+        self.lookup_time += elapsed
+        self.max_lookup_time = max(self.max_lookup_time, elapsed)
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: Tuple[str, float, float], result: float):
+        """Insère (ou remplace) un résultat de façon atomique"""
+        if math.isnan(result):
+            return  # SQLite stocke NaN comme NULL
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (operation, n1, n2, result, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, result, time.time() + self.ttl)
+            )
+        except sqlite3.Error:
+            return
+        self.inserts += 1
+        if self.inserts % self.EVICTION_CHECK_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """Supprime les entrées expirées puis les plus anciennes au-delà de la taille max"""
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+            deleted = self.connection.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),)).rowcount
+            (count,) = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_size:
+                deleted += self.connection.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY expires_at LIMIT ?)",
+                    (count - self.max_size,)
+                ).rowcount
+            self.connection.execute("COMMIT")
+            self.evictions += deleted
+        except sqlite3.Error:
+            if self.connection.in_transaction:
+                self.connection.execute("ROLLBACK")
+
+    def close(self):
+        self.connection.close()
+
+    def describe(self) -> str:
+        """Statistiques de ce worker: taux de hits et latence des lectures"""
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0
+        average_ms = 1000 * self.lookup_time / lookups if lookups else 0
+        return (f"{self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hits), "
+                f"lecture moy. {average_ms:.3f}ms / max {1000 * self.max_lookup_time:.3f}ms, "
+                f"{self.evictions} évictions")
@@ -0,0 +1,147 @@
+"""Topologie RabbitMQ des tâches: queues de calcul, paliers de retry et queues des messages mis de côté"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.rabbitmq_config import (TASK_QUEUES, RESULT_QUEUE, ALL_OPERATIONS_EXCHANGE, TASK_RETRY_DELAYS,
+                                    DEAD_LETTER_EXCHANGE, PARKED_QUEUES, TASK_MAX_PRIORITY, TASK_PRIORITIES,
+                                    CONTROL_EXCHANGE, TASKS_EXCHANGE, RESULTS_EXCHANGE, TASK_SOURCE_WEIGHTS,
+                                    SHARED_LANE, SHARED_LANE_WEIGHT, GROUPED_RESULTS_EXCHANGE, GROUPED_RESULT_QUEUE,
+                                    GROUP_MEMBERS_EXCHANGE, TASK_EVENTS_EXCHANGE)
+
+
+def task_queue_arguments(operation: str) -> Dict[str, Any]:
+    """
+    Arguments de déclaration d'une queue de tâches
+
+    Tous les composants doivent déclarer les queues avec les mêmes arguments: RabbitMQ refuse
+    (PRECONDITION_FAILED) de redéclarer une queue durable existante avec des arguments différents.
+    """
+    return {
+        "x-dead-letter-exchange": DEAD_LETTER_EXCHANGE,
+        "x-dead-letter-routing-key": PARKED_QUEUES[operation],
+        "x-max-priority": TASK_MAX_PRIORITY,
+    }
+
+
+def dead_letter_reason(headers: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Raison du dernier dead-lettering d'un message ('rejected', 'expired', 'maxlen'), None s'il n'y en a pas
+
+    Les queues de tâches renvoient vers la queue de côté aussi bien les rejets que les tâches dont
+    l'expiration AMQP (échéance) est atteinte: seule l'en-tête x-death, entrée la plus récente en
+    premier, permet de les distinguer.
+    """
+    deaths = (headers or {}).get('x-death') or []
+    if not deaths:
+        return None
+    reason = deaths[0].get('reason')
+    return reason.decode() if isinstance(reason, bytes) else reason
+
+
+def task_priority(source: str, priority: Optional[int] = None) -> int:
+    """Priorité de publication d'une tâche: explicite, sinon celle de sa source (bornée à [0, TASK_MAX_PRIORITY])"""
+    if priority is None:
+        priority = TASK_PRIORITIES.get(source, 0)
+    return max(0, min(TASK_MAX_PRIORITY, int(priority)))
+
+
+def priority_class(priority: Optional[int]) -> str:
+    """Nom de la classe de priorité d'une livraison: la source correspondante, sinon 'p<n>'"""
+    for source, source_priority in TASK_PRIORITIES.items():
+        if priority == source_priority:
+            return source
+    return f"p{priority or 0}"
+
+
+def source_queue_name(operation: str, source: str) -> str:
+    """Sous-queue des tâches d'une source pour une opération (ex. task_queue_add.web)"""
+    return f"{TASK_QUEUES[operation]}.{source}"
+
+
+def task_routing_key(operation: str, source: str) -> str:
+    """Clé de publication sur l'exchange des tâches: sous-queue de la source, sinon queue partagée de l'opération"""
+    if source in TASK_SOURCE_WEIGHTS:
+        return source_queue_name(operation, source)
+    return TASK_QUEUES[operation]
+
+
+def task_lanes(operation: str) -> List[Tuple[str, str]]:
+    """Voies (nom, queue) consommées par un worker de l'opération: la queue partagée puis une par source"""
+    return [(SHARED_LANE, TASK_QUEUES[operation])] + [
+        (source, source_queue_name(operation, source)) for source in TASK_SOURCE_WEIGHTS
+    ]
+
+
+def lane_weights(overrides: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Poids du tourniquet par voie: configuration, éventuellement surchargée (--weights)"""
+    return {SHARED_LANE: SHARED_LANE_WEIGHT, **TASK_SOURCE_WEIGHTS, **(overrides or {})}
+
+
+def retry_delay(attempts: int) -> int:
+    """Délai (secondes) du palier de retry après `attempts` échecs"""
+    return TASK_RETRY_DELAYS[min(attempts, len(TASK_RETRY_DELAYS)) - 1]
+
+
+def retry_queue_name(operation: str, delay: int) -> str:
+    """Queue d'attente d'un palier: ses messages reviennent dans la queue de tâches après `delay` secondes"""
+    return f"{TASK_QUEUES[operation]}.retry.{delay}s"
+
+
+def topology_declarations(operations: Iterable[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Déclarations (méthode du canal, arguments) de la topologie des opérations données
+
+    Renvoyées sous forme de liste pour servir aussi bien au canal bloquant qu'à l'adaptateur asyncio.
+    """
+    declarations = [
+        ("exchange_declare", {"exchange": ALL_OPERATIONS_EXCHANGE, "exchange_type": "fanout"}),
+        ("exchange_declare", {"exchange": DEAD_LETTER_EXCHANGE, "exchange_type": "direct", "durable": True}),
+        ("exchange_declare", {"exchange": CONTROL_EXCHANGE, "exchange_type": "fanout"}),
+        ("exchange_declare", {"exchange": TASK_EVENTS_EXCHANGE, "exchange_type": "fanout"}),
+        ("exchange_declare", {"exchange": TASKS_EXCHANGE, "exchange_type": "direct", "durable": True}),
+        ("exchange_declare", {"exchange": RESULTS_EXCHANGE, "exchange_type": "fanout", "durable": True}),
+        ("queue_declare", {"queue": RESULT_QUEUE, "durable": True}),
+        ("queue_bind", {"queue": RESULT_QUEUE, "exchange": RESULTS_EXCHANGE}),
+        # Copie des seuls résultats membres d'un groupe (en-tête GROUP_MEMBER_HEADER) vers l'agrégateur
+        ("exchange_declare", {"exchange": GROUP_MEMBERS_EXCHANGE, "exchange_type": "headers", "durable": True}),
+        ("exchange_bind", {"destination": GROUP_MEMBERS_EXCHANGE, "source": RESULTS_EXCHANGE}),
+        ("exchange_declare", {"exchange": GROUPED_RESULTS_EXCHANGE, "exchange_type": "fanout", "durable": True}),
+        ("queue_declare", {"queue": GROUPED_RESULT_QUEUE, "durable": True}),
+        ("queue_bind", {"queue": GROUPED_RESULT_QUEUE, "exchange": GROUPED_RESULTS_EXCHANGE}),
+    ]
+    for operation in operations:
+        task_queue = TASK_QUEUES[operation]
+        declarations.append(("queue_declare", {"queue": task_queue, "durable": True,
+                                               "arguments": task_queue_arguments(operation)}))
+        declarations.append(("queue_bind", {"queue": task_queue, "exchange": ALL_OPERATIONS_EXCHANGE}))
+        declarations.append(("queue_bind", {"queue": task_queue, "exchange": TASKS_EXCHANGE,
+                                            "routing_key": task_queue}))
+
+        # Sous-queues par source, mêmes arguments (dead-letter vers la queue de côté, priorités)
+        for source in TASK_SOURCE_WEIGHTS:
+            source_queue = source_queue_name(operation, source)
+            declarations.append(("queue_declare", {"queue": source_queue, "durable": True,
+                                                   "arguments": task_queue_arguments(operation)}))
+            declarations.append(("queue_bind", {"queue": source_queue, "exchange": TASKS_EXCHANGE,
+                                                "routing_key": source_queue}))
+
+        # Messages mis de côté: rejetés sans remise en queue ou ayant épuisé leurs tentatives
+        declarations.append(("queue_declare", {"queue": PARKED_QUEUES[operation], "durable": True}))
+        declarations.append(("queue_bind", {"queue": PARKED_QUEUES[operation], "exchange": DEAD_LETTER_EXCHANGE,
+                                            "routing_key": PARKED_QUEUES[operation]}))
+
+        # Paliers de retry: à expiration du TTL, retour dans la queue de tâches via l'exchange par défaut
+        for delay in TASK_RETRY_DELAYS:
+            declarations.append(("queue_declare", {"queue": retry_queue_name(operation, delay), "durable": True,
+                                                   "arguments": {
+                                                       "x-message-ttl": delay * 1000,
+                                                       "x-dead-letter-exchange": "",
+                                                       "x-dead-letter-routing-key": task_queue,
+                                                   }}))
+    return declarations
+
+
+def declare_topology(channel, operations: Iterable[str]):
+    """Déclare la topologie des opérations données sur un canal bloquant"""
+    for method, arguments in topology_declarations(operations):
+        getattr(channel, method)(**arguments)